@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+from typing import List, Optional
+
+import httpx
+
+from ai_orchestrator.config import Settings
+from ai_orchestrator.deadline import hop_timeout
+from ai_orchestrator.logging import get_logger
+
+
+class EmbeddingClient:
+    """Эмбеддинг текста запроса для семантического кэша ответов (OpenAI-совместимый ``/v1/embeddings``).
+
+    Без ``embedding_api_base`` (и в mock-режиме) ``semantic`` ложно: близость запросов не измерить,
+    ``embed`` возвращает один и тот же единичный вектор, а оркестратор добавляет в ключ кэша хэш
+    нормализованного запроса — кэш срабатывает только на совпадающий после нормализации запрос.
+    Ошибка вызова не роняет запрос: возвращается ``None``, и кэш для запроса пропускается.
+    """
+
+    def __init__(self, settings: Settings, http_client: httpx.AsyncClient) -> None:
+        self.settings = settings
+        self.http_client = http_client
+        self.semantic = not settings.mock_mode and bool(settings.embedding_api_base)
+        self._logger = get_logger(__name__)
+
+    async def embed(self, text: str) -> Optional[List[float]]:
+        if not self.semantic:
+            return [1.0]
+        headers = {"Authorization": f"Bearer {self.settings.embedding_api_key}"} if self.settings.embedding_api_key else {}
+        base = self.settings.embedding_api_base.rstrip("/")
+        path = "/embeddings" if base.endswith("/v1") else "/v1/embeddings"
+        payload = {"model": self.settings.embedding_model, "input": [text], "encoding_format": "float"}
+        started = time.perf_counter()
+        try:
+            resp = await self.http_client.post(
+                base + path, json=payload, headers=headers, timeout=hop_timeout(self.settings.embedding_timeout_seconds)
+            )
+            resp.raise_for_status()
+            data = resp.json().get("data") or []
+            embedding = data[0]["embedding"] if data else None
+        except Exception as exc:
+            self._logger.warning("orchestrator_embedding_failed", model=self.settings.embedding_model, error=str(exc))
+            return None
+        self._logger.info(
+            "orchestrator_embedding_response",
+            model=self.settings.embedding_model,
+            latency_ms=int((time.perf_counter() - started) * 1000),
+        )
+        return embedding
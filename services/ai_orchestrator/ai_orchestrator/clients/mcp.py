@@ -6,6 +6,7 @@ import httpx
 from fastapi import HTTPException, status
 
 from ai_orchestrator.config import Settings
+from ai_orchestrator.deadline import deadline_headers, hop_timeout
 
 
 class MCPClient:
@@ -33,7 +34,12 @@ class MCPClient:
             "trace_id": trace_id,
         }
         try:
-            response = await self.http_client.post(self.settings.mcp_proxy_url, json=payload)
+            response = await self.http_client.post(
+                self.settings.mcp_proxy_url,
+                json=payload,
+                headers=deadline_headers(),
+                timeout=hop_timeout(self.settings.http_timeout_seconds),
+            )
             response.raise_for_status()
             return response.json()
         except httpx.HTTPError as exc:  # pragma: no cover
@@ -6,6 +6,7 @@ import httpx
 from fastapi import HTTPException, status
 
 from ai_orchestrator.config import Settings
+from ai_orchestrator.deadline import deadline_headers, hop_timeout
 
 
 class RetrievalClient:
@@ -32,8 +33,12 @@ class RetrievalClient:
             )
         if not self.settings.retrieval_url:
             raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="retrieval url missing")
-        # Retrieval can be slow; disable client-side timeout to avoid premature failures.
-        response = await self.http_client.post(self.settings.retrieval_url, json=query_payload, timeout=None)
+        response = await self.http_client.post(
+            self.settings.retrieval_url,
+            json=query_payload,
+            headers=deadline_headers(),
+            timeout=hop_timeout(self.settings.http_timeout_seconds),
+        )
         response.raise_for_status()
         payload = response.json()
         steps_info: Optional[Dict[str, int]] = None
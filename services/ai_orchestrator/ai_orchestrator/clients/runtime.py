@@ -1,13 +1,25 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import re
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import httpx
 from fastapi import HTTPException, status
 
 from ai_orchestrator.config import Settings
+from ai_orchestrator.deadline import hop_timeout
+
+
+DeltaCallback = Callable[[str], Awaitable[None]]
+ResetCallback = Callable[[], Awaitable[None]]
+
+
+@dataclass
+class ToolCall:
+    name: Optional[str]
+    arguments: Dict[str, Any]
 
 
 @dataclass
@@ -17,6 +29,8 @@ class RuntimeResult:
     tool_name: Optional[str]
     tool_arguments: Optional[Dict[str, Any]]
     usage: Dict[str, int]
+    # все tool calls хода; tool_name/tool_arguments дублируют первый из них
+    tool_calls: List[ToolCall] = field(default_factory=list)
 
 
 class LLMRuntimeClient:
@@ -26,15 +40,37 @@ class LLMRuntimeClient:
         self.settings = settings
         self.http_client = http_client
 
-    async def chat_completion(self, payload: Dict[str, Any]) -> RuntimeResult:
+    async def chat_completion(
+        self,
+        payload: Dict[str, Any],
+        stream: bool = False,
+        on_delta: Optional[DeltaCallback] = None,
+        on_reset: Optional[ResetCallback] = None,
+    ) -> RuntimeResult:
+        """Один шаг chat completion.
+
+        При ``stream=True`` запрос уходит с ``"stream": true`` и ответ читается как SSE:
+        текстовые дельты сразу передаются в ``on_delta`` (пока модель не начала tool call),
+        tool calls собираются из фрагментов. Если шаг начался с текста, а затем модель вызвала
+        инструмент, вызывается ``on_reset``: отданный текст не был финальным ответом и должен
+        быть отброшен. Возвращает тот же ``RuntimeResult``, что и без стриминга.
+        """
         if self.settings.mock_mode:
-            return self._mock_response(payload)
+            result = self._mock_response(payload)
+            if stream and on_delta and result.type == "message" and result.content:
+                for part in re.findall(r"\S+\s*", result.content):
+                    await on_delta(part)
+            return result
         runtime_url = self._resolve_url()
         if not runtime_url:
             raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="LLM runtime URL not configured")
+        if stream:
+            return await self._stream_completion(runtime_url, payload, on_delta, on_reset)
         try:
             headers = {"Authorization": f"Bearer {self.settings.llm_api_key}"} if self.settings.llm_api_key else None
-            response = await self.http_client.post(runtime_url, json=payload, headers=headers)
+            response = await self.http_client.post(
+                runtime_url, json=payload, headers=headers, timeout=hop_timeout(self.settings.http_timeout_seconds)
+            )
             response.raise_for_status()
             try:
                 data = response.json()
@@ -48,6 +84,54 @@ class LLMRuntimeClient:
         except httpx.HTTPError as exc:  # pragma: no cover
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"llm runtime error: {exc}") from exc
 
+    async def _stream_completion(
+        self, runtime_url: str, payload: Dict[str, Any], on_delta: Optional[DeltaCallback], on_reset: Optional[ResetCallback]
+    ) -> RuntimeResult:
+        body = {**payload, "stream": True, "stream_options": {"include_usage": True}}
+        headers = {"Authorization": f"Bearer {self.settings.llm_api_key}"} if self.settings.llm_api_key else None
+        content: List[str] = []
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        usage: Dict[str, Any] = {}
+        emitted = False
+        try:
+            timeout = hop_timeout(self.settings.http_timeout_seconds)
+            async with self.http_client.stream("POST", runtime_url, json=body, headers=headers, timeout=timeout) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        chunk = json.loads(data)
+                    except ValueError:
+                        continue
+                    usage = chunk.get("usage") or usage
+                    for choice in chunk.get("choices") or []:
+                        delta = choice.get("delta") or {}
+                        if delta.get("tool_calls") and not tool_calls and emitted and on_reset:
+                            await on_reset()
+                        for call in delta.get("tool_calls") or []:
+                            merged = tool_calls.setdefault(call.get("index", len(tool_calls)), {"function": {"name": "", "arguments": ""}})
+                            function = call.get("function") or {}
+                            merged["function"]["name"] += function.get("name") or ""
+                            merged["function"]["arguments"] += function.get("arguments") or ""
+                        text = delta.get("content")
+                        if text:
+                            content.append(text)
+                            if on_delta and not tool_calls:
+                                await on_delta(text)
+                                emitted = True
+        except httpx.HTTPError as exc:  # pragma: no cover
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"llm runtime error: {exc}") from exc
+        message: Dict[str, Any] = {"content": "".join(content)}
+        if tool_calls:
+            message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+        return self._map_choice({"message": message}, usage)
+
     def _resolve_url(self) -> str | None:
         url = self.settings.llm_runtime_url
         if not url:
@@ -80,30 +164,36 @@ class LLMRuntimeClient:
 
     def _map_choice(self, choice: Dict[str, Any], usage: Dict[str, Any]) -> RuntimeResult:
         message = choice.get("message", {})
-        tool_call = message.get("tool_calls", [{}])[-1] if message.get("tool_calls") else None
-        if tool_call:
-            raw_args = tool_call.get("function", {}).get("arguments", "{}")
-            arguments: Dict[str, Any]
-            if isinstance(raw_args, str):
-                try:
-                    arguments = json.loads(raw_args)
-                except Exception:
-                    arguments = {}
-            elif isinstance(raw_args, dict):
-                arguments = raw_args
-            else:
-                arguments = {}
+        usage_stats = {"prompt_tokens": usage.get("prompt_tokens", 0), "completion_tokens": usage.get("completion_tokens", 0)}
+        tool_calls = [self._map_tool_call(call) for call in message.get("tool_calls") or [] if call]
+        if tool_calls:
             return RuntimeResult(
                 type="tool_call",
                 content=None,
-                tool_name=tool_call.get("function", {}).get("name"),
-                tool_arguments=arguments,
-                usage={"prompt_tokens": usage.get("prompt_tokens", 0), "completion_tokens": usage.get("completion_tokens", 0)},
+                tool_name=tool_calls[0].name,
+                tool_arguments=tool_calls[0].arguments,
+                usage=usage_stats,
+                tool_calls=tool_calls,
             )
         return RuntimeResult(
             type="message",
             content=message.get("content"),
             tool_name=None,
             tool_arguments=None,
-            usage={"prompt_tokens": usage.get("prompt_tokens", 0), "completion_tokens": usage.get("completion_tokens", 0)},
+            usage=usage_stats,
         )
+
+    @staticmethod
+    def _map_tool_call(tool_call: Dict[str, Any]) -> ToolCall:
+        raw_args = tool_call.get("function", {}).get("arguments", "{}")
+        arguments: Dict[str, Any]
+        if isinstance(raw_args, str):
+            try:
+                arguments = json.loads(raw_args)
+            except Exception:
+                arguments = {}
+        elif isinstance(raw_args, dict):
+            arguments = raw_args
+        else:
+            arguments = {}
+        return ToolCall(name=tool_call.get("function", {}).get("name"), arguments=arguments)
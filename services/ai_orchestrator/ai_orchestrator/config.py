@@ -21,6 +21,20 @@ class Settings(BaseSettings):
     prompt_token_budget: int = 100000
     context_token_budget: int = 100000
     max_tool_steps: int = 25
+    max_parallel_tool_calls: int = Field(default=4, ge=1, description="Concurrent MCP calls for tool calls of one LLM turn")
+    coalesce_requests: bool = Field(default=True, description="Share one computation between concurrent identical /respond requests")
+    answer_cache_enabled: bool = Field(default=False, description="Serve paraphrased questions over the same retrieved sections from the answer cache")
+    answer_cache_similarity_threshold: float = Field(default=0.92, ge=0, le=1, description="Minimal cosine similarity of query embeddings for a hit")
+    answer_cache_ttl_seconds: float = Field(default=3600.0, gt=0)
+    answer_cache_max_entries: int = Field(default=1000, ge=0)
+    embedding_api_base: str | None = None
+    embedding_api_key: str | None = None
+    embedding_model: str = "baai/bge-m3"
+    embedding_timeout_seconds: float = Field(default=5.0, gt=0)
+    ingestion_events_redis_url: str | None = Field(default=None, description="Redis with the ingestion event stream; re-ingested documents drop cached answers")
+    ingestion_events_stream: str = "ingestion_events"
+    speculative_prefetch: bool = Field(default=False, description="Prefetch anchor chunk windows of top sections during the first LLM turn")
+    speculative_prefetch_top_k: int = Field(default=2, ge=0)
     window_radius: int | None = Field(
         default=2,
         ge=0,
@@ -32,6 +46,14 @@ class Settings(BaseSettings):
     window_max: int | None = Field(default=2, env="ORCH_WINDOW_MAX")
     legacy_total_window: int | None = Field(default=None, env="MCP_PROXY_MAX_CHUNK_WINDOW")
     retry_attempts: int = 1
+    http_timeout_seconds: float = Field(default=120.0, gt=0, description="Per-hop timeout cap; the request deadline can only shorten it")
+    optional_stage_min_budget_seconds: float = Field(
+        default=5.0, ge=0, description="Skip optional stages (speculative prefetch) when less request budget remains"
+    )
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2: bool = True  # действует, только если установлен пакет h2
     mock_mode: bool = False
     default_user_id: str = "anonymous"
     default_tenant_id: str = "observer_tenant"
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from ai_orchestrator.schemas import SourceItem
+
+SectionSet = FrozenSet[Tuple[str, str]]  # {(doc_id, section_id)}
+
+
+def section_set(items: Iterable[Dict]) -> SectionSet:
+    return frozenset((str(item.get("doc_id") or ""), str(item.get("section_id") or item.get("chunk_id") or "")) for item in items)
+
+
+def _normalize(vector: Sequence[float]) -> Optional[Tuple[float, ...]]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return tuple(x / norm for x in vector) if norm else None
+
+
+@dataclass
+class CachedAnswer:
+    tenant_id: str
+    embedding: Tuple[float, ...]  # нормирован: косинус — скалярное произведение
+    sections: SectionSet
+    answer: str
+    sources: List[SourceItem]
+    expires_at: float
+
+    @property
+    def doc_ids(self) -> FrozenSet[str]:
+        return frozenset(doc_id for doc_id, _ in self.sections)
+
+
+class SemanticAnswerCache:
+    """Кэш ответов оркестратора для перефразированных запросов.
+
+    Запись — эмбеддинг запроса, множество найденных секций ``(doc_id, section_id)``, ответ и
+    источники. Попадание требует того же tenant и scope (модель), совпадающего множества секций
+    и косинусной близости эмбеддингов не ниже ``similarity_threshold``: совпадение секций
+    гарантирует, что ответ построен на том же контексте, близость — что спрашивали о том же.
+    Записи живут ``ttl_seconds``; сверх ``max_entries`` вытесняются давно не использованные.
+    ``invalidate`` удаляет записи, опирающиеся на переиндексированные документы. Время — монотонное.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.92, ttl_seconds: float = 3600.0, max_entries: int = 1000) -> None:
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # по (tenant, scope, секции) — кандидаты для сравнения эмбеддингов; порядок _lru — для вытеснения
+        self._buckets: Dict[Tuple[str, Hashable, SectionSet], List[CachedAnswer]] = {}
+        self._lru: "OrderedDict[int, Tuple[Tuple[str, Hashable, SectionSet], CachedAnswer]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def lookup(
+        self, tenant_id: str, scope: Hashable, embedding: Sequence[float], sections: SectionSet
+    ) -> Optional[Tuple[CachedAnswer, float]]:
+        """Возвращает ``(запись, сходство)`` самой близкой подходящей записи или ``None``."""
+        query = _normalize(embedding)
+        bucket = self._buckets.get((tenant_id, scope, sections), [])
+        now = time.monotonic()
+        best: Optional[Tuple[CachedAnswer, float]] = None
+        for entry in list(bucket):
+            if entry.expires_at <= now:
+                self._remove(entry)
+                continue
+            if query is None or len(entry.embedding) != len(query):
+                continue
+            similarity = sum(a * b for a, b in zip(query, entry.embedding))
+            if similarity >= self.similarity_threshold and (best is None or similarity > best[1]):
+                best = (entry, similarity)
+        if best is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._lru.move_to_end(id(best[0]))
+        return best
+
+    def store(
+        self,
+        tenant_id: str,
+        scope: Hashable,
+        embedding: Sequence[float],
+        sections: SectionSet,
+        answer: str,
+        sources: List[SourceItem],
+    ) -> None:
+        vector = _normalize(embedding)
+        if vector is None or not sections or self.max_entries <= 0:
+            return
+        key = (tenant_id, scope, sections)
+        entry = CachedAnswer(tenant_id, vector, sections, answer, list(sources), time.monotonic() + self.ttl_seconds)
+        self._buckets.setdefault(key, []).append(entry)
+        self._lru[id(entry)] = (key, entry)
+        while len(self._lru) > self.max_entries:
+            _, (_, oldest) = next(iter(self._lru.items()))
+            self._remove(oldest)
+
+    def invalidate(self, doc_ids: Iterable[str], tenant_id: Optional[str] = None) -> int:
+        """Удаляет записи, чьи секции относятся к ``doc_ids`` (во всех tenant, если ``tenant_id`` не задан)."""
+        targets = set(doc_ids)
+        stale = [
+            entry
+            for _, entry in self._lru.values()
+            if (tenant_id is None or entry.tenant_id == tenant_id) and not targets.isdisjoint(entry.doc_ids)
+        ]
+        for entry in stale:
+            self._remove(entry)
+        self.invalidated += len(stale)
+        return len(stale)
+
+    def _remove(self, entry: CachedAnswer) -> None:
+        item = self._lru.pop(id(entry), None)
+        if item is None:
+            return
+        key = item[0]
+        bucket = self._buckets.get(key, [])
+        bucket[:] = [candidate for candidate in bucket if candidate is not entry]
+        if not bucket:
+            self._buckets.pop(key, None)
+
+    def render_prometheus(self, prefix: str = "orchestrator_answer_cache") -> str:
+        lookups = self.hits + self.misses
+        return "\n".join(
+            [
+                f"# TYPE {prefix}_hits_total counter",
+                f"{prefix}_hits_total {self.hits}",
+                f"# TYPE {prefix}_misses_total counter",
+                f"{prefix}_misses_total {self.misses}",
+                f"# TYPE {prefix}_hit_ratio gauge",
+                f"{prefix}_hit_ratio {self.hits / lookups if lookups else 0.0:.4f}",
+                f"# TYPE {prefix}_invalidated_total counter",
+                f"{prefix}_invalidated_total {self.invalidated}",
+                f"# TYPE {prefix}_entries gauge",
+                f"{prefix}_entries {len(self)}",
+            ]
+        ) + "\n"
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from ai_orchestrator.core.answer_cache import SemanticAnswerCache
+from ai_orchestrator.logging import get_logger
+
+try:  # pragma: no cover - redis нужен только для подписки на события ingestion
+    import redis.asyncio as aioredis  # type: ignore
+except ImportError:  # pragma: no cover
+    aioredis = None  # type: ignore
+
+
+def apply_ingestion_event(cache: SemanticAnswerCache, fields: Dict[str, Any]) -> int:
+    """Сбрасывает кэшированные ответы по документу из события ``document_ingested``."""
+    if fields.get("event") != "document_ingested" or not fields.get("doc_id"):
+        return 0
+    return cache.invalidate([str(fields["doc_id"])], tenant_id=fields.get("tenant_id") or None)
+
+
+class IngestionEventsListener:
+    """Читает stream событий ingestion (``XREAD`` с момента запуска) и инвалидирует кэш ответов.
+
+    Ошибки Redis не останавливают сервис: после паузы чтение продолжается с последнего
+    прочитанного события.
+    """
+
+    def __init__(self, redis_url: str, stream: str, cache: SemanticAnswerCache, retry_delay_seconds: float = 5.0) -> None:
+        self.redis_url = redis_url
+        self.stream = stream
+        self.cache = cache
+        self.retry_delay_seconds = retry_delay_seconds
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._logger = get_logger(__name__)
+
+    def start(self) -> bool:
+        if aioredis is None:
+            self._logger.warning("orchestrator_ingestion_events_disabled", reason="redis package is not installed")
+            return False
+        self._task = asyncio.ensure_future(self._run())
+        return True
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        client = aioredis.from_url(self.redis_url, decode_responses=True)
+        last_id = "$"
+        try:
+            while True:
+                try:
+                    batches = await client.xread({self.stream: last_id}, block=5000, count=100)
+                except Exception as exc:
+                    self._logger.warning("orchestrator_ingestion_events_failed", stream=self.stream, error=str(exc))
+                    await asyncio.sleep(self.retry_delay_seconds)
+                    continue
+                for _, events in batches or []:
+                    for event_id, fields in events:
+                        last_id = event_id
+                        invalidated = apply_ingestion_event(self.cache, fields)
+                        if invalidated:
+                            self._logger.info(
+                                "orchestrator_answer_cache_invalidated",
+                                doc_id=fields.get("doc_id"),
+                                tenant_id=fields.get("tenant_id"),
+                                entries=invalidated,
+                            )
+        finally:
+            await client.aclose()
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import time
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
 import httpx
 from fastapi import HTTPException, status
 
+from ai_orchestrator.clients.embedding import EmbeddingClient
 from ai_orchestrator.clients.mcp import MCPClient
 from ai_orchestrator.clients.retrieval import RetrievalClient
-from ai_orchestrator.clients.runtime import LLMRuntimeClient, RuntimeResult
+from ai_orchestrator.clients.runtime import DeltaCallback, LLMRuntimeClient, ResetCallback, ToolCall
 from ai_orchestrator.config import Settings
+from ai_orchestrator.core.answer_cache import CachedAnswer, SemanticAnswerCache, section_set
 from ai_orchestrator.core.context_builder import build_context
+from ai_orchestrator.core.single_flight import SingleFlight, normalize_query
+from ai_orchestrator.core.tool_cache import RequestToolCache, tool_key
+from ai_orchestrator.deadline import remaining_budget
 from ai_orchestrator.logging import get_logger
 from ai_orchestrator.schemas import (
     OrchestratorRequest,
@@ -48,9 +55,62 @@ class Orchestrator:
         self.retrieval = RetrievalClient(settings, http_client)
         self.runtime = LLMRuntimeClient(settings, http_client)
         self.mcp = MCPClient(settings, http_client)
+        self.embeddings = EmbeddingClient(settings, http_client)
+        self.flights = SingleFlight()
+        self.answer_cache = SemanticAnswerCache(
+            similarity_threshold=settings.answer_cache_similarity_threshold,
+            ttl_seconds=settings.answer_cache_ttl_seconds,
+            max_entries=settings.answer_cache_max_entries,
+        )
         self._logger = get_logger(__name__)
 
-    async def respond(self, request: OrchestratorRequest) -> OrchestratorResponse:
+    async def respond(
+        self,
+        request: OrchestratorRequest,
+        on_delta: Optional[DeltaCallback] = None,
+        on_reset: Optional[ResetCallback] = None,
+    ) -> OrchestratorResponse:
+        """Полный цикл retrieval → LLM ↔ tools → ответ.
+
+        С ``on_delta`` шаги LLM запрашиваются в режиме стриминга, и текст отдаётся в callback по мере
+        генерации. Финальность шага известна только в конце, поэтому текст шага, который затем
+        превратился в tool call («Сейчас посмотрю документацию…»), тоже успевает уйти в ``on_delta``;
+        в этот момент вызывается ``on_reset`` — отданный текст нужно отбросить. Так склейка дельт
+        после последнего ``on_reset`` совпадает с ``answer``.
+        Результаты инструментов запоминаются на время запроса: повтор вызова (или окно, покрытое
+        уже прочитанным) отдаётся без обращения к MCP. При ``speculative_prefetch`` окна anchor-чанков top-k секций запрашиваются у MCP
+        параллельно с первым шагом LLM и отдаются последующим ``read_chunk_window`` из кэша запроса.
+        При ``answer_cache_enabled`` запрос, близкий к уже отвеченному и нашедший те же секции,
+        получает ответ из ``answer_cache`` без обращения к LLM.
+        """
+        tool_cache = RequestToolCache()
+        try:
+            return await self._respond(request, on_delta, tool_cache, on_reset)
+        finally:
+            tool_cache.close()
+
+    async def respond_coalesced(self, request: OrchestratorRequest) -> OrchestratorResponse:
+        """``respond``, объединяющий одновременные одинаковые запросы (single-flight).
+
+        Ключ — tenant, роли, нормализованный текст запроса и параметры поиска; пользователь,
+        conversation_id и trace_id в ключ не входят. Запрос, получивший чужой ответ, видит в
+        ``telemetry.trace_id`` свой trace_id.
+        """
+        if not self.settings.coalesce_requests:
+            return await self.respond(request)
+        response, shared = await self.flights.do(self._coalescing_key(request), lambda: self.respond(request))
+        if not shared:
+            return response
+        trace_id = request.trace_id or "trace-unknown"
+        self._logger.info("orchestrator_request_coalesced", trace_id=trace_id, leader_trace_id=response.telemetry.trace_id)
+        return response.model_copy(update={"telemetry": response.telemetry.model_copy(update={"trace_id": trace_id})})
+
+    def _coalescing_key(self, request: OrchestratorRequest) -> str:
+        user = self._resolve_user(request)
+        params = request.model_dump(exclude={"query", "conversation_id", "user", "user_id", "tenant_id", "trace_id"})
+        return json.dumps([user.tenant_id, sorted(user.roles), normalize_query(request.query), params], sort_keys=True, default=str)
+
+    def _resolve_user(self, request: OrchestratorRequest) -> UserContext:
         user_context = request.user
         if user_context is None:
             if request.user_id and request.tenant_id:
@@ -59,6 +119,16 @@ class Orchestrator:
                 user_context = UserContext(user_id=self.settings.default_user_id, tenant_id=self.settings.default_tenant_id)
         if not user_context.tenant_id:
             user_context.tenant_id = self.settings.default_tenant_id
+        return user_context
+
+    async def _respond(
+        self,
+        request: OrchestratorRequest,
+        on_delta: Optional[DeltaCallback],
+        tool_cache: RequestToolCache,
+        on_reset: Optional[ResetCallback] = None,
+    ) -> OrchestratorResponse:
+        user_context = self._resolve_user(request)
 
         trace_id = request.trace_id or "trace-unknown"
         self._logger.info(
@@ -91,7 +161,14 @@ class Orchestrator:
                 retrieval_payload[field] = value
         if request.rerank_enabled is not None and "enable_rerank" not in retrieval_payload:
             retrieval_payload["enable_rerank"] = request.rerank_enabled
-        retrieval_hits, retrieval_steps = await self.retrieval.search(retrieval_payload)
+        # эмбеддинг запроса для кэша ответов считается параллельно с retrieval
+        embedding_task = self._embed_for_cache(request.query)
+        try:
+            retrieval_hits, retrieval_steps = await self.retrieval.search(retrieval_payload)
+        except BaseException:
+            if embedding_task is not None:
+                embedding_task.cancel()
+            raise
         retrieval_latency = int((time.perf_counter() - retrieval_start) * 1000)
         steps_docs = retrieval_steps.get("docs", 0) if retrieval_steps else 0
         steps_sections = retrieval_steps.get("sections", 0) if retrieval_steps else 0
@@ -136,6 +213,22 @@ class Orchestrator:
             summary_chars=summaries_len,
             chunk_anchor_map=len(section_chunk_map),
         )
+        model = "mock-model" if self.settings.mock_mode else self.settings.default_model
+        cache_scope = self._answer_cache_scope(model, request.query)
+        cache_sections = section_set(context)
+        query_embedding = await embedding_task if embedding_task is not None else None
+        if query_embedding is not None and cache_sections:
+            cached = self.answer_cache.lookup(user_context.tenant_id, cache_scope, query_embedding, cache_sections)
+            if cached is not None:
+                entry, similarity = cached
+                self._logger.info(
+                    "orchestrator_answer_cache_hit",
+                    trace_id=trace_id,
+                    tenant_id=user_context.tenant_id,
+                    similarity=round(similarity, 4),
+                    sections=len(cache_sections),
+                )
+                return await self._cached_response(entry, trace_id, retrieval_latency, on_delta)
         messages = self._build_messages(request.query, context)
         tools = self._tool_schemas()
         usage = {"prompt": 0, "completion": 0}
@@ -145,10 +238,16 @@ class Orchestrator:
             max_window=self.settings.window_radius,
         )
         tool_traces: List[ToolCallTrace] = []
+        if self.settings.speculative_prefetch:
+            budget = remaining_budget()
+            if budget is not None and budget < self.settings.optional_stage_min_budget_seconds:
+                self._logger.info("orchestrator_tool_prefetch_skipped", trace_id=trace_id, reason="low_budget", budget_seconds=round(budget, 3))
+            else:
+                self._prefetch_anchor_windows(tool_cache, context, section_chunk_map, window_state, user_context, trace_id)
 
         for step in range(self.settings.max_tool_steps + 1):
             payload = {
-                "model": "mock-model" if self.settings.mock_mode else self.settings.default_model,
+                "model": model,
                 "messages": messages,
                 "tools": tools,
                 "context": context,
@@ -168,7 +267,10 @@ class Orchestrator:
                 step=step,
             )
             try:
-                result = await self.runtime.chat_completion(payload)
+                if on_delta is None:
+                    result = await self.runtime.chat_completion(payload)
+                else:
+                    result = await self.runtime.chat_completion(payload, stream=True, on_delta=on_delta, on_reset=on_reset)
             except Exception as exc:
                 self._logger.error(
                     "orchestrator_llm_request_failed",
@@ -207,6 +309,8 @@ class Orchestrator:
                 )
                 safety_block = SafetyBlock(input="allowed", output="allowed")
                 sources = self._build_sources(context)
+                if query_embedding is not None and cache_sections and result.content:
+                    self.answer_cache.store(user_context.tenant_id, cache_scope, query_embedding, cache_sections, result.content, sources)
                 return OrchestratorResponse(
                     answer=result.content or "",
                     sources=sources,
@@ -220,33 +324,67 @@ class Orchestrator:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail={"code": "LLM_LIMIT_EXCEEDED", "message": "Tool-call limit reached"},
                 )
-            tool_name = result.tool_name or "unknown"
-            arguments = result.tool_arguments or {}
-            self._logger.info(
-                "orchestrator_tool_call_raw",
-                trace_id=trace_id,
-                tenant_id=user_context.tenant_id,
-                tool=tool_name,
-                raw_arguments=arguments,
-                max_window_radius=self.settings.window_radius,
-            )
-            tool_result, tokens_used = await self._execute_tool(tool_name, arguments, section_chunk_map, window_state, user_context, trace_id)
-            window_state.add_tokens(tokens_used)
-            if window_state.tokens_used > self.settings.context_token_budget:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail={"code": "CONTEXT_BUDGET_EXCEEDED", "message": "Context budget exceeded"},
+            calls = result.tool_calls or [ToolCall(name=result.tool_name, arguments=result.tool_arguments or {})]
+            for call in calls:
+                self._logger.info(
+                    "orchestrator_tool_call_raw",
+                    trace_id=trace_id,
+                    tenant_id=user_context.tenant_id,
+                    tool=call.name or "unknown",
+                    raw_arguments=call.arguments,
+                    max_window_radius=self.settings.window_radius,
+                    parallel_calls=len(calls),
+                )
+            outcomes = await self._execute_tools(calls, section_chunk_map, window_state, user_context, trace_id, tool_cache)
+            for call, (tool_result, tokens_used) in zip(calls, outcomes):
+                window_state.add_tokens(tokens_used)
+                if window_state.tokens_used > self.settings.context_token_budget:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail={"code": "CONTEXT_BUDGET_EXCEEDED", "message": "Context budget exceeded"},
+                    )
+                tool_traces.append(
+                    ToolCallTrace(name=call.name or "unknown", arguments=call.arguments or {}, result_summary=str(tool_result.get("result")))
+                )
+                messages.append(
+                    {
+                        "role": "assistant",
+                        "content": f"TOOL_RESULT:{json.dumps(tool_result)}",
+                    }
                 )
-            tool_traces.append(ToolCallTrace(name=tool_name, arguments=arguments, result_summary=str(tool_result.get("result"))))
-            messages.append(
-                {
-                    "role": "assistant",
-                    "content": f"TOOL_RESULT:{json.dumps(tool_result)}",
-                }
-            )
 
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"code": "LLM_LOOP", "message": "No final answer"})
 
+    def _answer_cache_scope(self, model: str, query: str) -> Hashable:
+        if self.embeddings.semantic:
+            return model
+        # без сервиса эмбеддингов перефразы не распознать: попадание только на тот же нормализованный запрос
+        return (model, hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest())
+
+    def _embed_for_cache(self, query: str) -> Optional["asyncio.Task[Optional[List[float]]]"]:
+        if not self.settings.answer_cache_enabled:
+            return None
+        return asyncio.ensure_future(self.embeddings.embed(normalize_query(query)))
+
+    async def _cached_response(
+        self, entry: CachedAnswer, trace_id: str, retrieval_latency: int, on_delta: Optional[DeltaCallback]
+    ) -> OrchestratorResponse:
+        if on_delta is not None and entry.answer:
+            await on_delta(entry.answer)
+        return OrchestratorResponse(
+            answer=entry.answer,
+            sources=[source.model_copy() for source in entry.sources],
+            tools=[],
+            safety=SafetyBlock(input="allowed", output="allowed"),
+            telemetry=Telemetry(
+                trace_id=trace_id,
+                retrieval_latency_ms=retrieval_latency,
+                llm_latency_ms=None,
+                tool_steps=0,
+                answer_cache_hit=True,
+            ),
+        )
+
     def _select_sections(self, hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         sections = [h for h in hits if h.get("section_id")]
         if sections:
@@ -383,6 +521,68 @@ class Orchestrator:
                 mapping[sec_id] = anchor
         return mapping
 
+    def _prefetch_anchor_windows(
+        self,
+        tool_cache: RequestToolCache,
+        context: List[Dict[str, Any]],
+        section_chunk_map: Dict[str, str],
+        window_state: ProgressiveWindowState,
+        user: UserContext,
+        trace_id: str,
+    ) -> None:
+        """Спекулятивно запрашивает окна вокруг anchor-чанков top-k секций контекста — с теми же
+        аргументами, что сформирует ``_execute_tool`` для первого ``read_chunk_window`` по секции."""
+        window = window_state.initial
+        payload_user = {"user_id": user.user_id, "tenant_id": user.tenant_id, "roles": user.roles}
+        prefetched = []
+        for item in context:
+            if len(prefetched) >= self.settings.speculative_prefetch_top_k:
+                break
+            doc_id, section_id = item.get("doc_id"), item.get("section_id")
+            anchor_chunk_id = section_chunk_map.get(section_id or "")
+            if not doc_id or not anchor_chunk_id:
+                continue
+            args = {
+                "doc_id": str(doc_id),
+                "section_id": str(section_id),
+                "anchor_chunk_id": anchor_chunk_id,
+                "window_before": window,
+                "window_after": window,
+            }
+            tool_cache.prefetch(
+                tool_key("read_chunk_window", args),
+                lambda args=args: self.mcp.execute("read_chunk_window", args, payload_user, trace_id),
+            )
+            prefetched.append(section_id)
+        if prefetched:
+            self._logger.info("orchestrator_tool_prefetch", trace_id=trace_id, tenant_id=user.tenant_id, section_ids=prefetched, window=window)
+
+    async def _execute_tools(
+        self,
+        calls: List[ToolCall],
+        section_chunk_map: Dict[str, str],
+        window_state: ProgressiveWindowState,
+        user: UserContext,
+        trace_id: str,
+        tool_cache: Optional[RequestToolCache] = None,
+    ) -> List[Tuple[Dict[str, Any], int]]:
+        """Выполняет все tool calls одного хода LLM параллельно (не больше ``max_parallel_tool_calls``
+        одновременно); результаты возвращаются в порядке вызовов, первая ошибка пробрасывается."""
+        if len(calls) == 1:
+            call = calls[0]
+            return [await self._execute_tool(call.name or "unknown", call.arguments or {}, section_chunk_map, window_state, user, trace_id, tool_cache)]
+        semaphore = asyncio.Semaphore(max(1, self.settings.max_parallel_tool_calls))
+
+        async def run(call: ToolCall) -> Tuple[Dict[str, Any], int]:
+            async with semaphore:
+                return await self._execute_tool(call.name or "unknown", call.arguments or {}, section_chunk_map, window_state, user, trace_id, tool_cache)
+
+        outcomes = await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        return outcomes  # type: ignore[return-value]
+
     async def _execute_tool(
         self,
         tool_name: str,
@@ -391,6 +591,7 @@ class Orchestrator:
         window_state: ProgressiveWindowState,
         user: UserContext,
         trace_id: str,
+        tool_cache: Optional[RequestToolCache] = None,
     ) -> Tuple[Dict[str, Any], int]:
         doc_id = str(arguments.get("doc_id") or "")
         section_id = str(arguments.get("section_id") or "")
@@ -445,7 +646,12 @@ class Orchestrator:
             effective_window_radius=effective_radius,
         )
         payload_user = {"user_id": user.user_id, "tenant_id": user.tenant_id, "roles": user.roles}
-        result = await self.mcp.execute(tool_to_call, args, payload_user, trace_id)
+        if tool_cache is not None:
+            result, cached = await tool_cache.fetch(tool_to_call, args, lambda: self.mcp.execute(tool_to_call, args, payload_user, trace_id))
+            if cached:
+                self._logger.info("orchestrator_tool_cache_hit", trace_id=trace_id, tool=tool_to_call, doc_id=doc_id, section_id=section_id)
+        else:
+            result = await self.mcp.execute(tool_to_call, args, payload_user, trace_id)
         text = ""
         if isinstance(result, dict) and result.get("status") == "ok":
             res_body = result.get("result") or {}
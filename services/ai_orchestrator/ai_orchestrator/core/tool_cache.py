@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+ToolKey = Tuple[str, str, str, str, int, int]  # (tool, doc_id, section_id, anchor_chunk_id, window_before, window_after)
+ToolCallFactory = Callable[[], Awaitable[Dict[str, Any]]]
+
+CHUNK_WINDOW_TOOL = "read_chunk_window"
+
+
+def tool_key(tool_name: str, args: Dict[str, Any]) -> ToolKey:
+    return (
+        tool_name,
+        str(args.get("doc_id") or ""),
+        str(args.get("section_id") or ""),
+        str(args.get("anchor_chunk_id") or ""),
+        int(args.get("window_before") or 0),
+        int(args.get("window_after") or 0),
+    )
+
+
+class RequestToolCache:
+    """Кэш результатов MCP-инструментов в пределах одного запроса к оркестратору.
+
+    ``fetch`` отвечает локально на повтор уже выполненного вызова, а для ``read_chunk_window`` —
+    и на вызов, чьё окно покрывается ранее полученным (радиус 2 покрывает последующий радиус 1):
+    результат обрезается до запрошенного окна. Запоминаются только успешные (``status == "ok"``) ответы.
+    ``prefetch`` запускает вызов заранее (спекулятивно, пока идёт первый запрос к LLM); неуспешные
+    и отменённые prefetch-вызовы считаются промахом — инструмент вызывается заново.
+    """
+
+    def __init__(self) -> None:
+        self._results: Dict[ToolKey, Dict[str, Any]] = {}
+        self._tasks: Dict[ToolKey, "asyncio.Task[Dict[str, Any]]"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def prefetch(self, key: ToolKey, call: ToolCallFactory) -> None:
+        if key not in self._tasks and key not in self._results:
+            self._tasks[key] = asyncio.ensure_future(call())
+
+    async def fetch(self, tool_name: str, args: Dict[str, Any], call: ToolCallFactory) -> Tuple[Dict[str, Any], bool]:
+        """Возвращает ``(результат, из_кэша)``; при промахе выполняет ``call`` и запоминает ответ."""
+        key = tool_key(tool_name, args)
+        result = self._results.get(key) or self._covering(key)
+        if result is None:
+            result = await self._prefetched(key)
+        if result is not None:
+            self.hits += 1
+            return result, True
+        self.misses += 1
+        result = await call()
+        self._remember(key, result)
+        return result, False
+
+    def close(self) -> None:
+        """Отменяет незавершённые prefetch-вызовы (ответ уже готов или запрос упал)."""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()  # помечает исключение как полученное
+
+    def _remember(self, key: ToolKey, result: Any) -> None:
+        if isinstance(result, dict) and result.get("status") == "ok":
+            self._results[key] = result
+
+    async def _prefetched(self, key: ToolKey) -> Optional[Dict[str, Any]]:
+        task = self._tasks.pop(key, None)
+        if task is None:
+            return None
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            return None
+        except Exception:
+            return None
+        self._remember(key, result)
+        return self._results.get(key)
+
+    def _covering(self, key: ToolKey) -> Optional[Dict[str, Any]]:
+        tool, doc_id, section_id, anchor, before, after = key
+        if tool != CHUNK_WINDOW_TOOL or not anchor:
+            return None
+        for (c_tool, c_doc, c_section, c_anchor, c_before, c_after), result in self._results.items():
+            if (c_tool, c_doc, c_section, c_anchor) == (tool, doc_id, section_id, anchor) and c_before >= before and c_after >= after:
+                return _trim_window(result, anchor, before, after)
+        return None
+
+
+def _trim_window(result: Dict[str, Any], anchor: str, before: int, after: int) -> Dict[str, Any]:
+    body = result.get("result")
+    if not isinstance(body, dict):
+        return result
+    chunks: List[Dict[str, Any]] = body.get("chunks") or []
+    position = next((i for i, chunk in enumerate(chunks) if chunk.get("chunk_id") == anchor), None)
+    if position is None:
+        return result
+    trimmed = chunks[max(0, position - before): position + after + 1]
+    text_len = sum(len(chunk.get("text") or "") for chunk in trimmed)
+    return {
+        **result,
+        "result": {
+            **body,
+            "window_before": before,
+            "window_after": after,
+            "requested_total": before + after + 1,
+            "chunks": trimmed,
+            "count": len(trimmed),
+            "tokens": text_len // 4,
+        },
+    }
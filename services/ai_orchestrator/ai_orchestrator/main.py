@@ -1,10 +1,13 @@
 from contextlib import asynccontextmanager
 
-import httpx
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from ai_orchestrator.config import get_settings
+from ai_orchestrator.core.ingestion_events import IngestionEventsListener
 from ai_orchestrator.core.orchestrator import Orchestrator
+from ai_orchestrator.deadline import DeadlineExceeded, DeadlineMiddleware, deadline_exceeded_handler
+from ai_orchestrator.http_client import PoolMetrics, create_http_client
 from ai_orchestrator.logging import configure_logging
 from ai_orchestrator.routers import orchestrator
 
@@ -14,17 +17,47 @@ configure_logging(settings.log_level)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Allow long-running upstream calls; disable client-side timeout.
-    async with httpx.AsyncClient(timeout=None) as client:
+    metrics = PoolMetrics()
+    async with create_http_client(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        http2=settings.http2,
+        metrics=metrics,
+        timeout=settings.http_timeout_seconds,
+    ) as client:
+        app.state.http_metrics = metrics
         app.state.orchestrator = Orchestrator(settings, client)
         app.state.settings = settings
-        yield
+        listener = None
+        if settings.answer_cache_enabled and settings.ingestion_events_redis_url:
+            listener = IngestionEventsListener(
+                settings.ingestion_events_redis_url, settings.ingestion_events_stream, app.state.orchestrator.answer_cache
+            )
+            listener.start()
+        try:
+            yield
+        finally:
+            if listener is not None:
+                await listener.stop()
 
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
+app.add_middleware(DeadlineMiddleware)
+app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
 app.include_router(orchestrator.router)
 
 
 @app.get("/health", tags=["health"])
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics() -> str:
+    orchestrator_state = app.state.orchestrator
+    return (
+        app.state.http_metrics.render_prometheus()
+        + orchestrator_state.flights.render_prometheus("orchestrator_respond")
+        + orchestrator_state.answer_cache.render_prometheus()
+    )
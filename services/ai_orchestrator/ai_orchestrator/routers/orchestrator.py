@@ -1,8 +1,12 @@
-from typing import Any, Dict
+import asyncio
+import json
+from typing import Any, Dict, Tuple
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 from ai_orchestrator.core.orchestrator import Orchestrator
+from ai_orchestrator.deadline import DeadlineExceeded, within_deadline
 from ai_orchestrator.schemas import OrchestratorRequest, OrchestratorResponse
 
 router = APIRouter(prefix="/internal/orchestrator", tags=["orchestrator"])
@@ -21,7 +25,65 @@ async def respond(
     orchestrator: Orchestrator = Depends(get_orchestrator),
 ) -> OrchestratorResponse:
     request = OrchestratorRequest(**payload)
-    return await orchestrator.respond(request)
+    return await within_deadline(orchestrator.respond_coalesced(request))
+
+
+@router.post("/respond/stream")
+async def respond_stream(
+    payload: Dict[str, Any],
+    orchestrator: Orchestrator = Depends(get_orchestrator),
+) -> StreamingResponse:
+    """SSE-вариант /respond: ``event: delta`` с кусками текста ответа по мере генерации,
+    затем ``event: done`` с полным OrchestratorResponse или ``event: error``. ``event: reset``
+    означает, что текст, полученный до него, не был ответом (шаг LLM перешёл к вызову
+    инструмента) и должен быть отброшен."""
+    request = OrchestratorRequest(**payload)
+    queue: asyncio.Queue[Tuple[str, Dict[str, Any]]] = asyncio.Queue()
+
+    async def on_delta(text: str) -> None:
+        await queue.put(("delta", {"text": text}))
+
+    async def on_reset() -> None:
+        await queue.put(("reset", {}))
+
+    async def run() -> None:
+        try:
+            response = await within_deadline(orchestrator.respond(request, on_delta=on_delta, on_reset=on_reset))
+            await queue.put(("done", response.model_dump()))
+        except DeadlineExceeded as exc:
+            await queue.put(("error", {"status_code": 504, "detail": str(exc)}))
+        except HTTPException as exc:
+            await queue.put(("error", {"status_code": exc.status_code, "detail": exc.detail}))
+        except Exception as exc:
+            await queue.put(("error", {"status_code": 500, "detail": str(exc)}))
+
+    async def events():
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event, data = await queue.get()
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+                if event not in ("delta", "reset"):
+                    break
+        finally:
+            # клиент отключился — не продолжаем генерацию впустую
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.post("/answer-cache/invalidate")
+async def invalidate_answer_cache(
+    payload: Dict[str, Any],
+    orchestrator: Orchestrator = Depends(get_orchestrator),
+) -> Dict[str, int]:
+    """Сбрасывает кэшированные ответы, опирающиеся на ``doc_ids`` (в пределах ``tenant_id``, если он задан)."""
+    doc_ids = payload.get("doc_ids") or []
+    if not isinstance(doc_ids, list) or not doc_ids:
+        raise HTTPException(status_code=400, detail="doc_ids required")
+    invalidated = orchestrator.answer_cache.invalidate([str(doc_id) for doc_id in doc_ids], tenant_id=payload.get("tenant_id"))
+    return {"invalidated": invalidated}
 
 
 @router.get("/config")
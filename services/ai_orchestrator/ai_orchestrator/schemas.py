@@ -58,6 +58,7 @@ class Telemetry(BaseModel):
     retrieval_latency_ms: Optional[int] = None
     llm_latency_ms: Optional[int] = None
     tool_steps: Optional[int] = None
+    answer_cache_hit: bool = False
 
 
 class OrchestratorResponse(BaseModel):
@@ -0,0 +1,45 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ai_orchestrator.http_client import PoolMetrics, create_http_client
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_shared_client_reuses_keepalive_connection():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    metrics = PoolMetrics()
+
+    async def scenario():
+        async with create_http_client(metrics=metrics, timeout=5.0) as client:
+            for _ in range(3):
+                resp = await client.get(url)
+                assert resp.text == "ok"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    stats = metrics.stats()
+    assert stats["requests"] == 3
+    assert stats["connections_opened"] == 1
+    assert abs(stats["reuse_ratio"] - 2 / 3) < 1e-6
+    assert "http_client_connection_reuse_ratio 0.6667" in metrics.render_prometheus()
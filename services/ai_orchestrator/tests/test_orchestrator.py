@@ -1,13 +1,18 @@
 import asyncio
+import json
+import time
 from unittest.mock import AsyncMock
 
 import httpx
 import pytest
 
 from ai_orchestrator.config import Settings
-from ai_orchestrator.clients.runtime import RuntimeResult
+from ai_orchestrator.clients.runtime import LLMRuntimeClient, RuntimeResult
+from ai_orchestrator.core.answer_cache import SemanticAnswerCache, section_set
+from ai_orchestrator.core.ingestion_events import apply_ingestion_event
 from ai_orchestrator.core.orchestrator import Orchestrator, ProgressiveWindowState
-from ai_orchestrator.schemas import OrchestratorRequest, UserContext
+from ai_orchestrator.deadline import Deadline, DeadlineExceeded, _current_deadline, remaining_budget, within_deadline
+from ai_orchestrator.schemas import OrchestratorRequest, SourceItem, UserContext
 
 
 @pytest.mark.anyio
@@ -152,6 +157,163 @@ async def test_orchestrator_uses_mcp_when_no_chunks():
         )
 
 
+def test_orchestrator_executes_all_tool_calls_of_a_turn_concurrently():
+    asyncio.run(_run_parallel_tool_calls_scenario())
+
+
+async def _run_parallel_tool_calls_scenario():
+    settings = Settings(mock_mode=False, max_tool_steps=3, max_parallel_tool_calls=2)
+    async with httpx.AsyncClient() as client:
+        orchestrator = Orchestrator(settings, client)
+        orchestrator.retrieval.search = AsyncMock(return_value=([], None))  # type: ignore[assignment]
+        choice = {
+            "message": {
+                "tool_calls": [
+                    {"function": {"name": "read_doc_section", "arguments": json.dumps({"doc_id": "doc_1", "section_id": f"sec_{i}"})}}
+                    for i in range(3)
+                ]
+            }
+        }
+        turn = orchestrator.runtime._map_choice(choice, {})
+        assert [call.arguments["section_id"] for call in turn.tool_calls] == ["sec_0", "sec_1", "sec_2"]
+        runtime_calls = []
+
+        async def fake_chat(payload):
+            runtime_calls.append(payload)
+            if len(runtime_calls) == 1:
+                return turn
+            return RuntimeResult(type="message", content="done", tool_name=None, tool_arguments=None, usage={"prompt_tokens": 0, "completion_tokens": 0})
+
+        orchestrator.runtime.chat_completion = fake_chat  # type: ignore[assignment]
+        running, peak = 0, 0
+
+        async def fake_execute(tool_name, args, user, trace_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"status": "ok", "result": {"text": args["section_id"]}}
+
+        orchestrator.mcp.execute = fake_execute  # type: ignore[assignment]
+
+        response = await orchestrator.respond(OrchestratorRequest(query="Tell me", user_id="u", tenant_id="t"))
+    assert len(runtime_calls) == 2
+    assert peak == 2
+    assert [trace.arguments["section_id"] for trace in response.tools] == ["sec_0", "sec_1", "sec_2"]
+    tool_messages = [m["content"] for m in runtime_calls[-1]["messages"] if str(m.get("content", "")).startswith("TOOL_RESULT")]
+    assert [json.loads(m[len("TOOL_RESULT:"):])["result"]["text"] for m in tool_messages] == ["sec_0", "sec_1", "sec_2"]
+
+
+def test_speculative_prefetch_serves_first_chunk_window_call():
+    async def scenario():
+        settings = Settings(mock_mode=False, max_tool_steps=3, window_radius=2, speculative_prefetch=True, speculative_prefetch_top_k=1)
+        async with httpx.AsyncClient() as client:
+            orchestrator = Orchestrator(settings, client)
+            orchestrator.retrieval.search = AsyncMock(  # type: ignore[assignment]
+                return_value=(
+                    [
+                        {"doc_id": "doc_1", "section_id": "sec_a", "anchor_chunk_id": "c_a", "summary": "A"},
+                        {"doc_id": "doc_1", "section_id": "sec_b", "anchor_chunk_id": "c_b", "summary": "B"},
+                    ],
+                    None,
+                )
+            )
+            mcp_calls = []
+            prefetch_started = asyncio.Event()
+
+            async def fake_execute(tool_name, args, user, trace_id):
+                mcp_calls.append((tool_name, dict(args)))
+                prefetch_started.set()
+                return {"status": "ok", "result": {"chunks": [{"text": "window text"}]}}
+
+            runtime_calls = []
+
+            async def fake_chat(payload):
+                runtime_calls.append(payload)
+                if len(runtime_calls) == 1:
+                    # prefetch runs while the first LLM request is in flight
+                    await asyncio.wait_for(prefetch_started.wait(), timeout=1)
+                    return RuntimeResult(
+                        type="tool_call",
+                        content=None,
+                        tool_name="read_chunk_window",
+                        tool_arguments={"doc_id": "doc_1", "section_id": "sec_a"},
+                        usage={"prompt_tokens": 0, "completion_tokens": 0},
+                    )
+                return RuntimeResult(type="message", content="done", tool_name=None, tool_arguments=None, usage={"prompt_tokens": 0, "completion_tokens": 0})
+
+            orchestrator.mcp.execute = fake_execute  # type: ignore[assignment]
+            orchestrator.runtime.chat_completion = fake_chat  # type: ignore[assignment]
+            response = await orchestrator.respond(OrchestratorRequest(query="Tell me", user_id="u", tenant_id="t"))
+        return response, mcp_calls
+
+    response, mcp_calls = asyncio.run(scenario())
+    assert response.answer == "done"
+    assert mcp_calls == [
+        ("read_chunk_window", {"doc_id": "doc_1", "section_id": "sec_a", "anchor_chunk_id": "c_a", "window_before": 1, "window_after": 1})
+    ]
+    assert "window text" in response.tools[0].result_summary
+
+
+def test_repeated_and_covered_tool_calls_are_answered_locally():
+    async def scenario():
+        settings = Settings(mock_mode=False, max_tool_steps=5, window_radius=2)
+        async with httpx.AsyncClient() as client:
+            orchestrator = Orchestrator(settings, client)
+            orchestrator.retrieval.search = AsyncMock(  # type: ignore[assignment]
+                return_value=(
+                    [
+                        {"doc_id": "doc_1", "section_id": "sec_a", "anchor_chunk_id": "c2", "summary": "A"},
+                        {"doc_id": "doc_1", "section_id": "sec_b", "summary": "B"},
+                    ],
+                    None,
+                )
+            )
+            turns = [
+                {"doc_id": "doc_1", "section_id": "sec_a", "window_before": 2, "window_after": 2},
+                {"doc_id": "doc_1", "section_id": "sec_a", "window_before": 1, "window_after": 1},
+                {"doc_id": "doc_1", "section_id": "sec_b"},
+                {"doc_id": "doc_1", "section_id": "sec_b"},
+            ]
+            runtime_calls = []
+
+            async def fake_chat(payload):
+                runtime_calls.append(payload)
+                if len(runtime_calls) <= len(turns):
+                    return RuntimeResult(
+                        type="tool_call",
+                        content=None,
+                        tool_name="read_chunk_window",
+                        tool_arguments=turns[len(runtime_calls) - 1],
+                        usage={"prompt_tokens": 0, "completion_tokens": 0},
+                    )
+                return RuntimeResult(type="message", content="done", tool_name=None, tool_arguments=None, usage={"prompt_tokens": 0, "completion_tokens": 0})
+
+            mcp_calls = []
+
+            async def fake_execute(tool_name, args, user, trace_id):
+                mcp_calls.append((tool_name, args.get("section_id")))
+                if tool_name == "read_doc_section":
+                    return {"status": "ok", "result": {"text": "section text"}}
+                chunks = [{"chunk_id": f"c{i}", "text": f"t{i}"} for i in range(5)]
+                return {"status": "ok", "result": {"anchor_chunk_id": "c2", "chunks": chunks, "count": 5}}
+
+            orchestrator.runtime.chat_completion = fake_chat  # type: ignore[assignment]
+            orchestrator.mcp.execute = fake_execute  # type: ignore[assignment]
+            response = await orchestrator.respond(OrchestratorRequest(query="Tell me", user_id="u", tenant_id="t"))
+        return response, mcp_calls, runtime_calls
+
+    response, mcp_calls, runtime_calls = asyncio.run(scenario())
+    assert response.answer == "done"
+    assert mcp_calls == [("read_chunk_window", "sec_a"), ("read_doc_section", "sec_b")]
+    tool_results = [
+        json.loads(m["content"][len("TOOL_RESULT:"):]) for m in runtime_calls[-1]["messages"] if str(m.get("content", "")).startswith("TOOL_RESULT")
+    ]
+    assert [c["chunk_id"] for c in tool_results[1]["result"]["chunks"]] == ["c1", "c2", "c3"]
+    assert tool_results[3] == tool_results[2]
+
+
 @pytest.mark.anyio
 async def test_tool_schema_advertises_radius_limits():
     settings = Settings(mock_mode=True, window_radius=4)
@@ -163,3 +325,233 @@ async def test_tool_schema_advertises_radius_limits():
     assert props["window_before"]["maximum"] == settings.window_radius
     assert props["window_after"]["maximum"] == settings.window_radius
     assert props["radius"]["maximum"] == settings.window_radius
+
+
+@pytest.mark.anyio
+async def test_runtime_stream_forwards_text_and_assembles_tool_calls():
+    def sse(*chunks):
+        return "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+
+    bodies = [
+        sse(
+            {"choices": [{"delta": {"tool_calls": [{"index": 0, "function": {"name": "read_doc_section", "arguments": '{"doc_id": "doc_1", '}}]}}]},
+            {"choices": [{"delta": {"tool_calls": [{"index": 0, "function": {"arguments": '"section_id": "sec_intro"}'}}]}}]},
+        ),
+        sse(
+            {"choices": [{"delta": {"content": "Hel"}}]},
+            {"choices": [{"delta": {"content": "lo"}}]},
+            {"choices": [], "usage": {"prompt_tokens": 7, "completion_tokens": 2}},
+        ),
+    ]
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(json.loads(request.content))
+        return httpx.Response(200, text=bodies[len(sent) - 1], headers={"content-type": "text/event-stream"})
+
+    settings = Settings(mock_mode=False, llm_runtime_url="http://runtime.local/v1/chat/completions")
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        runtime = LLMRuntimeClient(settings, client)
+        deltas = []
+
+        async def on_delta(text):
+            deltas.append(text)
+
+        tool_step = await runtime.chat_completion({"messages": []}, stream=True, on_delta=on_delta)
+        answer = await runtime.chat_completion({"messages": []}, stream=True, on_delta=on_delta)
+
+    assert sent[0]["stream"] is True
+    assert tool_step.type == "tool_call"
+    assert tool_step.tool_name == "read_doc_section"
+    assert tool_step.tool_arguments == {"doc_id": "doc_1", "section_id": "sec_intro"}
+    assert answer.type == "message" and answer.content == "Hello"
+    assert answer.usage == {"prompt_tokens": 7, "completion_tokens": 2}
+    assert deltas == ["Hel", "lo"]
+
+
+def test_concurrent_identical_requests_share_one_computation():
+    settings = Settings(mock_mode=True)
+    runs = []
+
+    async def scenario():
+        async with httpx.AsyncClient() as client:
+            orchestrator = Orchestrator(settings, client)
+            original = orchestrator.respond
+
+            async def counting_respond(request, on_delta=None):
+                runs.append(request.query)
+                await asyncio.sleep(0.05)
+                return await original(request, on_delta)
+
+            orchestrator.respond = counting_respond  # type: ignore[assignment]
+            user = UserContext(user_id="u1", tenant_id="tenant_1", roles=["support"])
+            requests = [
+                OrchestratorRequest(query="How to  configure LDAP?", user=user, trace_id="t1"),
+                OrchestratorRequest(query="how to configure ldap?", user=user.model_copy(update={"user_id": "u2"}), trace_id="t2"),
+                OrchestratorRequest(query="How to configure LDAP?", user=user, trace_id="t3", doc_ids=["doc_1"]),
+            ]
+            return await asyncio.gather(*(orchestrator.respond_coalesced(request) for request in requests))
+
+    first, second, third = asyncio.run(scenario())
+
+    assert len(runs) == 2  # разные doc_ids — отдельное вычисление
+    assert second.answer == first.answer
+    assert [r.telemetry.trace_id for r in (first, second, third)] == ["t1", "t2", "t3"]
+
+
+def test_coalesced_request_outlives_leader_deadline():
+    settings = Settings(mock_mode=True)
+    budgets = []
+
+    async def scenario():
+        async with httpx.AsyncClient() as client:
+            orchestrator = Orchestrator(settings, client)
+            original = orchestrator.respond
+
+            async def slow_respond(request, on_delta=None):
+                await asyncio.sleep(0.2)
+                budgets.append(remaining_budget())
+                return await original(request, on_delta)
+
+            orchestrator.respond = slow_respond  # type: ignore[assignment]
+            user = UserContext(user_id="u1", tenant_id="tenant_1")
+
+            async def call(trace_id, budget):
+                _current_deadline.set(Deadline.after(budget))
+                request = OrchestratorRequest(query="How to configure LDAP?", user=user, trace_id=trace_id)
+                return await within_deadline(orchestrator.respond_coalesced(request))
+
+            return await asyncio.gather(call("leader", 0.05), call("follower", 5.0), return_exceptions=True)
+
+    leader, follower = asyncio.run(scenario())
+
+    assert isinstance(leader, DeadlineExceeded)
+    assert follower.telemetry.trace_id == "follower"
+    # дедлайн лидера истёк, а общее вычисление продолжается под дедлайном последователя
+    assert len(budgets) == 1 and budgets[0] > 4
+
+
+def test_answer_cache_serves_paraphrase_without_llm_until_document_reingested():
+    settings = Settings(mock_mode=True, answer_cache_enabled=True, answer_cache_similarity_threshold=0.9)
+    vectors = {
+        "how to configure ldap?": [1.0, 0.0, 0.1],
+        "ldap configuration steps": [0.95, 0.05, 0.12],
+        "how to reset a password?": [0.0, 1.0, 0.0],
+    }
+    llm_calls = []
+
+    async def scenario():
+        async with httpx.AsyncClient() as client:
+            orchestrator = Orchestrator(settings, client)
+            original = orchestrator.runtime.chat_completion
+
+            async def fake_embed(text):
+                return vectors[text]
+
+            async def counting_completion(payload, stream=False, on_delta=None):
+                llm_calls.append(next(m["content"] for m in payload["messages"] if m["role"] == "user"))
+                return await original(payload, stream=stream, on_delta=on_delta)
+
+            orchestrator.embeddings.embed = fake_embed  # type: ignore[assignment]
+            orchestrator.embeddings.semantic = True  # как с настоящим сервисом эмбеддингов
+            orchestrator.runtime.chat_completion = counting_completion  # type: ignore[assignment]
+            user = UserContext(user_id="u1", tenant_id="tenant_1")
+            first = await orchestrator.respond(OrchestratorRequest(query="How to configure LDAP?", user=user))
+            paraphrase = await orchestrator.respond(OrchestratorRequest(query="LDAP configuration steps", user=user, trace_id="t2"))
+            other = await orchestrator.respond(OrchestratorRequest(query="How to reset a password?", user=user))
+            other_tenant = await orchestrator.respond(
+                OrchestratorRequest(query="LDAP configuration steps", user=UserContext(user_id="u2", tenant_id="tenant_2"))
+            )
+            invalidated = apply_ingestion_event(orchestrator.answer_cache, {"event": "document_ingested", "doc_id": "doc_1", "tenant_id": "tenant_1"})
+            after_reingest = await orchestrator.respond(OrchestratorRequest(query="LDAP configuration steps", user=user))
+            return first, paraphrase, other, other_tenant, invalidated, after_reingest, orchestrator.answer_cache
+
+    first, paraphrase, other, other_tenant, invalidated, after_reingest, cache = asyncio.run(scenario())
+
+    assert paraphrase.answer == first.answer
+    assert paraphrase.telemetry.answer_cache_hit and paraphrase.telemetry.trace_id == "t2"
+    assert [s.doc_id for s in paraphrase.sources] == [s.doc_id for s in first.sources]
+    assert not other.telemetry.answer_cache_hit
+    assert not other_tenant.telemetry.answer_cache_hit
+    assert invalidated == 2  # записи tenant_1: исходный вопрос и про пароль
+    assert not after_reingest.telemetry.answer_cache_hit
+    steps = llm_calls.count("How to configure LDAP?")
+    assert steps and llm_calls.count("How to reset a password?") == steps
+    assert llm_calls.count("LDAP configuration steps") == 2 * steps  # другой tenant и после переиндексации; попадание — без LLM
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert "orchestrator_answer_cache_hit_ratio 0.2000" in cache.render_prometheus()
+
+
+def test_answer_cache_without_embedding_service_matches_only_the_same_query():
+    settings = Settings(mock_mode=True, answer_cache_enabled=True)
+
+    async def scenario():
+        async with httpx.AsyncClient() as client:
+            orchestrator = Orchestrator(settings, client)
+            user = UserContext(user_id="u1", tenant_id="tenant_1")
+            first = await orchestrator.respond(OrchestratorRequest(query="How to configure LDAP?", user=user))
+            other = await orchestrator.respond(OrchestratorRequest(query="How to reset a password?", user=user))
+            repeat = await orchestrator.respond(OrchestratorRequest(query="how to  configure ldap?", user=user))
+            return first, other, repeat
+
+    first, other, repeat = asyncio.run(scenario())
+
+    assert [s.doc_id for s in other.sources] == [s.doc_id for s in first.sources]  # те же секции контекста
+    assert not other.telemetry.answer_cache_hit
+    assert repeat.telemetry.answer_cache_hit and repeat.answer == first.answer
+
+
+def test_answer_cache_requires_same_sections_and_expires():
+    cache = SemanticAnswerCache(similarity_threshold=0.9, ttl_seconds=0.05)
+    sections = section_set([{"doc_id": "doc_1", "section_id": "sec_a"}, {"doc_id": "doc_2", "section_id": "sec_b"}])
+    cache.store("tenant_1", "model", [1.0, 0.0], sections, "answer", [SourceItem(doc_id="doc_1", section_id="sec_a")])
+
+    assert cache.lookup("tenant_1", "model", [0.99, 0.05], sections) is not None
+    assert cache.lookup("tenant_1", "model", [0.99, 0.05], section_set([{"doc_id": "doc_1", "section_id": "sec_a"}])) is None
+    assert cache.lookup("tenant_1", "other-model", [0.99, 0.05], sections) is None
+    time.sleep(0.06)
+    assert cache.lookup("tenant_1", "model", [1.0, 0.0], sections) is None
+    assert len(cache) == 0
+
+
+def test_streamed_text_of_a_tool_call_step_is_reset():
+    def sse(*chunks):
+        return "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+
+    bodies = [
+        sse(
+            {"choices": [{"delta": {"content": "Let me check the docs… "}}]},
+            {"choices": [{"delta": {"tool_calls": [{"index": 0, "function": {"name": "read_doc_section", "arguments": '{"doc_id": "doc_1", '}}]}}]},
+            {"choices": [{"delta": {"tool_calls": [{"index": 0, "function": {"arguments": '"section_id": "sec_intro"}'}}]}}]},
+        ),
+        sse({"choices": [{"delta": {"content": "Final "}}]}, {"choices": [{"delta": {"content": "answer"}}]}),
+    ]
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return httpx.Response(200, text=bodies[len(sent) - 1], headers={"content-type": "text/event-stream"})
+
+    async def scenario():
+        settings = Settings(mock_mode=False, max_tool_steps=3, llm_runtime_url="http://runtime.local/v1/chat/completions")
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            orchestrator = Orchestrator(settings, client)
+            orchestrator.retrieval.search = AsyncMock(return_value=([], None))  # type: ignore[assignment]
+            orchestrator.mcp.execute = AsyncMock(return_value={"status": "ok", "result": {"text": "section text"}})  # type: ignore[assignment]
+            events = []
+
+            async def on_delta(text):
+                events.append(("delta", text))
+
+            async def on_reset():
+                events.append(("reset", None))
+
+            response = await orchestrator.respond(OrchestratorRequest(query="Tell me", user_id="u", tenant_id="t"), on_delta=on_delta, on_reset=on_reset)
+            return response, events
+
+    response, events = asyncio.run(scenario())
+
+    assert events == [("delta", "Let me check the docs… "), ("reset", None), ("delta", "Final "), ("delta", "answer")]
+    last_reset = max(i for i, (kind, _) in enumerate(events) if kind == "reset")
+    assert "".join(text for _, text in events[last_reset + 1:]) == response.answer == "Final answer"
+    assert [trace.name for trace in response.tools] == ["read_doc_section"]
@@ -1,5 +1,10 @@
+import asyncio
+import json
+import time
+
 from fastapi.testclient import TestClient
 
+from ai_orchestrator.deadline import deadline_headers
 from ai_orchestrator.main import app
 
 
@@ -30,3 +35,48 @@ def test_orchestrator_allows_missing_user():
         data = resp.json()
         assert data["answer"]
         assert data["sources"]
+
+
+def test_orchestrator_streams_deltas_then_done():
+    with TestClient(app) as client:
+        with client.stream("POST", "/internal/orchestrator/respond/stream", json=payload()) as resp:
+            assert resp.status_code == 200
+            assert resp.headers["content-type"].startswith("text/event-stream")
+            events = []
+            for block in resp.iter_text():
+                events.append(block)
+        body = "".join(events)
+        frames = [frame for frame in body.split("\n\n") if frame]
+        names = [frame.split("\n")[0].removeprefix("event: ") for frame in frames]
+        assert names[-1] == "done"
+        assert names[:-1] and set(names[:-1]) == {"delta"}
+        deltas = "".join(json.loads(frame.split("\n")[1].removeprefix("data: "))["text"] for frame in frames[:-1])
+        done = json.loads(frames[-1].split("\n")[1].removeprefix("data: "))
+        assert deltas == done["answer"]
+        assert done["telemetry"]["trace_id"] == "trace-123"
+
+
+def test_orchestrator_cancels_work_when_request_deadline_expires():
+    seen = {}
+
+    async def slow_execute(tool_name, arguments, user, trace_id):
+        seen["headers"] = deadline_headers()
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            seen["cancelled"] = True
+            raise
+        return {"status": "ok", "result": {}}
+
+    with TestClient(app) as client:
+        client.app.state.orchestrator.mcp.execute = slow_execute
+        deadline = f"{time.time() + 0.3:.3f}"
+        started = time.perf_counter()
+        resp = client.post("/internal/orchestrator/respond", json=payload(), headers={"X-Request-Deadline": deadline})
+        assert resp.status_code == 504
+        assert time.perf_counter() - started < 2
+        assert seen["headers"] == {"X-Request-Deadline": deadline}
+        assert seen["cancelled"]
+
+        expired = client.post("/internal/orchestrator/respond", json=payload(), headers={"X-Request-Deadline": f"{time.time() - 1:.3f}"})
+        assert expired.status_code == 504
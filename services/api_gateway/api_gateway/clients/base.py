@@ -1,12 +1,30 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 from urllib.parse import urljoin
 
 import httpx
 from fastapi import HTTPException
 
 from api_gateway.core.context import get_request_context
+from api_gateway.deadline import DeadlineExceeded, current_deadline, deadline_headers, hop_timeout
+
+
+async def iter_sse_events(response: httpx.Response) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Разбирает поток ``text/event-stream`` на пары (event, JSON data)."""
+    event, data_lines = "message", []
+    async for line in response.aiter_lines():
+        if line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+        elif not line and data_lines:
+            yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+    if data_lines:
+        yield event, json.loads("\n".join(data_lines))
 
 
 class DownstreamClient:
@@ -44,10 +62,23 @@ class DownstreamClient:
             headers["X-User-ID"] = ctx.user.user_id
             if ctx.user.roles:
                 headers["X-User-Roles"] = ",".join(ctx.user.roles)
+        headers.update(deadline_headers())
         if extra:
             headers.update(extra)
         return headers
 
+    def _timeout(self) -> Any:
+        """Оставшийся бюджет запроса; без дедлайна — таймаут общего клиента."""
+        if current_deadline() is None:
+            return httpx.USE_CLIENT_DEFAULT
+        try:
+            return hop_timeout(None)
+        except DeadlineExceeded as exc:
+            raise HTTPException(status_code=504, detail=str(exc)) from exc
+
+    def _timed_out(self, exc: httpx.TimeoutException) -> HTTPException:
+        return HTTPException(status_code=504, detail=f"{self.service_name} timed out: {exc}")
+
     def _handle_response(self, response: httpx.Response) -> httpx.Response:
         try:
             response.raise_for_status()
@@ -60,24 +91,45 @@ class DownstreamClient:
         self, path: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None
     ) -> httpx.Response:
         url = self._build_url(path)
-        response = await self.http_client.post(url, json=payload, headers=self._build_headers(headers))
+        try:
+            response = await self.http_client.post(url, json=payload, headers=self._build_headers(headers), timeout=self._timeout())
+        except httpx.TimeoutException as exc:
+            raise self._timed_out(exc) from exc
         return self._handle_response(response)
 
+    @asynccontextmanager
+    async def stream_post_json(
+        self, path: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[httpx.Response]:
+        url = self._build_url(path)
+        timeout = self._timeout()
+        async with self.http_client.stream("POST", url, json=payload, headers=self._build_headers(headers), timeout=timeout) as response:
+            if response.is_error:
+                await response.aread()
+            yield self._handle_response(response)
+
     async def get(
         self, path: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None
     ) -> httpx.Response:
         url = self._build_url(path)
-        response = await self.http_client.get(url, params=params, headers=self._build_headers(headers))
+        try:
+            response = await self.http_client.get(url, params=params, headers=self._build_headers(headers), timeout=self._timeout())
+        except httpx.TimeoutException as exc:
+            raise self._timed_out(exc) from exc
         return self._handle_response(response)
 
     async def post_multipart(
-        self, path: str, data: Dict[str, Any], files: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+        self, path: str, data: Dict[str, Any], files: Any, headers: Optional[Dict[str, str]] = None
     ) -> httpx.Response:
         url = self._build_url(path)
-        response = await self.http_client.post(
-            url,
-            data=data,
-            files=files,
-            headers=self._build_headers(headers),
-        )
+        try:
+            response = await self.http_client.post(
+                url,
+                data=data,
+                files=files,
+                headers=self._build_headers(headers),
+                timeout=self._timeout(),
+            )
+        except httpx.TimeoutException as exc:
+            raise self._timed_out(exc) from exc
         return self._handle_response(response)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import secrets
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence, Tuple
 
 from fastapi import HTTPException, status
 
@@ -19,3 +19,14 @@ class IngestionClient(DownstreamClient):
         except Exception as exc:  # pragma: no cover
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"ingestion error: {exc}") from exc
         return response.json()
+
+    async def enqueue_batch(self, data: Dict[str, Any], files: Sequence[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        if self.mock_mode:
+            return [{"doc_id": f"mock_{secrets.token_hex(4)}", "status": "uploaded"} for _ in files]
+        try:
+            response = await self.post_multipart("/internal/ingestion/enqueue/batch", data=data, files=files)
+        except HTTPException:
+            raise
+        except Exception as exc:  # pragma: no cover
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"ingestion error: {exc}") from exc
+        return response.json()["items"]
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Tuple
 
+import httpx
 from fastapi import HTTPException, status
 
-from api_gateway.clients.base import DownstreamClient
+from api_gateway.clients.base import DownstreamClient, iter_sse_events
 
 
 class OrchestratorClient(DownstreamClient):
@@ -22,3 +23,22 @@ class OrchestratorClient(DownstreamClient):
         except Exception as exc:  # pragma: no cover
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"orchestrator error: {exc}") from exc
         return response.json()
+
+    async def stream(self, payload: Dict[str, Any]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """События SSE-ответа оркестратора: ``delta`` ({"text"}) и ``reset`` (отбросить полученный
+        до него текст), затем ``done`` или ``error``."""
+        if self.mock_mode:
+            for part in ("Mock ", "answer ", "from ", "orchestrator"):
+                yield "delta", {"text": part}
+            yield "done", await self.query(payload)
+            return
+        try:
+            async with self.stream_post_json("/internal/orchestrator/respond/stream", payload) as response:
+                async for event in iter_sse_events(response):
+                    yield event
+        except HTTPException:
+            raise
+        except httpx.TimeoutException as exc:
+            raise self._timed_out(exc) from exc
+        except Exception as exc:
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"orchestrator error: {exc}") from exc
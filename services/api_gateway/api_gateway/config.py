@@ -25,6 +25,12 @@ class Settings(BaseSettings):
     auth_audience: Optional[str] = None
     auth_timeout_seconds: float = 5.0
     http_timeout_seconds: float = 0.0
+    request_deadline_seconds: float = 120.0  # бюджет запроса (X-Request-Deadline), 0 — без дедлайна
+    upload_deadline_seconds: float = 0.0  # бюджет /api/v1/documents/upload*, включая приём тела; 0 — без дедлайна
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2: bool = True  # действует, только если установлен пакет h2
     rate_limit_per_minute: int = 120
     mock_mode: bool = False
     # Force all UI traffic to the shared observer tenant to keep data consistent.
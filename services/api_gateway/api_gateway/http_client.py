@@ -0,0 +1,100 @@
+"""Общий пул keep-alive соединений для исходящих HTTP-вызовов сервиса.
+
+Клиент создаётся один раз в lifespan и переиспользуется всеми вызовами, поэтому TCP/TLS
+handshake выполняется только при открытии нового соединения пула. ``PoolMetrics`` считает
+запросы и открытые соединения через trace-события httpcore: доля запросов, обслуженных
+уже открытым соединением, — ``1 - connections_opened / requests``.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from typing import Any, Dict, Optional
+
+import httpx
+
+CONNECT_EVENT = "connection.connect_tcp.complete"
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections_opened = 0
+
+    async def on_request(self, request: httpx.Request) -> None:
+        self.on_sync_request(request)
+        request.extensions["trace"] = self._trace
+
+    def on_sync_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+        request.extensions["trace"] = self._sync_trace
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._sync_trace(event_name, info)
+
+    def _sync_trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == CONNECT_EVENT:
+            self.connections_opened += 1
+
+    def stats(self) -> Dict[str, float]:
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "reuse_ratio": reused / self.requests if self.requests else 0.0,
+        }
+
+    def render_prometheus(self, prefix: str = "http_client") -> str:
+        stats = self.stats()
+        return "\n".join(
+            [
+                f"# TYPE {prefix}_requests_total counter",
+                f"{prefix}_requests_total {stats['requests']}",
+                f"# TYPE {prefix}_connections_opened_total counter",
+                f"{prefix}_connections_opened_total {stats['connections_opened']}",
+                f"# TYPE {prefix}_connection_reuse_ratio gauge",
+                f"{prefix}_connection_reuse_ratio {stats['reuse_ratio']:.4f}",
+            ]
+        ) + "\n"
+
+
+def _limits(max_connections: int, max_keepalive_connections: int, keepalive_expiry: float) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+
+def create_http_client(
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    keepalive_expiry: float = 30.0,
+    http2: bool = True,
+    metrics: Optional[PoolMetrics] = None,
+    **kwargs: Any,
+) -> httpx.AsyncClient:
+    """``httpx.AsyncClient`` с настроенным пулом; HTTP/2 включается, только если установлен ``h2``."""
+    if metrics is not None:
+        kwargs["event_hooks"] = {"request": [metrics.on_request]}
+    limits = _limits(max_connections, max_keepalive_connections, keepalive_expiry)
+    return httpx.AsyncClient(limits=limits, http2=http2 and http2_available(), **kwargs)
+
+
+def create_sync_http_client(
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    keepalive_expiry: float = 30.0,
+    http2: bool = True,
+    metrics: Optional[PoolMetrics] = None,
+    **kwargs: Any,
+) -> httpx.Client:
+    """Синхронный вариант ``create_http_client`` (для кода, работающего в потоках)."""
+    if metrics is not None:
+        kwargs["event_hooks"] = {"request": [metrics.on_sync_request]}
+    limits = _limits(max_connections, max_keepalive_connections, keepalive_expiry)
+    return httpx.Client(limits=limits, http2=http2 and http2_available(), **kwargs)
@@ -1,11 +1,13 @@
 from contextlib import asynccontextmanager
 
-import httpx
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from api_gateway.config import get_settings
+from api_gateway.http_client import PoolMetrics, create_http_client
 from api_gateway.core.middleware import RequestContextMiddleware
+from api_gateway.deadline import DeadlineExceeded, DeadlineMiddleware, deadline_exceeded_handler
 from api_gateway.logging import configure_logging
 from api_gateway.routers import assistant, auth, documents, health
 
@@ -16,13 +18,29 @@ configure_logging(settings.log_level)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     timeout = None if settings.http_timeout_seconds == 0 else settings.http_timeout_seconds
-    async with httpx.AsyncClient(timeout=timeout) as client:
+    metrics = PoolMetrics()
+    async with create_http_client(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        http2=settings.http2,
+        metrics=metrics,
+        timeout=timeout,
+    ) as client:
+        app.state.http_metrics = metrics
         app.state.http_client = client
         yield
 
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
 app.add_middleware(RequestContextMiddleware)
+app.add_middleware(
+    DeadlineMiddleware,
+    budget_seconds=settings.request_deadline_seconds,
+    # загрузка тела медленным клиентом не должна съедать бюджет и обрывать upload по 504
+    path_budgets={"/api/v1/documents/upload": settings.upload_deadline_seconds},
+)
+app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.allowed_origins,
@@ -35,3 +53,8 @@ app.include_router(health.router)
 app.include_router(auth.router)
 app.include_router(assistant.router)
 app.include_router(documents.router)
+
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics() -> str:
+    return app.state.http_metrics.render_prometheus()
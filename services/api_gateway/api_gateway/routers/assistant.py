@@ -1,8 +1,12 @@
+import json
+from typing import Any, AsyncIterator, Dict, Tuple
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from api_gateway.clients.orchestrator import OrchestratorClient
 from api_gateway.clients.safety import SafetyClient
-from api_gateway.core.context import AuthenticatedUser, get_request_context
+from api_gateway.core.context import AuthenticatedUser, RequestContext, get_request_context
 from api_gateway.core.rate_limit import RateLimiter
 from api_gateway.dependencies import (
     get_current_user,
@@ -16,15 +20,13 @@ from api_gateway.schemas import AssistantQueryRequest, AssistantResponse, Assist
 router = APIRouter(prefix="/api/v1/assistant", tags=["assistant"])
 
 
-@router.post("/query", response_model=AssistantResponse)
-async def query_assistant(
+async def _prepare_downstream(
     payload: AssistantQueryRequest,
-    user: AuthenticatedUser = Depends(get_current_user),
-    safety_client: SafetyClient = Depends(get_safety_client),
-    orchestrator_client: OrchestratorClient = Depends(get_orchestrator_client),
-    rate_limiter: RateLimiter = Depends(get_rate_limiter),
-    settings: Settings = Depends(get_settings),
-) -> AssistantResponse:
+    user: AuthenticatedUser,
+    safety_client: SafetyClient,
+    rate_limiter: RateLimiter,
+    settings: Settings,
+) -> Tuple[Dict[str, Any], Dict[str, Any], RequestContext]:
     resolved_tenant = settings.default_tenant_id or user.tenant_id
     await rate_limiter.check(key=f"assistant:{resolved_tenant}:{user.user_id}")
     ctx = get_request_context()
@@ -68,8 +70,12 @@ async def query_assistant(
         }
     )
 
-    orchestrator_response = await orchestrator_client.query(downstream_payload)
+    return downstream_payload, safety_result, ctx
 
+
+def _to_assistant_response(
+    orchestrator_response: Dict[str, Any], safety_result: Dict[str, Any], ctx: RequestContext
+) -> AssistantResponse:
     sources = [AssistantSource(**src) for src in orchestrator_response.get("sources", [])]
     meta_payload = orchestrator_response.get("meta", {})
     meta = AssistantResponseMeta(
@@ -80,3 +86,72 @@ async def query_assistant(
     answer = orchestrator_response.get("answer", "")
 
     return AssistantResponse(answer=answer, sources=sources, meta=meta)
+
+
+@router.post("/query", response_model=AssistantResponse)
+async def query_assistant(
+    payload: AssistantQueryRequest,
+    user: AuthenticatedUser = Depends(get_current_user),
+    safety_client: SafetyClient = Depends(get_safety_client),
+    orchestrator_client: OrchestratorClient = Depends(get_orchestrator_client),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter),
+    settings: Settings = Depends(get_settings),
+) -> AssistantResponse:
+    downstream_payload, safety_result, ctx = await _prepare_downstream(payload, user, safety_client, rate_limiter, settings)
+    orchestrator_response = await orchestrator_client.query(downstream_payload)
+    return _to_assistant_response(orchestrator_response, safety_result, ctx)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/query/stream")
+async def query_assistant_stream(
+    payload: AssistantQueryRequest,
+    user: AuthenticatedUser = Depends(get_current_user),
+    safety_client: SafetyClient = Depends(get_safety_client),
+    orchestrator_client: OrchestratorClient = Depends(get_orchestrator_client),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter),
+    settings: Settings = Depends(get_settings),
+) -> StreamingResponse:
+    """SSE-вариант ``/query``: события ``delta`` ({"text"}) по мере генерации, затем ``done``
+    с полным ``AssistantResponse`` или ``error`` ({"status_code", "detail"}). ``reset``
+    транслируется как есть: клиент отбрасывает накопленный до него текст.
+
+    Первое событие оркестратора читается до отправки заголовков, поэтому ошибки
+    безопасности, лимитов и недоступности оркестратора возвращаются обычным HTTP-статусом;
+    обрыв потока после первого события приходит событием ``error``.
+    """
+    downstream_payload, safety_result, ctx = await _prepare_downstream(payload, user, safety_client, rate_limiter, settings)
+    events = orchestrator_client.stream(downstream_payload)
+    try:
+        first = await events.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="orchestrator returned an empty stream")
+    except BaseException:
+        await events.aclose()
+        raise
+
+    async def relay() -> AsyncIterator[str]:
+        event, data = first
+        try:
+            while True:
+                if event == "done":
+                    yield _sse("done", _to_assistant_response(data, safety_result, ctx).model_dump())
+                    return
+                yield _sse(event, data)
+                if event == "error":
+                    return
+                try:
+                    event, data = await events.__anext__()
+                except StopAsyncIteration:
+                    return
+                except HTTPException as exc:
+                    # заголовки 200 уже отправлены: обрыв оркестратора сообщаем событием потока
+                    yield _sse("error", {"status_code": exc.status_code, "detail": exc.detail})
+                    return
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(relay(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
@@ -28,14 +28,32 @@ async def upload_document(
     rate_limiter: RateLimiter = Depends(get_rate_limiter),
 ) -> DocumentUploadResponse:
     await rate_limiter.check(key=f"doc-upload:{user.tenant_id}:{user.user_id}")
-    file_bytes = await file.read()
-    files = {"file": (file.filename, file_bytes, file.content_type or "application/octet-stream")}
+    # передаём файловый объект: httpx отправляет его частями, без повторного чтения в память
+    files = {"file": (file.filename, file.file, file.content_type or "application/octet-stream")}
     metadata = {"tenant_id": user.tenant_id, "product": product, "version": version, "tags": tags}
     cleaned_metadata = {k: v for k, v in metadata.items() if v}
     response = await ingestion_client.enqueue(cleaned_metadata, files)
     return DocumentUploadResponse(**response)
 
 
+@router.post("/upload/batch", response_model=List[DocumentUploadResponse], status_code=202)
+async def upload_documents(
+    files: List[UploadFile] = File(...),
+    product: Optional[str] = Form(None),
+    version: Optional[str] = Form(None),
+    tags: Optional[str] = Form(None),
+    user: AuthenticatedUser = Depends(get_current_user),
+    ingestion_client: IngestionClient = Depends(get_ingestion_client),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter),
+) -> List[DocumentUploadResponse]:
+    await rate_limiter.check(key=f"doc-upload-batch:{user.tenant_id}:{user.user_id}")
+    parts = [("files", (f.filename, f.file, f.content_type or "application/octet-stream")) for f in files]
+    metadata = {"tenant_id": user.tenant_id, "product": product, "version": version, "tags": tags}
+    cleaned_metadata = {k: v for k, v in metadata.items() if v}
+    response = await ingestion_client.enqueue_batch(cleaned_metadata, parts)
+    return [DocumentUploadResponse(**item) for item in response]
+
+
 @router.get("", response_model=List[DocumentItem])
 async def list_documents(
     status: Optional[str] = Query(default=None),
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+import json
+import time
+from typing import AsyncIterator, Dict, List, Tuple
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 
+from api_gateway.clients.ingestion import IngestionClient
+from api_gateway.clients.orchestrator import OrchestratorClient
 from api_gateway.core.context import AuthenticatedUser
 from api_gateway.dependencies import (
     get_current_user,
@@ -43,6 +48,11 @@ class DummyOrchestratorClient:
             "meta": {"latency_ms": 42, "trace_id": payload["trace_id"]},
         }
 
+    async def stream(self, payload: Dict) -> AsyncIterator[Tuple[str, Dict]]:
+        for part in ("Mocked ", "response"):
+            yield "delta", {"text": part}
+        yield "done", await self.query(payload)
+
 
 class DummyDocumentClient:
     def __init__(self) -> None:
@@ -81,6 +91,11 @@ class DummyIngestionClient:
         self.last_files = files
         return {"doc_id": "doc_upload", "status": "uploaded"}
 
+    async def enqueue_batch(self, data: Dict, files: List) -> List[Dict]:
+        self.last_data = data
+        self.last_files = files
+        return [{"doc_id": f"doc_upload_{i}", "status": "queued"} for i, _ in enumerate(files)]
+
 
 class DummyRateLimiter:
     def __init__(self) -> None:
@@ -153,6 +168,67 @@ def test_assistant_query_flow(client_with_stubs: Tuple[TestClient, Dict[str, obj
     assert any(key.startswith("assistant:") for key in stubs["rate_limiter"].keys)
 
 
+def test_assistant_query_stream_relays_deltas(client_with_stubs: Tuple[TestClient, Dict[str, object]]) -> None:
+    client, stubs = client_with_stubs
+    with client.stream(
+        "POST",
+        "/api/v1/assistant/query/stream",
+        json={"query": "Привет", "language": "ru"},
+        headers={"Authorization": "Bearer dummy"},
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = response.read().decode()
+
+    events = []
+    for block in body.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    assert [name for name, _ in events] == ["delta", "delta", "done"]
+    assert "".join(data["text"] for name, data in events if name == "delta") == "Mocked response"
+    done = events[-1][1]
+    assert done["answer"] == "Mocked response"
+    assert done["sources"][0]["doc_id"] == "doc_1"
+    assert done["meta"]["safety"] == {"input": "allowed"}
+    assert stubs["safety"].payloads[-1]["query"] == "Привет"
+
+
+class BrokenEventStream(httpx.AsyncByteStream):
+    """Отдаёт одно событие и обрывает соединение."""
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield 'event: delta\ndata: {"text": "Нача"}\n\n'.encode()
+        raise httpx.ReadError("connection reset")
+
+
+def test_assistant_query_stream_reports_upstream_break_as_error_event(client_with_stubs: Tuple[TestClient, Dict[str, object]]) -> None:
+    client, _ = client_with_stubs
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, stream=BrokenEventStream())
+
+    orchestrator = OrchestratorClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)), "http://orchestrator", "orchestrator")
+    app.dependency_overrides[get_orchestrator_client] = lambda: orchestrator
+
+    with client.stream(
+        "POST",
+        "/api/v1/assistant/query/stream",
+        json={"query": "Привет", "language": "ru"},
+        headers={"Authorization": "Bearer dummy"},
+    ) as response:
+        assert response.status_code == 200
+        body = response.read().decode()
+
+    events = []
+    for block in body.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    assert [name for name, _ in events] == ["delta", "error"]
+    assert events[0][1] == {"text": "Нача"}
+    assert events[1][1]["status_code"] == 502
+    assert "connection reset" in events[1][1]["detail"]
+
+
 def test_document_routes(client_with_stubs: Tuple[TestClient, Dict[str, object]]) -> None:
     client, stubs = client_with_stubs
     list_response = client.get("/api/v1/documents", headers={"Authorization": "Bearer demo"})
@@ -173,5 +249,65 @@ def test_document_routes(client_with_stubs: Tuple[TestClient, Dict[str, object]]
     assert upload_response.status_code == 202
     assert stubs["ingestion"].last_data == {"tenant_id": "tenant-456", "product": "Orion", "version": "1.0"}
     assert "file" in stubs["ingestion"].last_files
+
+    batch_response = client.post(
+        "/api/v1/documents/upload/batch",
+        files=[("files", ("a.txt", b"a", "text/plain")), ("files", ("b.txt", b"b", "text/plain"))],
+        headers={"Authorization": "Bearer demo"},
+    )
+    assert batch_response.status_code == 202
+    assert [item["doc_id"] for item in batch_response.json()] == ["doc_upload_0", "doc_upload_1"]
+    assert [name for name, _ in stubs["ingestion"].last_files] == ["files", "files"]
     # All doc endpoints should hit rate limiter under different prefixes
     assert any(key.startswith("doc-") for key in stubs["rate_limiter"].keys)
+
+
+def test_assistant_query_propagates_request_deadline(client_with_stubs: Tuple[TestClient, Dict[str, object]]) -> None:
+    client, _ = client_with_stubs
+    seen: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"answer": "ok", "sources": [], "meta": {"trace_id": "trace"}})
+
+    orchestrator = OrchestratorClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)), "http://orchestrator", "orchestrator")
+    app.dependency_overrides[get_orchestrator_client] = lambda: orchestrator
+    incoming = time.time() + 5
+
+    response = client.post(
+        "/api/v1/assistant/query",
+        json={"query": "Привет", "language": "ru"},
+        headers={"Authorization": "Bearer dummy", "X-Request-Deadline": f"{incoming:.3f}"},
+    )
+    assert response.status_code == 200
+    assert float(seen[0].headers["X-Request-Deadline"]) == pytest.approx(incoming, abs=0.01)
+    assert 0 < seen[0].extensions["timeout"]["read"] <= 5
+
+    expired = client.post(
+        "/api/v1/assistant/query",
+        json={"query": "Привет", "language": "ru"},
+        headers={"Authorization": "Bearer dummy", "X-Request-Deadline": f"{time.time() - 1:.3f}"},
+    )
+    assert expired.status_code == 504
+    assert len(seen) == 1
+
+
+def test_document_upload_is_not_limited_by_request_deadline(client_with_stubs: Tuple[TestClient, Dict[str, object]]) -> None:
+    client, _ = client_with_stubs
+    seen: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"doc_id": "doc-1", "status": "uploaded"})
+
+    ingestion = IngestionClient(httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=None), "http://ingestion", "ingestion")
+    app.dependency_overrides[get_ingestion_client] = lambda: ingestion
+
+    response = client.post(
+        "/api/v1/documents/upload",
+        files={"file": ("manual.pdf", b"%PDF-1.4", "application/pdf")},
+        headers={"Authorization": "Bearer dummy"},
+    )
+    assert response.status_code == 202
+    assert "X-Request-Deadline" not in seen[0].headers
+    assert seen[0].extensions["timeout"]["read"] is None
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Load benchmark: запросы/сек чтения документов в зависимости от размера пула соединений.
+Usage: python bench_pool.py [--dsn postgresql+asyncpg://...] [--pool-sizes 1,2,5,10,20] [--concurrency 64] [--seconds 5]
+Запросы (`GET /internal/documents/{doc_id}` и листинг) идут через ASGI-транспорт httpx в приложение
+сервиса без сети; read-through кэш отключён, чтобы каждый запрос доходил до БД.
+По умолчанию использует временную SQLite-базу (пул для неё не настраивается — только smoke-прогон).
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import httpx
+
+os.environ.setdefault("DOC_MOCK_MODE", "true")
+os.environ.setdefault("DOC_CACHE_ENABLED", "false")
+
+from document_service.core.repository import CountCache, DocumentRepository  # noqa: E402
+from document_service.db import create_engine, create_session_factory, init_db  # noqa: E402
+from document_service.main import app  # noqa: E402
+from document_service.schemas import DocumentCreateRequest, SectionUpsertItem  # noqa: E402
+
+TENANT = "bench"
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+async def seed(dsn: str, documents: int) -> List[str]:
+    engine = create_engine(dsn)
+    await init_db(engine)
+    session_factory = create_session_factory(engine)
+    doc_ids = [f"bench_pool_{i}" for i in range(documents)]
+    async with session_factory() as session:
+        repo = DocumentRepository(session)
+        await repo.create_documents(
+            [DocumentCreateRequest(doc_id=doc_id, tenant_id=TENANT, name=f"{doc_id}.pdf", tags=["bench"]) for doc_id in doc_ids]
+        )
+        sections = [SectionUpsertItem(section_id=f"sec_{n}", title=f"Section {n}", page_start=n, page_end=n) for n in range(1, 21)]
+        for doc_id in doc_ids:
+            await repo.upsert_sections(doc_id, TENANT, sections, return_detail=False)
+    await engine.dispose()
+    return doc_ids
+
+
+async def run_pool(dsn: str, pool_size: int, doc_ids: List[str], concurrency: int, seconds: float) -> float:
+    engine = create_engine(dsn, pool_size=pool_size, max_overflow=0)
+    app.state.session_factory = create_session_factory(engine)
+    app.state.count_cache = CountCache(0)
+    app.state.document_cache = None
+    headers = {"X-Tenant-ID": TENANT}
+    done = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal done
+        while time.perf_counter() < deadline:
+            if random.random() < 0.8:
+                resp = await client.get(f"/internal/documents/{random.choice(doc_ids)}", headers=headers)
+            else:
+                resp = await client.get("/internal/documents", params={"limit": 20, "total": "none"}, headers=headers)
+            resp.raise_for_status()
+            done += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    await engine.dispose()
+    return done / elapsed
+
+
+async def main_async(args: argparse.Namespace, dsn: str) -> None:
+    doc_ids = await seed(dsn, args.documents)
+    for pool_size in (int(x) for x in args.pool_sizes.split(",")):
+        rps = await run_pool(dsn, pool_size, doc_ids, args.concurrency, args.seconds)
+        print(f"pool_size={pool_size:<3} concurrency={args.concurrency:<4} {rps:9.1f} req/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", default=None, help="SQLAlchemy async DSN (по умолчанию временная SQLite)")
+    parser.add_argument("--pool-sizes", default="1,2,5,10,20")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--documents", type=int, default=200)
+    args = parser.parse_args()
+    if args.dsn:
+        asyncio.run(main_async(args, args.dsn))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(main_async(args, f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: set-based upsert секций против прежнего ORM-пути.
+Usage: python bench_sections.py [--sections 10000] [--dsn postgresql+asyncpg://...]
+По умолчанию использует временную SQLite-базу. Для каждого пути делает первичную вставку
+и повторный upsert тех же секций (обновление), замеряя время репозитория.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Sequence
+
+from sqlalchemy.orm import selectinload
+
+from document_service import models
+from document_service.core.repository import DocumentRepository
+from document_service.db import create_engine, create_session_factory, init_db
+from document_service.schemas import DocumentCreateRequest, SectionUpsertItem
+
+
+async def legacy_upsert_sections(repo: DocumentRepository, doc_id: str, tenant_id: str, sections: Sequence[SectionUpsertItem]):
+    """Прежняя реализация DocumentRepository.upsert_sections (ORM-объект на каждую секцию)."""
+    document = await repo.session.get(
+        models.Document,
+        doc_id,
+        options=[selectinload(models.Document.tags), selectinload(models.Document.sections)],
+    )
+    if not document or document.tenant_id != tenant_id:
+        return None
+    existing_sections = {section.section_id: section for section in document.sections}
+    for data in sections:
+        section = existing_sections.get(data.section_id)
+        if section is None:
+            section = models.DocumentSection(section_id=data.section_id, doc_id=doc_id)
+            document.sections.append(section)
+        section.title = data.title
+        section.page_start = data.page_start
+        section.page_end = data.page_end
+        section.chunk_ids = list(data.chunk_ids)
+        section.summary = data.summary
+        section.storage_path = data.storage_path
+    await repo.session.commit()
+    return await repo.get_document(doc_id, tenant_id)
+
+
+def build_sections(count: int, revision: int) -> List[SectionUpsertItem]:
+    return [
+        SectionUpsertItem(
+            section_id=f"sec_{i}",
+            title=f"Section {i} r{revision}",
+            page_start=i,
+            page_end=i + 1,
+            chunk_ids=[f"chunk_{i}_{n}" for n in range(1, 6)],
+            summary=f"Summary of section {i}, revision {revision}. " * 4,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+async def run(dsn: str, count: int) -> None:
+    engine = create_engine(dsn)
+    await init_db(engine)
+    session_factory = create_session_factory(engine)
+    variants = [
+        ("legacy ORM", lambda repo, doc_id, s: legacy_upsert_sections(repo, doc_id, "bench", s)),
+        ("bulk (detail)", lambda repo, doc_id, s: repo.upsert_sections(doc_id, "bench", s)),
+        ("bulk (count only)", lambda repo, doc_id, s: repo.upsert_sections(doc_id, "bench", s, return_detail=False)),
+    ]
+    for name, fn in variants:
+        doc_id = f"bench_{name.split()[0]}_{int(time.time() * 1000)}"
+        async with session_factory() as session:
+            await DocumentRepository(session).create_or_update_document(
+                DocumentCreateRequest(doc_id=doc_id, tenant_id="bench", name=f"{doc_id}.pdf")
+            )
+        timings = []
+        for revision in (1, 2):
+            sections = build_sections(count, revision)
+            async with session_factory() as session:
+                started = time.perf_counter()
+                await fn(DocumentRepository(session), doc_id, sections)
+                timings.append(time.perf_counter() - started)
+        print(f"{name:<20} insert {timings[0]:7.3f}s  update {timings[1]:7.3f}s  ({count} sections)")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", type=int, default=10000)
+    parser.add_argument("--dsn", default=None, help="SQLAlchemy async DSN (по умолчанию временная SQLite)")
+    args = parser.parse_args()
+    if args.dsn:
+        asyncio.run(run(args.dsn, args.sections))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}", args.sections))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from document_service.logging import get_logger
+from document_service.schemas import DocumentDetail, DocumentSection
+
+try:  # pragma: no cover - redis нужен только при DOC_CACHE_URL
+    from redis import asyncio as aioredis  # type: ignore
+    from redis.exceptions import WatchError  # type: ignore
+except Exception:  # pragma: no cover
+    aioredis = None  # type: ignore
+
+    class WatchError(Exception):  # type: ignore[no-redef]
+        pass
+
+logger = get_logger(__name__)
+
+KIND_DOCUMENT = "document"
+KIND_SECTION = "section"
+DETAIL_FIELD = "detail"
+_NO_REDIS = object()  # поколение в Redis неизвестно — заполнять L2 нельзя
+
+
+@dataclass
+class _Entry:
+    expires_at: float
+    detail: Optional[DocumentDetail] = None
+    sections: Dict[str, DocumentSection] = field(default_factory=dict)
+
+
+class DocumentCache:
+    """Read-through кэш ``DocumentDetail`` и ``DocumentSection`` по ключу (tenant_id, doc_id).
+
+    L1 — LRU в памяти процесса с TTL ``local_ttl_seconds``; L2 (если задан ``redis_url``) —
+    Redis hash ``<prefix>:<tenant_id>:<doc_id>`` с полями ``detail`` и ``sec:<section_id>``
+    и TTL ``ttl_seconds``. ``invalidate`` удаляет документ вместе со всеми его секциями
+    на обоих уровнях; L1 других реплик устаревает не дольше ``local_ttl_seconds``.
+    Промахи (отсутствующие документы) не кэшируются.
+
+    Заполнение защищено поколением документа: ``invalidate`` увеличивает счётчик в процессе
+    и ключ ``<prefix>:<tenant_id>:<doc_id>:gen`` в Redis, а читатель запоминает оба значения
+    до загрузки и не записывает результат, если они изменились (иначе строка, прочитанная
+    до коммита писателя, вернулась бы в кэш уже после инвалидации). В Redis проверка и запись
+    атомарны (WATCH/MULTI).
+    """
+
+    def __init__(
+        self,
+        local_ttl_seconds: float = 30.0,
+        max_entries: int = 2048,
+        redis_url: Optional[str] = None,
+        ttl_seconds: float = 300.0,
+        prefix: str = "doc_cache",
+        redis_client: Any = None,
+    ) -> None:
+        self.local_ttl_seconds = local_ttl_seconds
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._redis = redis_client
+        if self._redis is None and redis_url:
+            if aioredis is None:
+                raise RuntimeError("redis is not installed, DOC_CACHE_URL requires the 'redis' extra")
+            self._redis = aioredis.from_url(redis_url)
+        self._counters: Dict[Tuple[str, str], int] = {}
+        self._generations: Dict[Tuple[str, str], int] = {}
+
+    async def get_document(
+        self,
+        tenant_id: str,
+        doc_id: str,
+        loader: Callable[[], Awaitable[Optional[DocumentDetail]]],
+    ) -> Optional[DocumentDetail]:
+        entry = self._local(tenant_id, doc_id)
+        if entry is not None and entry.detail is not None:
+            self._count(KIND_DOCUMENT, "hit_local")
+            return entry.detail
+        generation = self._generations.get((tenant_id, doc_id), 0)
+        raw = await self._redis_get(tenant_id, doc_id, DETAIL_FIELD)
+        if raw is not None:
+            self._count(KIND_DOCUMENT, "hit_redis")
+            detail = DocumentDetail.model_validate_json(raw)
+            if (entry := self._fill_local(tenant_id, doc_id, generation)) is not None:
+                entry.detail = detail
+            return detail
+        self._count(KIND_DOCUMENT, "miss")
+        redis_generation = await self._redis_generation(tenant_id, doc_id)
+        detail = await loader()
+        if detail is not None:
+            if (entry := self._fill_local(tenant_id, doc_id, generation)) is not None:
+                entry.detail = detail
+            await self._redis_set(tenant_id, doc_id, DETAIL_FIELD, detail.model_dump_json(), redis_generation)
+        return detail
+
+    async def get_section(
+        self,
+        tenant_id: str,
+        doc_id: str,
+        section_id: str,
+        loader: Callable[[], Awaitable[Optional[DocumentSection]]],
+    ) -> Optional[DocumentSection]:
+        entry = self._local(tenant_id, doc_id)
+        if entry is not None:
+            section = entry.sections.get(section_id)
+            if section is None and entry.detail is not None:
+                section = next((s for s in entry.detail.sections if s.section_id == section_id), None)
+            if section is not None:
+                self._count(KIND_SECTION, "hit_local")
+                return section
+        generation = self._generations.get((tenant_id, doc_id), 0)
+        raw = await self._redis_get(tenant_id, doc_id, f"sec:{section_id}")
+        if raw is not None:
+            self._count(KIND_SECTION, "hit_redis")
+            section = DocumentSection.model_validate_json(raw)
+            if (entry := self._fill_local(tenant_id, doc_id, generation)) is not None:
+                entry.sections[section_id] = section
+            return section
+        self._count(KIND_SECTION, "miss")
+        redis_generation = await self._redis_generation(tenant_id, doc_id)
+        section = await loader()
+        if section is not None:
+            if (entry := self._fill_local(tenant_id, doc_id, generation)) is not None:
+                entry.sections[section_id] = section
+            await self._redis_set(tenant_id, doc_id, f"sec:{section_id}", section.model_dump_json(), redis_generation)
+        return section
+
+    async def invalidate(self, tenant_id: str, doc_id: str) -> None:
+        key = (tenant_id, doc_id)
+        self._entries.pop(key, None)
+        self._generations[key] = self._generations.get(key, 0) + 1
+        if self._redis is not None:
+            gen_key = self._gen_key(tenant_id, doc_id)
+            try:
+                async with self._redis.pipeline(transaction=True) as pipe:
+                    pipe.delete(self._key(tenant_id, doc_id))
+                    pipe.incr(gen_key)
+                    pipe.expire(gen_key, max(1, int(self.ttl_seconds)))
+                    await pipe.execute()
+            except Exception as exc:
+                logger.warning("document_cache_invalidate_failed", doc_id=doc_id, error=str(exc))
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    def stats(self) -> dict:
+        result: Dict[str, dict] = {}
+        for kind in (KIND_DOCUMENT, KIND_SECTION):
+            counts = {name: self._counters.get((kind, name), 0) for name in ("hit_local", "hit_redis", "miss")}
+            lookups = sum(counts.values())
+            hits = counts["hit_local"] + counts["hit_redis"]
+            result[kind] = {**counts, "hit_ratio": hits / lookups if lookups else 0.0}
+        result["entries"] = len(self._entries)
+        return result
+
+    def render_prometheus(self, prefix: str = "document_cache") -> str:
+        stats = self.stats()
+        lines = [
+            f"# HELP {prefix}_requests_total Cache lookups by kind and result.",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        for kind in (KIND_DOCUMENT, KIND_SECTION):
+            for result in ("hit_local", "hit_redis", "miss"):
+                lines.append(f'{prefix}_requests_total{{kind="{kind}",result="{result}"}} {stats[kind][result]}')
+        lines.append(f"# TYPE {prefix}_hit_ratio gauge")
+        for kind in (KIND_DOCUMENT, KIND_SECTION):
+            lines.append(f'{prefix}_hit_ratio{{kind="{kind}"}} {stats[kind]["hit_ratio"]:.4f}')
+        lines.append(f"# TYPE {prefix}_entries gauge")
+        lines.append(f"{prefix}_entries {stats['entries']}")
+        return "\n".join(lines) + "\n"
+
+    def _count(self, kind: str, result: str) -> None:
+        self._counters[(kind, result)] = self._counters.get((kind, result), 0) + 1
+
+    def _local(self, tenant_id: str, doc_id: str) -> Optional[_Entry]:
+        key = (tenant_id, doc_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store_local(self, tenant_id: str, doc_id: str) -> _Entry:
+        entry = self._local(tenant_id, doc_id)
+        if entry is None:
+            entry = _Entry(expires_at=time.monotonic() + self.local_ttl_seconds)
+            self._entries[(tenant_id, doc_id)] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _fill_local(self, tenant_id: str, doc_id: str, generation: int) -> Optional[_Entry]:
+        """Запись L1 для заполнения или ``None``, если документ инвалидирован после начала чтения."""
+        if self._generations.get((tenant_id, doc_id), 0) != generation:
+            return None
+        return self._store_local(tenant_id, doc_id)
+
+    def _key(self, tenant_id: str, doc_id: str) -> str:
+        return f"{self.prefix}:{tenant_id}:{doc_id}"
+
+    def _gen_key(self, tenant_id: str, doc_id: str) -> str:
+        return f"{self._key(tenant_id, doc_id)}:gen"
+
+    async def _redis_generation(self, tenant_id: str, doc_id: str) -> Any:
+        if self._redis is None:
+            return _NO_REDIS
+        try:
+            return await self._redis.get(self._gen_key(tenant_id, doc_id))
+        except Exception as exc:
+            logger.warning("document_cache_redis_failed", doc_id=doc_id, error=str(exc))
+            return _NO_REDIS
+
+    async def _redis_get(self, tenant_id: str, doc_id: str, name: str) -> Optional[bytes]:
+        if self._redis is None:
+            return None
+        try:
+            return await self._redis.hget(self._key(tenant_id, doc_id), name)
+        except Exception as exc:
+            logger.warning("document_cache_redis_failed", doc_id=doc_id, error=str(exc))
+            return None
+
+    async def _redis_set(self, tenant_id: str, doc_id: str, name: str, value: str, generation: Any) -> None:
+        if self._redis is None or generation is _NO_REDIS:
+            return
+        key = self._key(tenant_id, doc_id)
+        gen_key = self._gen_key(tenant_id, doc_id)
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                await pipe.watch(gen_key)
+                if await pipe.get(gen_key) != generation:
+                    return  # документ инвалидирован, пока его загружали
+                pipe.multi()
+                pipe.hset(key, name, value)
+                pipe.expire(key, max(1, int(self.ttl_seconds)))
+                await pipe.execute()
+        except WatchError:
+            pass  # инвалидация пришла между проверкой поколения и записью
+        except Exception as exc:
+            logger.warning("document_cache_redis_failed", doc_id=doc_id, error=str(exc))
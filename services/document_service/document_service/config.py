@@ -14,7 +14,17 @@ class Settings(BaseSettings):
 
     mock_mode: bool = True
     db_dsn: str = "sqlite+aiosqlite:///./document_service.db"
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_recycle_seconds: int = 1800
+    db_pool_timeout_seconds: float = 30.0
+    db_statement_cache_size: int = 500
+    db_auto_migrate: bool | None = None  # None — как mock_mode: в prod миграции запускаются отдельным шагом
     cache_url: str | None = None
+    cache_enabled: bool = True
+    cache_local_ttl_seconds: float = 30.0
+    cache_ttl_seconds: float = 300.0
+    cache_max_entries: int = 2048
 
     s3_endpoint: str | None = None
     s3_access_key: str | None = None
@@ -22,8 +32,10 @@ class Settings(BaseSettings):
     s3_region: str | None = "us-east-1"
     s3_bucket: str | None = None
     s3_secure: bool = True
+    s3_max_pool_connections: int = 32
     local_storage_path: Path | None = Path("./.document_storage")
     download_url_expiry_seconds: int = 300
+    list_total_cache_seconds: float = 30.0
 
 
 @lru_cache
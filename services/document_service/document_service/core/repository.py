@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Optional, Sequence, Tuple
+import base64
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy import func, select
+from sqlalchemy import String, func, literal, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from document_service import models
+from document_service.cache import DocumentCache
 from document_service.schemas import (
     DocumentCreateRequest,
     DocumentDetail,
@@ -17,9 +22,62 @@ from document_service.schemas import (
 )
 
 
+TOTAL_EXACT = "exact"
+TOTAL_ESTIMATE = "estimate"
+TOTAL_NONE = "none"
+TOTAL_MODES = (TOTAL_EXACT, TOTAL_ESTIMATE, TOTAL_NONE)
+
+
+def encode_cursor(updated_at: datetime, doc_id: str) -> str:
+    raw = json.dumps([updated_at.isoformat(), doc_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        updated_at, doc_id = json.loads(raw)
+        return datetime.fromisoformat(updated_at), str(doc_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+class CountCache:
+    """TTL-кэш totals списка документов по ключу (тенант, фильтры), общий для процесса."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 4096) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}
+
+    def get(self, key: Hashable) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def put(self, key: Hashable, value: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+
 class DocumentRepository:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        count_cache: Optional[CountCache] = None,
+        cache: Optional[DocumentCache] = None,
+    ) -> None:
         self.session = session
+        self.count_cache = count_cache
+        self.cache = cache
 
     async def create_or_update_document(self, payload: DocumentCreateRequest) -> DocumentDetail:
         document = await self.session.get(
@@ -41,47 +99,142 @@ class DocumentRepository:
         document.pages = payload.pages
         await self._replace_tags(document, payload.tags)
         await self.session.commit()
+        await self._invalidate(document.tenant_id, document.doc_id)
         return await self.get_document(document.doc_id, document.tenant_id)
 
+    async def create_documents(self, payloads: Sequence[DocumentCreateRequest]) -> List[DocumentItem]:
+        """Регистрирует пачку документов одной транзакцией (batch upload)."""
+        if not payloads:
+            return []
+        doc_ids = [payload.doc_id for payload in payloads]
+        stmt = select(models.Document).where(models.Document.doc_id.in_(doc_ids)).options(selectinload(models.Document.tags))
+        existing = {doc.doc_id: doc for doc in (await self.session.scalars(stmt)).all()}
+        for payload in payloads:
+            document = existing.get(payload.doc_id)
+            if document is None:
+                document = models.Document(doc_id=payload.doc_id, tenant_id=payload.tenant_id, tags=[])
+                self.session.add(document)
+                existing[payload.doc_id] = document
+            elif document.tenant_id != payload.tenant_id:
+                raise PermissionError("document belongs to a different tenant")
+            document.name = payload.name
+            document.product = payload.product
+            document.version = payload.version
+            document.status = payload.status
+            document.storage_uri = payload.storage_uri
+            document.pages = payload.pages
+            await self._replace_tags(document, payload.tags)
+        await self.session.commit()
+        for payload in payloads:
+            await self._invalidate(payload.tenant_id, payload.doc_id)
+        # перечитываем одним запросом: server_default (updated_at) заполняется на стороне БД
+        stmt = (
+            select(models.Document)
+            .where(models.Document.doc_id.in_(doc_ids))
+            .options(selectinload(models.Document.tags))
+            .execution_options(populate_existing=True)
+        )
+        stored = {doc.doc_id: doc for doc in (await self.session.scalars(stmt)).all()}
+        return [self._to_item(stored[doc_id]) for doc_id in dict.fromkeys(doc_ids)]
+
     async def list_documents(
         self,
         tenant_id: str,
         filters: dict[str, str],
         limit: int,
-        offset: int,
-    ) -> Tuple[int, List[DocumentItem]]:
-        base_stmt = select(models.Document).where(
-            models.Document.tenant_id == tenant_id, models.Document.deleted_at.is_(None)
-        )
-        count_stmt = (
-            select(func.count(func.distinct(models.Document.doc_id)))
-            .select_from(models.Document)
-            .where(models.Document.tenant_id == tenant_id, models.Document.deleted_at.is_(None))
-        )
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        total_mode: str = TOTAL_EXACT,
+    ) -> Tuple[Optional[int], List[DocumentItem], Optional[str]]:
+        """Страница документов тенанта, от новых к старым по ``(updated_at, doc_id)``.
 
+        С ``cursor`` используется keyset-пагинация (``offset`` игнорируется), иначе — ``OFFSET``.
+        Возвращает ``(total, items, next_cursor)``; ``total`` зависит от ``total_mode``
+        (``exact`` — COUNT, ``estimate`` — оценка планировщика Postgres или кэшированный COUNT,
+        ``none`` — не считается).
+        """
+        conditions = [models.Document.tenant_id == tenant_id, models.Document.deleted_at.is_(None)]
         if status := filters.get("status"):
-            base_stmt = base_stmt.where(models.Document.status == status)
-            count_stmt = count_stmt.where(models.Document.status == status)
+            conditions.append(models.Document.status == status)
         if product := filters.get("product"):
-            base_stmt = base_stmt.where(models.Document.product == product)
-            count_stmt = count_stmt.where(models.Document.product == product)
+            conditions.append(models.Document.product == product)
         if search := filters.get("search"):
-            pattern = f"%{search.lower()}%"
-            base_stmt = base_stmt.where(func.lower(models.Document.name).like(pattern))
-            count_stmt = count_stmt.where(func.lower(models.Document.name).like(pattern))
+            # на Postgres обслуживается GIN-индексом ix_documents_name_trgm (pg_trgm по lower(name))
+            conditions.append(func.lower(models.Document.name).like(f"%{search.lower()}%"))
         if tag := filters.get("tag"):
-            base_stmt = base_stmt.join(models.Document.tags).where(models.DocumentTag.tag == tag)
-            count_stmt = count_stmt.join(models.Document.tags).where(models.DocumentTag.tag == tag)
+            # (doc_id, tag) уникальны, join по одному тегу не размножает строки
+            conditions.append(
+                models.Document.doc_id.in_(select(models.DocumentTag.doc_id).where(models.DocumentTag.tag == tag))
+            )
 
-        base_stmt = base_stmt.order_by(models.Document.updated_at.desc()).limit(limit).offset(offset)
-        base_stmt = base_stmt.options(selectinload(models.Document.tags))
+        page_stmt = select(models.Document).where(*conditions)
+        if cursor:
+            updated_at, doc_id = decode_cursor(cursor)
+            page_stmt = page_stmt.where(
+                tuple_(models.Document.updated_at, models.Document.doc_id)
+                < tuple_(self._bind_timestamp(updated_at), doc_id)
+            )
+        page_stmt = page_stmt.order_by(models.Document.updated_at.desc(), models.Document.doc_id.desc()).limit(limit + 1)
+        if not cursor and offset:
+            page_stmt = page_stmt.offset(offset)
+        page_stmt = page_stmt.options(selectinload(models.Document.tags))
 
-        total = await self.session.scalar(count_stmt)
-        docs = (await self.session.scalars(base_stmt)).unique().all()
-        items = [self._to_item(doc) for doc in docs]
-        return int(total or 0), items
+        docs = (await self.session.scalars(page_stmt)).all()
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor(docs[-1].updated_at, docs[-1].doc_id)
+        total = await self._count_documents(tenant_id, filters, conditions, total_mode)
+        return total, [self._to_item(doc) for doc in docs], next_cursor
+
+    async def _count_documents(
+        self,
+        tenant_id: str,
+        filters: dict[str, str],
+        conditions: list,
+        total_mode: str,
+    ) -> Optional[int]:
+        if total_mode == TOTAL_NONE:
+            return None
+        count_stmt = select(func.count()).select_from(models.Document).where(*conditions)
+        if total_mode != TOTAL_ESTIMATE:
+            return int(await self.session.scalar(count_stmt) or 0)
+        cache_key = (tenant_id, tuple(sorted(filters.items())))
+        if self.count_cache is not None and (cached := self.count_cache.get(cache_key)) is not None:
+            return cached
+        if self.session.get_bind().dialect.name == "postgresql":
+            total = await self._planner_estimate(select(models.Document.doc_id).where(*conditions))
+        else:
+            total = int(await self.session.scalar(count_stmt) or 0)
+        if self.count_cache is not None:
+            self.count_cache.put(cache_key, total)
+        return total
+
+    async def _planner_estimate(self, stmt) -> int:
+        """Оценка числа строк из ``EXPLAIN`` вместо полного COUNT (только Postgres)."""
+        dialect = self.session.get_bind().dialect
+        compiled = stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        # exec_driver_sql: литералы поиска не должны разбираться как :bind-параметры text()
+        connection = await self.session.connection()
+        plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _bind_timestamp(self, value: datetime):
+        if self.session.get_bind().dialect.name == "sqlite":
+            # SQLite хранит server_default/onupdate (CURRENT_TIMESTAMP) строкой без микросекунд,
+            # а DateTime-параметр всегда рендерится с ".ffffff": сравниваем в формате колонки
+            rendered = value.replace(tzinfo=None).isoformat(sep=" ", timespec="microseconds" if value.microsecond else "seconds")
+            return literal(rendered, String)
+        return value
 
     async def get_document(self, doc_id: str, tenant_id: str) -> Optional[DocumentDetail]:
+        if self.cache is None:
+            return await self._load_document(doc_id, tenant_id)
+        return await self.cache.get_document(tenant_id, doc_id, lambda: self._load_document(doc_id, tenant_id))
+
+    async def _load_document(self, doc_id: str, tenant_id: str) -> Optional[DocumentDetail]:
         stmt = (
             select(models.Document)
             .where(
@@ -97,6 +250,13 @@ class DocumentRepository:
         return self._to_detail(document)
 
     async def get_section(self, doc_id: str, section_id: str, tenant_id: str) -> Optional[DocumentSection]:
+        if self.cache is None:
+            return await self._load_section(doc_id, section_id, tenant_id)
+        return await self.cache.get_section(
+            tenant_id, doc_id, section_id, lambda: self._load_section(doc_id, section_id, tenant_id)
+        )
+
+    async def _load_section(self, doc_id: str, section_id: str, tenant_id: str) -> Optional[DocumentSection]:
         stmt = (
             select(models.DocumentSection)
             .join(models.Document)
@@ -111,6 +271,84 @@ class DocumentRepository:
             return None
         return self._to_section(section)
 
+    async def batch_get_sections(
+        self,
+        doc_id: str,
+        tenant_id: str,
+        section_ids: Optional[Sequence[str]],
+        fields: Sequence[str],
+    ) -> Optional[Tuple[List[Dict[str, Any]], List[str]]]:
+        """Секции документа одним запросом, только запрошенные колонки.
+
+        ``section_ids=None`` — все секции документа. Возвращает ``(sections, missing)``
+        или ``None``, если документа нет у тенанта.
+        """
+        owner = await self.session.scalar(
+            select(models.Document.tenant_id).where(
+                models.Document.doc_id == doc_id, models.Document.deleted_at.is_(None)
+            )
+        )
+        if owner is None or owner != tenant_id:
+            return None
+        table = models.DocumentSection.__table__
+        columns = ["section_id", *(name for name in fields if name != "section_id")]
+        stmt = select(*(table.c[name] for name in columns)).where(table.c.doc_id == doc_id)
+        if section_ids is not None:
+            stmt = stmt.where(table.c.section_id.in_(section_ids))
+        rows = {row.section_id: dict(row._mapping) for row in await self.session.execute(stmt.order_by(table.c.section_id))}
+        if "chunk_ids" in columns:
+            for row in rows.values():
+                row["chunk_ids"] = row["chunk_ids"] or []
+        if section_ids is None:
+            return list(rows.values()), []
+        requested = list(dict.fromkeys(section_ids))
+        return [rows[sid] for sid in requested if sid in rows], [sid for sid in requested if sid not in rows]
+
+    async def batch_get_documents(
+        self,
+        doc_ids: Sequence[str],
+        tenant_id: str,
+        fields: Sequence[str],
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Метаданные нескольких документов тенанта за один round trip, без секций.
+
+        ``tags`` и ``section_count`` считаются отдельными запросами, только если запрошены.
+        Возвращает ``(items, missing)`` в порядке ``doc_ids``.
+        """
+        table = models.Document.__table__
+        columns = ["doc_id", *(name for name in fields if name in table.c and name != "doc_id")]
+        requested = list(dict.fromkeys(doc_ids))
+        stmt = select(*(table.c[name] for name in columns)).where(
+            table.c.doc_id.in_(requested),
+            table.c.tenant_id == tenant_id,
+            table.c.deleted_at.is_(None),
+        )
+        found = {row.doc_id: dict(row._mapping) for row in await self.session.execute(stmt)}
+        if found and "tags" in fields:
+            tags: Dict[str, List[str]] = {doc_id: [] for doc_id in found}
+            tag_rows = await self.session.execute(
+                select(models.DocumentTag.doc_id, models.DocumentTag.tag)
+                .where(models.DocumentTag.doc_id.in_(list(found)))
+                .order_by(models.DocumentTag.id)
+            )
+            for doc_id, tag in tag_rows:
+                tags[doc_id].append(tag)
+            for doc_id, item in found.items():
+                item["tags"] = tags[doc_id]
+        if found and "section_count" in fields:
+            counts = dict(
+                (
+                    await self.session.execute(
+                        select(models.DocumentSection.doc_id, func.count())
+                        .where(models.DocumentSection.doc_id.in_(list(found)))
+                        .group_by(models.DocumentSection.doc_id)
+                    )
+                ).all()
+            )
+            for doc_id, item in found.items():
+                item["section_count"] = int(counts.get(doc_id, 0))
+        return [found[doc_id] for doc_id in requested if doc_id in found], [doc_id for doc_id in requested if doc_id not in found]
+
     async def update_status(self, payload: StatusUpdateRequest) -> Optional[str]:
         document = await self.session.get(
             models.Document,
@@ -127,6 +365,7 @@ class DocumentRepository:
             document.pages = payload.pages
         tenant_id = document.tenant_id
         await self.session.commit()
+        await self._invalidate(tenant_id, payload.doc_id)
         return tenant_id
 
     async def upsert_sections(
@@ -134,29 +373,59 @@ class DocumentRepository:
         doc_id: str,
         tenant_id: str,
         sections: Sequence[SectionUpsertItem],
-    ) -> Optional[DocumentDetail]:
-        document = await self.session.get(
-            models.Document,
-            doc_id,
-            options=[selectinload(models.Document.tags), selectinload(models.Document.sections)],
+        return_detail: bool = True,
+    ) -> Optional[DocumentDetail | int]:
+        """Set-based upsert секций: один ``INSERT ... ON CONFLICT DO UPDATE`` на пачку строк
+        (executemany/insertmanyvalues), без загрузки ORM-объектов документа и секций.
+
+        При ``return_detail=False`` возвращает число записанных секций вместо ``DocumentDetail``.
+        """
+        owner = await self.session.scalar(
+            select(models.Document.tenant_id).where(models.Document.doc_id == doc_id)
         )
-        if not document or document.tenant_id != tenant_id:
+        if owner is None or owner != tenant_id:
             return None
-        existing_sections = {section.section_id: section for section in document.sections}
-        for data in sections:
-            section = existing_sections.get(data.section_id)
-            if section is None:
-                section = models.DocumentSection(section_id=data.section_id, doc_id=doc_id)
-                document.sections.append(section)
-            section.title = data.title
-            section.page_start = data.page_start
-            section.page_end = data.page_end
-            section.chunk_ids = list(data.chunk_ids)
-            section.summary = data.summary
-            section.storage_path = data.storage_path
+        rows = [
+            {
+                "doc_id": doc_id,
+                "section_id": data.section_id,
+                "title": data.title,
+                "page_start": data.page_start,
+                "page_end": data.page_end,
+                "chunk_ids": list(data.chunk_ids),
+                "summary": data.summary,
+                "storage_path": data.storage_path,
+            }
+            for data in sections
+        ]
+        if rows:
+            await self.session.execute(self._section_upsert_stmt(), rows)
         await self.session.commit()
+        await self._invalidate(tenant_id, doc_id)
+        if not return_detail:
+            return len(rows)
         return await self.get_document(doc_id, tenant_id)
 
+    def _section_upsert_stmt(self):
+        table = models.DocumentSection.__table__
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:  # pragma: no cover - поддерживаем только Postgres и SQLite
+            raise RuntimeError(f"unsupported dialect for section upsert: {dialect}")
+        stmt = dialect_insert(table)
+        updatable = ("title", "page_start", "page_end", "chunk_ids", "summary", "storage_path")
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.doc_id, table.c.section_id],
+            set_={name: stmt.excluded[name] for name in updatable},
+        )
+
+    async def _invalidate(self, tenant_id: str, doc_id: str) -> None:
+        if self.cache is not None:
+            await self.cache.invalidate(tenant_id, doc_id)
+
     async def _replace_tags(self, document: models.Document, tags: Iterable[str]) -> None:
         new_tags = {tag for tag in tags}
         document.tags = [models.DocumentTag(tag=tag) for tag in new_tags]
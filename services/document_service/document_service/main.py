@@ -3,8 +3,11 @@ from __future__ import annotations
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
+from document_service.cache import DocumentCache
 from document_service.config import Settings, get_settings
+from document_service.core.repository import CountCache
 from document_service.db import create_engine, create_session_factory, init_db
 from document_service.logging import configure_logging, get_logger
 from document_service.routers import documents
@@ -35,7 +38,14 @@ def ensure_runtime_configuration(current: Settings) -> None:
 
 ensure_runtime_configuration(settings)
 
-engine = create_engine(settings.db_dsn)
+engine = create_engine(
+    settings.db_dsn,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    pool_timeout=settings.db_pool_timeout_seconds,
+    statement_cache_size=settings.db_statement_cache_size,
+)
 SessionLocal = create_session_factory(engine)
 local_storage_path = settings.local_storage_path if settings.mock_mode else None
 storage_client = StorageClient(
@@ -47,6 +57,18 @@ storage_client = StorageClient(
     secure=settings.s3_secure,
     local_storage_path=local_storage_path,
     default_expiry=settings.download_url_expiry_seconds,
+    max_pool_connections=settings.s3_max_pool_connections,
+)
+
+document_cache = (
+    DocumentCache(
+        local_ttl_seconds=settings.cache_local_ttl_seconds,
+        max_entries=settings.cache_max_entries,
+        redis_url=settings.cache_url,
+        ttl_seconds=settings.cache_ttl_seconds,
+    )
+    if settings.cache_enabled
+    else None
 )
 
 logger.info(
@@ -55,15 +77,22 @@ logger.info(
     db_backend="sqlite" if settings.db_dsn.startswith("sqlite") else "postgres",
     has_s3=bool(settings.s3_bucket),
     local_storage=bool(local_storage_path),
+    cache="redis" if settings.cache_enabled and settings.cache_url else ("local" if settings.cache_enabled else "off"),
 )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db(engine)
+    auto_migrate = settings.mock_mode if settings.db_auto_migrate is None else settings.db_auto_migrate
+    await init_db(engine, auto_migrate=auto_migrate)
     app.state.session_factory = SessionLocal
     app.state.storage_client = storage_client
+    app.state.count_cache = CountCache(settings.list_total_cache_seconds)
+    app.state.document_cache = document_cache
     yield
+    await storage_client.aclose()
+    if document_cache is not None:
+        await document_cache.close()
     await engine.dispose()
 
 
@@ -74,3 +103,9 @@ app.include_router(documents.router)
 @app.get("/health", tags=["health"])
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics() -> str:
+    cache: DocumentCache | None = getattr(app.state, "document_cache", None)
+    return cache.render_prometheus() if cache is not None else ""
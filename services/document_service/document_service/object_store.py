@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Any, Optional
+
+try:  # pragma: no cover - optional dependency
+    import aioboto3  # type: ignore
+    from aiobotocore.config import AioConfig  # type: ignore
+except Exception:  # pragma: no cover
+    aioboto3 = None  # type: ignore
+    AioConfig = None  # type: ignore
+
+
+class S3ObjectStore:
+    """Асинхронный S3-клиент с общим пулом соединений на процесс.
+
+    Document Service только выдаёт presigned URL на оригиналы, загрузкой и скачиванием
+    объектов занимается Ingestion. Клиент создаётся один раз при первом обращении
+    и закрывается в lifespan сервиса.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        region: Optional[str] = None,
+        secure: bool = True,
+        max_pool_connections: int = 32,
+        client: Any = None,
+    ) -> None:
+        self.bucket = bucket
+        self.endpoint = endpoint
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region or "us-east-1"
+        self.secure = secure
+        self.max_pool_connections = max_pool_connections
+        self._client = client
+        self._stack: Optional[AsyncExitStack] = None
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        if self._client is not None:
+            return
+        if aioboto3 is None:
+            raise RuntimeError("aioboto3 is not installed")
+        async with self._lock:
+            if self._client is not None:
+                return
+            session = aioboto3.Session(
+                aws_access_key_id=self.access_key,
+                aws_secret_access_key=self.secret_key,
+                region_name=self.region,
+            )
+            stack = AsyncExitStack()
+            self._client = await stack.enter_async_context(
+                session.client(
+                    "s3",
+                    endpoint_url=self.endpoint,
+                    config=AioConfig(signature_version="s3v4", max_pool_connections=self.max_pool_connections),
+                    use_ssl=self.secure,
+                    verify=self.secure,
+                )
+            )
+            self._stack = stack
+
+    async def close(self) -> None:
+        if self._stack is not None:
+            await self._stack.aclose()
+            self._stack = None
+            self._client = None
+
+    async def _get_client(self):
+        if self._client is None:
+            await self.start()
+        return self._client
+
+    async def presign(self, key: str, expires_in: int, bucket: Optional[str] = None) -> str:
+        client = await self._get_client()
+        return await client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": bucket or self.bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
@@ -1,17 +1,26 @@
 from __future__ import annotations
 
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Optional, Union
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
 
-from document_service.core.repository import DocumentRepository
+from document_service.core.repository import TOTAL_EXACT, TOTAL_MODES, DocumentRepository
 from document_service.schemas import (
+    DocumentBulkCreateRequest,
+    DocumentBulkCreateResponse,
     DocumentCreateRequest,
     DocumentDetail,
+    DOCUMENT_FIELDS,
+    SECTION_FIELDS,
     DocumentListResponse,
+    DocumentsBatchGetRequest,
+    DocumentsBatchGetResponse,
     DocumentSection,
     DownloadUrlResponse,
+    SectionsBatchGetRequest,
+    SectionsBatchGetResponse,
     SectionsUpsertRequest,
+    SectionsUpsertResult,
     StatusUpdateRequest,
 )
 from document_service.storage import StorageClient
@@ -24,7 +33,11 @@ async def get_repository(request: Request) -> AsyncGenerator[DocumentRepository,
     if session_factory is None:
         raise RuntimeError("Session factory is not configured")
     async with session_factory() as session:
-        yield DocumentRepository(session)
+        yield DocumentRepository(
+            session,
+            count_cache=getattr(request.app.state, "count_cache", None),
+            cache=getattr(request.app.state, "document_cache", None),
+        )
 
 
 def get_storage_client(request: Request) -> StorageClient:
@@ -52,6 +65,18 @@ async def create_document(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="document_forbidden")
 
 
+@router.post("/bulk", response_model=DocumentBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_documents(
+    payload: DocumentBulkCreateRequest,
+    repo: DocumentRepository = Depends(get_repository),
+) -> DocumentBulkCreateResponse:
+    try:
+        items = await repo.create_documents(payload.documents)
+    except PermissionError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="document_forbidden")
+    return DocumentBulkCreateResponse(items=items)
+
+
 @router.get("", response_model=DocumentListResponse)
 async def list_documents(
     status_filter: Optional[str] = Query(default=None, alias="status"),
@@ -60,9 +85,13 @@ async def list_documents(
     search: Optional[str] = None,
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None, description="next_cursor предыдущей страницы (keyset-пагинация)"),
+    total: str = Query(default=TOTAL_EXACT, description="exact | estimate | none"),
     repo: DocumentRepository = Depends(get_repository),
     tenant_id: str = Depends(get_tenant_id),
 ) -> DocumentListResponse:
+    if total not in TOTAL_MODES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid_total_mode")
     filters = {
         "status": status_filter,
         "product": product,
@@ -70,8 +99,24 @@ async def list_documents(
         "search": search,
     }
     cleaned = {k: v for k, v in filters.items() if v}
-    total, items = await repo.list_documents(tenant_id, cleaned, limit, offset)
-    return DocumentListResponse(total=total, items=items)
+    try:
+        count, items, next_cursor = await repo.list_documents(
+            tenant_id, cleaned, limit, offset, cursor=cursor, total_mode=total
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid_cursor")
+    return DocumentListResponse(total=count, items=items, next_cursor=next_cursor)
+
+
+@router.post("/metadata:batchGet", response_model=DocumentsBatchGetResponse)
+async def batch_get_documents(
+    payload: DocumentsBatchGetRequest,
+    repo: DocumentRepository = Depends(get_repository),
+    tenant_id: str = Depends(get_tenant_id),
+) -> DocumentsBatchGetResponse:
+    fields = payload.fields or [name for name in DOCUMENT_FIELDS if name != "section_count"]
+    items, missing = await repo.batch_get_documents(payload.doc_ids, tenant_id, fields)
+    return DocumentsBatchGetResponse(items=items, missing=missing)
 
 
 @router.get("/{doc_id}", response_model=DocumentDetail)
@@ -99,17 +144,34 @@ async def get_section(
     return section
 
 
-@router.post("/{doc_id}/sections", response_model=DocumentDetail)
+@router.post("/{doc_id}/sections:batchGet", response_model=SectionsBatchGetResponse)
+async def batch_get_sections(
+    doc_id: str,
+    payload: SectionsBatchGetRequest,
+    repo: DocumentRepository = Depends(get_repository),
+    tenant_id: str = Depends(get_tenant_id),
+) -> SectionsBatchGetResponse:
+    result = await repo.batch_get_sections(doc_id, tenant_id, payload.section_ids, payload.fields or SECTION_FIELDS)
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="document_not_found")
+    sections, missing = result
+    return SectionsBatchGetResponse(doc_id=doc_id, sections=sections, missing=missing)
+
+
+@router.post("/{doc_id}/sections", response_model=Union[DocumentDetail, SectionsUpsertResult])
 async def upsert_sections(
     doc_id: str,
     payload: SectionsUpsertRequest,
+    return_detail: bool = Query(default=True, description="false — вернуть только число секций, без DocumentDetail"),
     repo: DocumentRepository = Depends(get_repository),
     tenant_id: str = Depends(get_tenant_id),
-) -> DocumentDetail:
-    document = await repo.upsert_sections(doc_id, tenant_id, payload.sections)
-    if not document:
+) -> DocumentDetail | SectionsUpsertResult:
+    result = await repo.upsert_sections(doc_id, tenant_id, payload.sections, return_detail=return_detail)
+    if result is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="document_not_found")
-    return document
+    if not return_detail:
+        return SectionsUpsertResult(doc_id=doc_id, upserted=result)
+    return result
 
 
 @router.post("/status", response_model=DocumentDetail)
@@ -137,7 +199,7 @@ async def get_download_url(
     if not detail or not detail.storage_uri:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="storage_not_found")
     try:
-        url = storage.generate_download_url(detail.storage_uri)
+        url = await storage.generate_download_url(detail.storage_uri)
     except (RuntimeError, ValueError) as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
     return DownloadUrlResponse(doc_id=doc_id, url=url, expires_in=storage.default_expiry)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class DocumentSection(BaseModel):
@@ -42,8 +42,9 @@ class DocumentItem(BaseModel):
 
 
 class DocumentListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     items: List[DocumentItem]
+    next_cursor: Optional[str] = None
 
 
 class DocumentCreateRequest(BaseModel):
@@ -58,6 +59,14 @@ class DocumentCreateRequest(BaseModel):
     tags: List[str] = Field(default_factory=list)
 
 
+class DocumentBulkCreateRequest(BaseModel):
+    documents: List[DocumentCreateRequest] = Field(default_factory=list, max_length=1000)
+
+
+class DocumentBulkCreateResponse(BaseModel):
+    items: List[DocumentItem]
+
+
 class SectionUpsertItem(BaseModel):
     section_id: str
     title: str
@@ -72,6 +81,69 @@ class SectionsUpsertRequest(BaseModel):
     sections: List[SectionUpsertItem]
 
 
+class SectionsUpsertResult(BaseModel):
+    doc_id: str
+    upserted: int
+
+
+SECTION_FIELDS = ("section_id", "title", "page_start", "page_end", "chunk_ids", "summary", "storage_path")
+DOCUMENT_FIELDS = (
+    "doc_id",
+    "tenant_id",
+    "name",
+    "status",
+    "product",
+    "version",
+    "storage_uri",
+    "pages",
+    "last_error",
+    "tags",
+    "section_count",
+    "created_at",
+    "updated_at",
+)
+
+
+def _check_fields(fields: Optional[List[str]], allowed: tuple[str, ...]) -> Optional[List[str]]:
+    if fields is None:
+        return None
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(fields))
+
+
+class SectionsBatchGetRequest(BaseModel):
+    section_ids: Optional[List[str]] = Field(default=None, max_length=1000, description="None — все секции документа")
+    fields: Optional[List[str]] = Field(default=None, description="Проекция; None — все поля секции")
+
+    @field_validator("fields")
+    @classmethod
+    def _known_fields(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        return _check_fields(value, SECTION_FIELDS)
+
+
+class SectionsBatchGetResponse(BaseModel):
+    doc_id: str
+    sections: List[Dict[str, Any]]
+    missing: List[str] = Field(default_factory=list)
+
+
+class DocumentsBatchGetRequest(BaseModel):
+    doc_ids: List[str] = Field(min_length=1, max_length=500)
+    fields: Optional[List[str]] = Field(default=None, description="Проекция; None — все поля кроме section_count")
+
+    @field_validator("fields")
+    @classmethod
+    def _known_fields(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        return _check_fields(value, DOCUMENT_FIELDS)
+
+
+class DocumentsBatchGetResponse(BaseModel):
+    items: List[Dict[str, Any]]
+    missing: List[str] = Field(default_factory=list)
+
+
 class StatusUpdateRequest(BaseModel):
     doc_id: str
     status: str
@@ -4,8 +4,7 @@ from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
 
-import boto3
-from botocore.client import Config
+from document_service.object_store import S3ObjectStore
 
 
 class StorageClient:
@@ -19,6 +18,8 @@ class StorageClient:
         secure: bool,
         local_storage_path: Optional[Path],
         default_expiry: int = 300,
+        max_pool_connections: int = 32,
+        object_store: Optional[S3ObjectStore] = None,
     ) -> None:
         self.bucket = bucket
         self.default_expiry = default_expiry
@@ -26,39 +27,37 @@ class StorageClient:
         if self.local_storage_path:
             self.local_storage_path.mkdir(parents=True, exist_ok=True)
 
-        self._s3_client = None
-        if bucket and access_key and secret_key:
-            session = boto3.session.Session(
-                aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key,
-                region_name=region or "us-east-1",
-            )
-            self._s3_client = session.client(
-                "s3",
-                endpoint_url=endpoint,
-                config=Config(signature_version="s3v4"),
-                use_ssl=secure,
-                verify=secure,
+        # async S3-клиент с общим пулом соединений; открывается лениво и закрывается в lifespan
+        self.object_store = object_store
+        if self.object_store is None and bucket and access_key and secret_key:
+            self.object_store = S3ObjectStore(
+                bucket=bucket,
+                endpoint=endpoint,
+                access_key=access_key,
+                secret_key=secret_key,
+                region=region,
+                secure=secure,
+                max_pool_connections=max_pool_connections,
             )
 
-    def generate_download_url(self, storage_uri: str, expires_in: Optional[int] = None) -> str:
+    async def aclose(self) -> None:
+        if self.object_store is not None:
+            await self.object_store.close()
+
+    async def generate_download_url(self, storage_uri: str, expires_in: Optional[int] = None) -> str:
         if not storage_uri:
             raise ValueError("storage URI is empty")
         parsed = urlparse(storage_uri)
         scheme = parsed.scheme or "file"
 
         if scheme == "s3":
-            if self._s3_client is None:
+            if self.object_store is None:
                 raise RuntimeError("S3 storage is not configured")
             bucket = parsed.netloc or self.bucket
             if not bucket:
                 raise RuntimeError("S3 bucket is not configured")
             key = parsed.path.lstrip("/")
-            return self._s3_client.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": bucket, "Key": key},
-                ExpiresIn=expires_in or self.default_expiry,
-            )
+            return await self.object_store.presign(key, expires_in or self.default_expiry, bucket=bucket)
 
         if scheme == "file":
             return storage_uri
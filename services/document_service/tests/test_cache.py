@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import fakeredis
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.append(str(ROOT / "services" / "document_service"))
+
+from document_service.cache import DocumentCache  # noqa: E402
+from document_service.schemas import DocumentDetail, DocumentSection  # noqa: E402
+
+
+def _detail(status: str = "indexed") -> DocumentDetail:
+    now = datetime.now(timezone.utc)
+    return DocumentDetail(
+        doc_id="doc_1",
+        name="Guide.pdf",
+        tenant_id="tenant_1",
+        status=status,
+        sections=[DocumentSection(section_id="sec_1", title="Intro", page_start=1, page_end=2)],
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_read_through_and_invalidate():
+    async def scenario() -> None:
+        cache = DocumentCache(local_ttl_seconds=60)
+        loads: list[str] = []
+
+        async def loader() -> DocumentDetail:
+            loads.append("doc")
+            return _detail(status=f"v{len(loads)}")
+
+        first = await cache.get_document("tenant_1", "doc_1", loader)
+        second = await cache.get_document("tenant_1", "doc_1", loader)
+        assert first.status == second.status == "v1"
+        # секция берётся из закэшированного detail, без запроса в БД
+        section = await cache.get_section("tenant_1", "doc_1", "sec_1", loader)
+        assert section.title == "Intro"
+        assert await cache.get_document("tenant_2", "doc_1", loader) is not None
+        assert loads == ["doc", "doc"]
+
+        await cache.invalidate("tenant_1", "doc_1")
+        assert (await cache.get_document("tenant_1", "doc_1", loader)).status == "v3"
+        stats = cache.stats()
+        assert stats["document"]["hit_local"] == 1 and stats["document"]["miss"] == 3
+        assert stats["section"]["hit_local"] == 1
+        assert 'document_cache_hit_ratio{kind="document"} 0.2500' in cache.render_prometheus()
+
+    asyncio.run(scenario())
+
+
+def test_redis_tier_shared_between_processes():
+    async def scenario() -> None:
+        server = fakeredis.FakeServer()
+        writer = DocumentCache(redis_client=fakeredis.FakeAsyncRedis(server=server))
+        reader = DocumentCache(redis_client=fakeredis.FakeAsyncRedis(server=server))
+
+        async def loader() -> DocumentDetail:
+            return _detail()
+
+        async def unexpected() -> DocumentDetail:
+            raise AssertionError("must be served from redis")
+
+        await writer.get_document("tenant_1", "doc_1", loader)
+        assert (await reader.get_document("tenant_1", "doc_1", unexpected)).status == "indexed"
+        assert reader.stats()["document"]["hit_redis"] == 1
+
+        await writer.invalidate("tenant_1", "doc_1")
+        fresh = DocumentCache(redis_client=fakeredis.FakeAsyncRedis(server=server))
+        assert (await fresh.get_document("tenant_1", "doc_1", loader)).status == "indexed"
+        assert fresh.stats()["document"]["miss"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_fill_racing_invalidate_is_not_cached():
+    async def scenario() -> None:
+        server = fakeredis.FakeServer()
+        reader = DocumentCache(redis_client=fakeredis.FakeAsyncRedis(server=server))
+        writer = DocumentCache(redis_client=fakeredis.FakeAsyncRedis(server=server))
+        loads: list[str] = []
+
+        async def stale_loader() -> DocumentDetail:
+            # читатель прочитал строку до коммита, писатель закоммитил и инвалидировал
+            loads.append("stale")
+            await writer.invalidate("tenant_1", "doc_1")
+            await reader.invalidate("tenant_1", "doc_1")
+            return _detail(status="stale")
+
+        async def stale_section_loader() -> DocumentSection:
+            await writer.invalidate("tenant_1", "doc_1")
+            return DocumentSection(section_id="sec_2", title="Old", page_start=1, page_end=1)
+
+        async def fresh_loader() -> DocumentDetail:
+            loads.append("fresh")
+            return _detail(status="fresh")
+
+        assert (await reader.get_document("tenant_1", "doc_1", stale_loader)).status == "stale"
+        # ни L1 читателя, ни Redis не получили устаревшую строку
+        assert (await reader.get_document("tenant_1", "doc_1", fresh_loader)).status == "fresh"
+        other = DocumentCache(redis_client=fakeredis.FakeAsyncRedis(server=server))
+        assert (await other.get_document("tenant_1", "doc_1", fresh_loader)).status == "fresh"
+        assert loads == ["stale", "fresh"]  # вторая реплика получила свежую строку из Redis
+
+        await other.get_section("tenant_1", "doc_1", "sec_2", stale_section_loader)
+        assert await DocumentCache(redis_client=fakeredis.FakeAsyncRedis(server=server)).get_section(
+            "tenant_1", "doc_1", "sec_2", lambda: asyncio.sleep(0, result=None)
+        ) is None
+
+    asyncio.run(scenario())
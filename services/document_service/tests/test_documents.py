@@ -20,6 +20,7 @@ os.environ.setdefault("DOC_LOCAL_STORAGE_PATH", str(LOCAL_STORAGE))
 os.environ.setdefault("DOC_MOCK_MODE", "true")
 
 from document_service.main import app  # noqa: E402
+from document_service.object_store import S3ObjectStore  # noqa: E402
 
 
 def tenant_headers(tenant: str = "tenant_1") -> dict[str, str]:
@@ -135,8 +136,155 @@ def test_download_url_local_scheme(tmp_path: Path):
         assert url.startswith("file:")
 
 
+class _PresignOnlyS3Client:
+    """Заменяет aiobotocore-клиент: Document Service от S3 нужны только presigned URL."""
+
+    async def generate_presigned_url(self, ClientMethod: str, Params: dict, ExpiresIn: int) -> str:
+        return f"memory://{Params['Bucket']}/{Params['Key']}?expires={ExpiresIn}"
+
+
+def test_download_url_s3_scheme_uses_pooled_store():
+    with TestClient(app) as client:
+        storage_client = app.state.storage_client
+        original = storage_client.object_store
+        storage_client.object_store = S3ObjectStore(bucket="docs", client=_PresignOnlyS3Client())
+        try:
+            doc_id = _create_document(client, storage_uri="s3://docs/tenant_1/manual.pdf")
+            resp = client.get(f"/internal/documents/{doc_id}/download-url", headers=tenant_headers())
+        finally:
+            storage_client.object_store = original
+        assert resp.status_code == 200
+        assert resp.json()["url"] == "memory://docs/tenant_1/manual.pdf?expires=300"
+
+
 def test_tenant_isolation_rejected():
     with TestClient(app) as client:
         doc_id = _create_document(client, tenant="tenant_1")
         resp = client.get(f"/internal/documents/{doc_id}", headers=tenant_headers("another"))
         assert resp.status_code == 404
+
+
+def test_bulk_create_registers_all_documents():
+    with TestClient(app) as client:
+        doc_ids = [f"doc_{uuid4().hex[:8]}" for _ in range(3)]
+        payload = {
+            "documents": [
+                {"doc_id": doc_id, "tenant_id": "tenant_1", "name": f"{doc_id}.pdf", "tags": ["bulk"]}
+                for doc_id in doc_ids
+            ]
+        }
+        resp = client.post("/internal/documents/bulk", json=payload)
+        assert resp.status_code == 201, resp.text
+        assert [item["doc_id"] for item in resp.json()["items"]] == doc_ids
+        listed = client.get("/internal/documents", params={"tag": "bulk"}, headers=tenant_headers()).json()
+        assert {item["doc_id"] for item in listed["items"]} >= set(doc_ids)
+
+        foreign = {"documents": [{"doc_id": doc_ids[0], "tenant_id": "another", "name": "x"}]}
+        assert client.post("/internal/documents/bulk", json=foreign).status_code == 403
+
+
+def test_sections_bulk_upsert_updates_existing_rows():
+    with TestClient(app) as client:
+        doc_id = _create_document(client)
+        _upsert_sections(client, doc_id)
+        sections = [
+            {"section_id": "sec_intro", "title": "Intro v2", "page_start": 1, "page_end": 3, "chunk_ids": ["chunk_1", "chunk_2"]},
+            {"section_id": "sec_setup", "title": "Setup", "page_start": 4, "page_end": 5},
+        ]
+        resp = client.post(
+            f"/internal/documents/{doc_id}/sections",
+            params={"return_detail": "false"},
+            headers=tenant_headers(),
+            json={"sections": sections},
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {"doc_id": doc_id, "upserted": 2}
+        detail = client.get(f"/internal/documents/{doc_id}", headers=tenant_headers()).json()
+        by_id = {section["section_id"]: section for section in detail["sections"]}
+        assert by_id["sec_intro"]["title"] == "Intro v2"
+        assert by_id["sec_intro"]["chunk_ids"] == ["chunk_1", "chunk_2"]
+        assert by_id["sec_setup"]["chunk_ids"] == []
+
+        foreign = client.post(f"/internal/documents/{doc_id}/sections", headers=tenant_headers("another"), json={"sections": sections})
+        assert foreign.status_code == 404
+
+
+def test_list_documents_keyset_pagination():
+    tenant = f"tenant_{uuid4().hex[:6]}"
+    with TestClient(app) as client:
+        created = {_create_document(client, tenant=tenant) for _ in range(5)}
+        seen: list[str] = []
+        params: dict[str, str | int] = {"limit": 2, "total": "none"}
+        while True:
+            body = client.get("/internal/documents", params=params, headers=tenant_headers(tenant)).json()
+            assert body["total"] is None
+            seen.extend(item["doc_id"] for item in body["items"])
+            if not body["next_cursor"]:
+                break
+            params["cursor"] = body["next_cursor"]
+        # документы созданы в пределах одной секунды: порядок держится на doc_id как tie-breaker
+        assert len(seen) == len(set(seen)) == 5
+        assert set(seen) == created
+
+        estimated = client.get("/internal/documents", params={"total": "estimate"}, headers=tenant_headers(tenant)).json()
+        assert estimated["total"] == 5
+        searched = client.get("/internal/documents", params={"search": "SPEC"}, headers=tenant_headers(tenant)).json()
+        assert searched["total"] == 5
+        bad = client.get("/internal/documents", params={"cursor": "???"}, headers=tenant_headers(tenant))
+        assert bad.status_code == 400
+
+
+def test_sections_batch_get_projects_fields():
+    with TestClient(app) as client:
+        doc_id = _create_document(client)
+        _upsert_sections(client, doc_id)
+        resp = client.post(
+            f"/internal/documents/{doc_id}/sections:batchGet",
+            headers=tenant_headers(),
+            json={"section_ids": ["sec_intro", "sec_missing"], "fields": ["title", "page_start"]},
+        )
+        assert resp.status_code == 200, resp.text
+        assert resp.json() == {
+            "doc_id": doc_id,
+            "sections": [{"section_id": "sec_intro", "title": "Intro", "page_start": 1}],
+            "missing": ["sec_missing"],
+        }
+        bad = client.post(
+            f"/internal/documents/{doc_id}/sections:batchGet", headers=tenant_headers(), json={"fields": ["text"]}
+        )
+        assert bad.status_code == 422
+        foreign = client.post(f"/internal/documents/{doc_id}/sections:batchGet", headers=tenant_headers("another"), json={})
+        assert foreign.status_code == 404
+
+
+def test_documents_metadata_batch_get():
+    with TestClient(app) as client:
+        first = _create_document(client)
+        second = _create_document(client)
+        _upsert_sections(client, first)
+        foreign = _create_document(client, tenant="another")
+        resp = client.post(
+            "/internal/documents/metadata:batchGet",
+            headers=tenant_headers(),
+            json={"doc_ids": [second, first, foreign], "fields": ["name", "tags", "section_count"]},
+        )
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        assert [item["doc_id"] for item in body["items"]] == [second, first]
+        item = body["items"][1]
+        assert sorted(item.pop("tags")) == ["admin", "ldap"]
+        assert item == {"doc_id": first, "name": f"Spec {first}", "section_count": 1}
+        assert body["missing"] == [foreign]
+
+
+def test_status_update_invalidates_cached_detail():
+    with TestClient(app) as client:
+        doc_id = _create_document(client)
+        first = client.get(f"/internal/documents/{doc_id}", headers=tenant_headers()).json()
+        again = client.get(f"/internal/documents/{doc_id}", headers=tenant_headers()).json()
+        assert first == again
+        client.post("/internal/documents/status", json={"doc_id": doc_id, "status": "indexed"})
+        updated = client.get(f"/internal/documents/{doc_id}", headers=tenant_headers()).json()
+        assert updated["status"] == "indexed"
+        metrics = client.get("/metrics").text
+        assert 'document_cache_requests_total{kind="document",result="hit_local"}' in metrics
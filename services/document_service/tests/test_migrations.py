@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.append(str(ROOT / "services" / "document_service"))
+
+from document_service import models  # noqa: E402
+from document_service.db import create_engine, init_db  # noqa: E402
+from document_service.migrations import MIGRATIONS, pending, upgrade  # noqa: E402
+
+
+def test_migrations_apply_once_and_gate_startup(tmp_path: Path):
+    async def scenario() -> None:
+        engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'fresh.db'}")
+        with pytest.raises(RuntimeError, match="out of date"):
+            await init_db(engine, auto_migrate=False)
+        assert await upgrade(engine) == [m.version for m in MIGRATIONS]
+        assert await upgrade(engine) == []
+        assert await pending(engine) == []
+        await init_db(engine, auto_migrate=False)
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_upgrade_adopts_schema_created_by_create_all(tmp_path: Path):
+    async def scenario() -> None:
+        engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+        async with engine.begin() as conn:
+            # прежний runtime create_all, ещё без индекса листинга
+            await conn.run_sync(models.Base.metadata.create_all)
+            await conn.exec_driver_sql("DROP INDEX ix_documents_tenant_listing")
+        await upgrade(engine)
+        async with engine.connect() as conn:
+            indexes = await conn.run_sync(lambda sync: {ix["name"] for ix in inspect(sync).get_indexes("documents")})
+        assert "ix_documents_tenant_listing" in indexes
+        await engine.dispose()
+
+    asyncio.run(scenario())
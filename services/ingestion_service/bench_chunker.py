@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: TokenChunker vs. the old word-loop _split_chunks.
+Usage: python bench_chunker.py [--mb 10] [--tokenizer BAAI/bge-m3]
+Generates a deterministic synthetic corpus of the given size and chunks it page by page
+(~3 KB pages, like PDF extraction output) with both implementations.
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from ingestion_service.core.chunker import TokenChunker, load_tokenizer
+
+WORDS = (
+    "ldap sso kerberos настройка сервер клиент пакет конфигурация параметр установка visior "
+    "orion агент политика пользователь группа сертификат порт сервис журнал ошибка"
+).split()
+
+
+def legacy_split_chunks(text: str, max_len: int = 2048, overlap: int = 0) -> List[str]:
+    """Прежняя реализация из pipeline._split_chunks (длина в символах, обратный проход для overlap)."""
+    words = text.split()
+    chunks: List[str] = []
+    start = 0
+    n = len(words)
+    if n == 0:
+        return [text]
+
+    while start < n:
+        end = start
+        length = 0
+        while end < n and length + len(words[end]) + 1 <= max_len:
+            length += len(words[end]) + 1
+            end += 1
+        if end == start:
+            end = start + 1
+        chunk = " ".join(words[start:end])
+        chunks.append(chunk)
+        if end >= n:
+            break
+        if overlap <= 0:
+            start = end
+        else:
+            overlap_chars = 0
+            new_start = end
+            while new_start > 0 and overlap_chars < overlap and new_start - 1 >= 0:
+                new_start -= 1
+                overlap_chars += len(words[new_start]) + 1
+            start = new_start
+    return chunks or [text]
+
+
+def build_corpus(size_mb: float, page_chars: int = 3000, seed: int = 13) -> List[str]:
+    rnd = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    pages: List[str] = []
+    total = 0
+    while total < target:
+        sentences = []
+        length = 0
+        while length < page_chars:
+            sentence = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(6, 24))).capitalize() + "."
+            sentences.append(sentence)
+            length += len(sentence) + 1
+        page = " ".join(sentences)
+        pages.append(page)
+        total += len(page.encode("utf-8"))
+    return pages
+
+
+def run(name: str, pages: List[str], fn) -> None:
+    started = time.perf_counter()
+    chunks = 0
+    for page in pages:
+        chunks += len(fn(page))
+    elapsed = time.perf_counter() - started
+    size_mb = sum(len(p.encode("utf-8")) for p in pages) / (1024 * 1024)
+    print(f"{name:<28} {elapsed:8.3f}s  {size_mb / elapsed:8.2f} MB/s  chunks={chunks}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=float, default=10.0)
+    parser.add_argument("--tokenizer", default=None, help="tokenizer.json path or HF model id")
+    parser.add_argument("--chunk-chars", type=int, default=2048)
+    parser.add_argument("--overlap-chars", type=int, default=200)
+    parser.add_argument("--chunk-tokens", type=int, default=512)
+    parser.add_argument("--overlap-tokens", type=int, default=64)
+    args = parser.parse_args()
+
+    pages = build_corpus(args.mb)
+    print(f"corpus: {len(pages)} pages, {args.mb} MB")
+    run("legacy _split_chunks", pages, lambda text: legacy_split_chunks(text, args.chunk_chars, args.overlap_chars))
+    chunker = TokenChunker(args.chunk_tokens, args.overlap_tokens, tokenizer=load_tokenizer(args.tokenizer))
+    run(f"TokenChunker ({type(chunker.tokenizer).__name__})", pages, chunker.split)
+
+
+if __name__ == "__main__":
+    main()
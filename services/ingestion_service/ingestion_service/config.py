@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     mock_mode: bool = True
 
     doc_service_base_url: str | None = None
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2: bool = True  # действует, только если установлен пакет h2
     redis_url: str | None = "redis://redis:6379/0"
 
     s3_endpoint: str | None = None
@@ -24,6 +28,8 @@ class Settings(BaseSettings):
     s3_secret_key: str | None = None
     s3_region: str | None = "us-east-1"
     s3_secure: bool = True
+    s3_max_pool_connections: int = 32  # общий пул соединений async S3-клиента
+    s3_transfer_concurrency: int = 8  # параллельных частей multipart upload/ranged GET на объект
     local_storage_path: Path | None = Path("./.ingestion_storage")
 
     embedding_api_base: str | None = None  # OpenAI-compatible endpoint (например, https://openrouter.ai/api/v1)
@@ -44,11 +50,27 @@ class Settings(BaseSettings):
     queue_name: str = "ingestion_queue"
     max_attempts: int = 3
     retry_delay_seconds: int = 5
+    visibility_timeout_seconds: int = 300  # без продления аренды сообщение забирает другой воркер
+    queue_priority_weights: dict[str, int] = {"interactive": 4, "bulk": 1}  # доли классов в взвешенном round-robin
+    queue_tenant_weights: dict[str, int] = {}  # тенант -> вес внутри класса (по умолчанию 1)
+    log_preview_chars: int = 1000  # входы моделей в логе job обрезаются до превью
+    log_preview_items: int = 5
+
+    upload_part_bytes: int = 8 * 1024 * 1024  # размер части S3 multipart upload
+    upload_concurrency: int = 4  # сколько файлов пакетной загрузки копируются в хранилище параллельно
+    batch_max_files: int = 100
 
     max_pages: int = 2000
     max_file_mb: int = 50
-    chunk_size: int = 2048
-    chunk_overlap: int = 200
+    chunk_size: int = 512  # в токенах модели эмбеддингов
+    chunk_overlap: int = 64
+    tokenizer_name: str | None = None  # tokenizer.json или id модели (BAAI/bge-m3); без него — regex-аппроксимация
+    page_batch_size: int = 16
+    doc_embedding_max_chars: int = 32000
+    parse_workers: int = 0  # >1 — извлечение страниц PDF в пуле процессов
+    parse_shard_pages: int = 32
+    section_min_chars: int = 400  # секции короче сливаются со следующей
+    section_max_chars: int = 8000  # без заголовков страницы копятся в секцию до этого размера
 
     chroma_path: Path = Path("./.chroma_ingestion")
     chroma_host: str | None = None
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import structlog
+
+try:  # pragma: no cover - без tokenizers работает regex-аппроксимация
+    from tokenizers import Tokenizer  # type: ignore
+except Exception:  # pragma: no cover
+    Tokenizer = None  # type: ignore
+
+logger = structlog.get_logger(__name__)
+
+# Грубая аппроксимация BPE/SentencePiece: слово или отдельный знак пунктуации — один токен.
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+# Начало нового предложения: после .!?… и пробела или после пустой строки (конец совпадения).
+_SENTENCE_RE = re.compile(r"[.!?…]\s+|\n\s*\n")
+_NON_SPACE_RE = re.compile(r"\S")
+
+Span = Tuple[int, int]
+
+
+@lru_cache(maxsize=32)
+def _tokens_re(count: int) -> "re.Pattern[str]":
+    # до count токенов _TOKEN_RE подряд одним совпадением
+    return re.compile(r"(?:\s*(?:\w+|[^\w\s])){1,%d}" % count)
+
+
+class RegexTokenizer:
+    """Fallback-токенизатор без внешних зависимостей: отдаёт только смещения токенов.
+
+    ``skip`` отсчитывает ``count`` токенов одним совпадением регулярного выражения, без
+    списка смещений: на нём работает быстрый путь ``TokenChunker``.
+    """
+
+    def offsets(self, text: str) -> List[Span]:
+        return [m.span() for m in _TOKEN_RE.finditer(text)]
+
+    def skip(self, text: str, pos: int, count: int) -> int:
+        """Конец ``count``-го токена, начиная с ``pos`` (конец последнего, если токенов меньше)."""
+        if count <= 0:
+            return pos
+        match = _tokens_re(count).match(text, pos)
+        return match.end() if match else pos
+
+
+class HFTokenizer:
+    """Обёртка над ``tokenizers.Tokenizer`` модели эмбеддингов (например, BAAI/bge-m3)."""
+
+    def __init__(self, tokenizer) -> None:
+        self._tokenizer = tokenizer
+
+    def offsets(self, text: str) -> List[Span]:
+        encoding = self._tokenizer.encode(text, add_special_tokens=False)
+        return [(start, end) for start, end in encoding.offsets if end > start]
+
+
+@lru_cache
+def load_tokenizer(name: Optional[str] = None):
+    """Токенизатор, совместимый с моделью эмбеддингов; при недоступности — RegexTokenizer.
+
+    ``name`` — путь к ``tokenizer.json`` или id модели на HuggingFace Hub.
+    """
+    if not name or Tokenizer is None:
+        return RegexTokenizer()
+    try:
+        if Path(name).is_file():
+            return HFTokenizer(Tokenizer.from_file(name))
+        return HFTokenizer(Tokenizer.from_pretrained(name))
+    except Exception as exc:
+        logger.warning("chunker_tokenizer_fallback", tokenizer=name, reason=str(exc))
+        return RegexTokenizer()
+
+
+class TokenChunker:
+    """Однопроходное скользящее окно по заранее посчитанным смещениям токенов.
+
+    Размер окна и перекрытие измеряются в токенах модели. Конец окна притягивается
+    к ближайшей границе предложения, если она не раньше середины окна; чанки
+    возвращаются срезами исходной строки, без повторных join.
+
+    С ``RegexTokenizer`` смещения всех токенов не строятся: границы окна находятся
+    прыжками ``skip`` по строке (перекрытие — по развёрнутой строке), поэтому на каждый
+    токен не создаётся Python-объектов. Результат совпадает с путём по смещениям.
+    """
+
+    def __init__(self, max_tokens: int, overlap_tokens: int = 0, tokenizer=None) -> None:
+        self.max_tokens = max(1, max_tokens)
+        self.overlap_tokens = min(max(0, overlap_tokens), self.max_tokens - 1)
+        self.tokenizer = tokenizer or RegexTokenizer()
+
+    def spans(self, text: str) -> List[Span]:
+        if isinstance(self.tokenizer, RegexTokenizer):
+            return self._skip_spans(text)
+        return self._offset_spans(text)
+
+    def _offset_spans(self, text: str) -> List[Span]:
+        offsets = self.tokenizer.offsets(text)
+        n = len(offsets)
+        if n == 0:
+            return []
+        starts = [start for start, _ in offsets]
+        # индексы токенов, с которых начинается новое предложение
+        sentence_starts: Sequence[int] = sorted(
+            {bisect_left(starts, m.end()) for m in _SENTENCE_RE.finditer(text)} - {0, n}
+        )
+        min_fill = self.max_tokens // 2
+        spans: List[Span] = []
+        i = 0
+        while i < n:
+            end = min(i + self.max_tokens, n)
+            if end < n:
+                pos = bisect_right(sentence_starts, end) - 1
+                if pos >= 0 and sentence_starts[pos] > i + min_fill:
+                    end = sentence_starts[pos]
+            spans.append((offsets[i][0], offsets[end - 1][1]))
+            if end >= n:
+                break
+            next_start = max(end - self.overlap_tokens, i + 1)
+            if self.overlap_tokens:
+                # перекрытие тоже начинаем с начала предложения, если оно есть внутри хвоста окна
+                pos = bisect_left(sentence_starts, next_start)
+                if pos < len(sentence_starts) and sentence_starts[pos] < end:
+                    next_start = sentence_starts[pos]
+            i = next_start
+        return spans
+
+    def _skip_spans(self, text: str) -> List[Span]:
+        """``_offset_spans`` в позициях строки: токен задаётся позицией своего начала."""
+        skip = self.tokenizer.skip
+
+        def token_start(pos: int) -> int:
+            match = _NON_SPACE_RE.search(text, pos)
+            return match.start() if match else len(text)
+
+        def token_end_before(pos: int) -> int:
+            while pos and text[pos - 1].isspace():
+                pos -= 1
+            return pos
+
+        first = token_start(0)
+        last_end = token_end_before(len(text))
+        if first >= last_end:
+            return []
+        # позиции токенов, с которых начинается новое предложение (кроме первого)
+        sentence_starts: Sequence[int] = sorted(
+            {start for start in (token_start(m.end()) for m in _SENTENCE_RE.finditer(text)) if first < start < last_end}
+        )
+        reversed_text = text[::-1] if self.overlap_tokens else ""
+        min_fill = self.max_tokens // 2
+        spans: List[Span] = []
+        i = first
+        while True:
+            end = skip(text, i, self.max_tokens)
+            after = token_start(end)  # начало первого токена за окном
+            if after < len(text):
+                pos = bisect_right(sentence_starts, after) - 1
+                if pos >= 0 and sentence_starts[pos] > token_start(skip(text, i, min_fill)):
+                    after = sentence_starts[pos]
+                    end = token_end_before(after)
+            spans.append((i, end))
+            if after >= len(text):
+                break
+            next_start = after
+            if self.overlap_tokens:
+                # начало токена за overlap_tokens до конца окна: те же прыжки по развёрнутой строке
+                next_start = len(text) - skip(reversed_text, len(text) - end, self.overlap_tokens)
+                if next_start <= i:
+                    next_start = token_start(skip(text, i, 1))
+                pos = bisect_left(sentence_starts, next_start)
+                if pos < len(sentence_starts) and sentence_starts[pos] < after:
+                    next_start = sentence_starts[pos]
+            i = next_start
+        return spans
+
+    def split(self, text: str) -> List[str]:
+        spans = self.spans(text)
+        if not spans:
+            return [text]
+        return [text[start:end] for start, end in spans]
@@ -8,12 +8,15 @@ import httpx
 import structlog
 
 from ingestion_service.config import Settings
+from ingestion_service.http_client import create_sync_http_client
 
 
 class EmbeddingClient:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, http_client: httpx.Client | None = None) -> None:
         self.settings = settings
         self._mock = settings.mock_mode or not settings.embedding_api_base
+        # общий keep-alive пул: без него каждый батч эмбеддингов открывал новое TCP/TLS соединение
+        self._http_client = http_client or (None if self._mock else create_sync_http_client())
         self._logger = structlog.get_logger(__name__)
         self.max_attempts = getattr(settings, "embedding_max_attempts", 3)
         self.retry_delay = getattr(settings, "embedding_retry_delay_seconds", 1.0)
@@ -34,28 +37,27 @@ class EmbeddingClient:
         for attempt in range(1, attempts + 1):
             started = time.perf_counter()
             try:
-                with httpx.Client(base_url=base, timeout=20.0) as client:
-                    self._logger.info(
-                        "embedding_request",
-                        url=base + path,
-                        model=self.settings.embedding_model,
-                        items=len(texts),
-                        mock=False,
-                        attempt=attempt,
-                    )
-                    resp = client.post(path, json=payload, headers=headers)
-                    latency_ms = int((time.perf_counter() - started) * 1000)
-                    self._logger.info(
-                        "embedding_response",
-                        status_code=resp.status_code,
-                        model=self.settings.embedding_model,
-                        items=len(texts),
-                        latency_ms=latency_ms,
-                        attempt=attempt,
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
-                    return [item["embedding"] for item in data.get("data", [])]
+                self._logger.info(
+                    "embedding_request",
+                    url=base + path,
+                    model=self.settings.embedding_model,
+                    items=len(texts),
+                    mock=False,
+                    attempt=attempt,
+                )
+                resp = self._http_client.post(base + path, json=payload, headers=headers, timeout=20.0)  # type: ignore[union-attr]
+                latency_ms = int((time.perf_counter() - started) * 1000)
+                self._logger.info(
+                    "embedding_response",
+                    status_code=resp.status_code,
+                    model=self.settings.embedding_model,
+                    items=len(texts),
+                    latency_ms=latency_ms,
+                    attempt=attempt,
+                )
+                resp.raise_for_status()
+                data = resp.json()
+                return [item["embedding"] for item in data.get("data", [])]
             except httpx.HTTPStatusError as exc:
                 last_error = exc
                 self._logger.warning(
@@ -83,6 +85,10 @@ class EmbeddingClient:
         )
         return [self._pseudo_embedding(text) for text in texts]
 
+    def close(self) -> None:
+        if self._http_client is not None:
+            self._http_client.close()
+
     @staticmethod
     def _pseudo_embedding(text: str, dim: int = 8) -> List[float]:
         h = hashlib.sha256(text.encode("utf-8")).digest()
@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 
 try:  # pragma: no cover - tests may run without redis
     import redis  # type: ignore
@@ -12,6 +12,26 @@ except Exception:
 
 from ingestion_service.schemas import IngestionTicket
 
+LOG_PREVIEW_CHARS = 1000
+LOG_PREVIEW_ITEMS = 5
+
+
+def preview_payload(value: Any, max_chars: int = LOG_PREVIEW_CHARS, max_items: int = LOG_PREVIEW_ITEMS) -> Any:
+    """Сжимает входы/выходы моделей для лога job: строки обрезаются до ``max_chars``,
+    списки — до ``max_items`` элементов, с пометкой о том, сколько отброшено."""
+    if isinstance(value, str):
+        if len(value) <= max_chars:
+            return value
+        return f"{value[:max_chars]}… [+{len(value) - max_chars} chars]"
+    if isinstance(value, (list, tuple)):
+        items = [preview_payload(item, max_chars, max_items) for item in value[:max_items]]
+        if len(value) > max_items:
+            items.append(f"… [+{len(value) - max_items} items]")
+        return items
+    if isinstance(value, dict):
+        return {key: preview_payload(item, max_chars, max_items) for key, item in value.items()}
+    return value
+
 
 @dataclass
 class JobRecord:
@@ -38,11 +58,19 @@ class JobRecord:
 class JobStore:
     """Redis-backed JobStore с in-memory fallback."""
 
-    def __init__(self, redis_url: str | None = None, events_stream: str = "ingestion_events"):
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        events_stream: str = "ingestion_events",
+        log_preview_chars: int = LOG_PREVIEW_CHARS,
+        log_preview_items: int = LOG_PREVIEW_ITEMS,
+    ):
         self._redis = None
         self.events_stream = events_stream
         self.logs_prefix = "ingestion_job_logs"
         self.max_logs = 50
+        self.log_preview_chars = log_preview_chars
+        self.log_preview_items = log_preview_items
         if redis_url and redis:
             try:
                 self._redis = redis.from_url(redis_url, decode_responses=True)
@@ -52,20 +80,23 @@ class JobStore:
         self._memory: dict[str, JobRecord] = {}
         self._logs_memory: dict[str, list[dict]] = {}
 
+    @staticmethod
+    def _dump(job: JobRecord) -> str:
+        return json.dumps(
+            {
+                "job_id": job.job_id,
+                "tenant_id": job.tenant_id,
+                "doc_id": job.doc_id,
+                "status": job.status,
+                "submitted_at": job.submitted_at.isoformat(),
+                "storage_uri": job.storage_uri,
+                "error": job.error,
+            }
+        )
+
     def _set(self, job: JobRecord) -> None:
         if self._redis:
-            payload = json.dumps(
-                {
-                    "job_id": job.job_id,
-                    "tenant_id": job.tenant_id,
-                    "doc_id": job.doc_id,
-                    "status": job.status,
-                    "submitted_at": job.submitted_at.isoformat(),
-                    "storage_uri": job.storage_uri,
-                    "error": job.error,
-                }
-            )
-            self._redis.hset("ingestion_jobs", job.job_id, payload)
+            self._redis.hset("ingestion_jobs", job.job_id, self._dump(job))
         self._memory[job.job_id] = job
 
     def _get(self, job_id: str) -> Optional[JobRecord]:
@@ -88,6 +119,14 @@ class JobStore:
         self._set(job)
         return job.to_ticket()
 
+    def create_many(self, jobs: List[JobRecord]) -> List[IngestionTicket]:
+        """Создаёт пачку job одним HSET с mapping."""
+        if self._redis and jobs:
+            self._redis.hset("ingestion_jobs", mapping={job.job_id: self._dump(job) for job in jobs})
+        for job in jobs:
+            self._memory[job.job_id] = job
+        return [job.to_ticket() for job in jobs]
+
     def update(self, job_id: str, *, status: str, storage_uri: str | None = None, error: str | None = None) -> IngestionTicket:
         job = self._get(job_id)
         if not job:
@@ -107,17 +146,31 @@ class JobStore:
         if self._redis:
             self._redis.xadd(self.events_stream, {k: json.dumps(v) if isinstance(v, (dict, list)) else v for k, v in payload.items()})
 
-    def append_log(self, job_id: str, entry: dict) -> None:
-        payload = {"timestamp": datetime.utcnow().isoformat(), **entry}
+    def _log_payload(self, entry: dict) -> dict:
+        entry = preview_payload(entry, self.log_preview_chars, self.log_preview_items)
+        return {"timestamp": datetime.utcnow().isoformat(), **entry}
+
+    def _write_logs(self, job_id: str, payloads: List[dict]) -> None:
+        if not payloads:
+            return
         if self._redis:
             key = f"{self.logs_prefix}:{job_id}"
-            self._redis.rpush(key, json.dumps(payload, default=str))
-            self._redis.ltrim(key, -self.max_logs, -1)
+            # RPUSH всей пачки + LTRIM одним round trip
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.rpush(key, *(json.dumps(payload, default=str) for payload in payloads))
+            pipe.ltrim(key, -self.max_logs, -1)
+            pipe.execute()
         logs = self._logs_memory.setdefault(job_id, [])
-        logs.append(payload)
+        logs.extend(payloads)
         if len(logs) > self.max_logs:
             self._logs_memory[job_id] = logs[-self.max_logs :]
 
+    def append_log(self, job_id: str, entry: dict) -> None:
+        self._write_logs(job_id, [self._log_payload(entry)])
+
+    def log_buffer(self, job_id: str) -> "JobLogBuffer":
+        return JobLogBuffer(self, job_id)
+
     def get_logs(self, job_id: str, limit: int = 50) -> list[dict]:
         if self._redis:
             key = f"{self.logs_prefix}:{job_id}"
@@ -128,3 +181,19 @@ class JobStore:
                 return []
         logs = self._logs_memory.get(job_id, [])
         return logs[-limit:]
+
+
+class JobLogBuffer:
+    """Копит записи лога job в памяти и пишет их в Redis пачкой на границах стадий."""
+
+    def __init__(self, store: JobStore, job_id: str) -> None:
+        self.store = store
+        self.job_id = job_id
+        self._pending: List[dict] = []
+
+    def append(self, entry: dict) -> None:
+        self._pending.append(self.store._log_payload(entry))
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, []
+        self.store._write_logs(self.job_id, pending)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import structlog
+
+try:  # pragma: no cover - optional dependency
+    import aioboto3  # type: ignore
+    from aiobotocore.config import AioConfig  # type: ignore
+except Exception:  # pragma: no cover
+    aioboto3 = None  # type: ignore
+    AioConfig = None  # type: ignore
+
+logger = structlog.get_logger(__name__)
+
+MIN_PART_BYTES = 5 * 1024 * 1024  # минимальный размер части S3 multipart (кроме последней)
+
+
+class S3ObjectStore:
+    """Асинхронный S3-клиент с общим пулом соединений на процесс.
+
+    Большие объекты загружаются multipart upload'ом, части по ``part_size`` байт уходят
+    параллельно (не больше ``concurrency`` одновременно); скачивание — параллельными
+    ranged GET с записью по смещениям в файл. Клиент создаётся один раз в ``start()``
+    (lifespan сервиса) и переиспользуется всеми запросами.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        region: Optional[str] = None,
+        secure: bool = True,
+        max_pool_connections: int = 32,
+        part_size: int = 8 * 1024 * 1024,
+        concurrency: int = 8,
+        client: Any = None,
+    ) -> None:
+        self.bucket = bucket
+        self.endpoint = endpoint
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region or "us-east-1"
+        self.secure = secure
+        self.max_pool_connections = max_pool_connections
+        self.part_size = max(MIN_PART_BYTES, part_size)
+        self.concurrency = max(1, concurrency)
+        self._client = client
+        self._stack: Optional[AsyncExitStack] = None
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        if self._client is not None:
+            return
+        if aioboto3 is None:
+            raise RuntimeError("aioboto3 is not installed")
+        async with self._lock:
+            if self._client is not None:
+                return
+            session = aioboto3.Session(
+                aws_access_key_id=self.access_key,
+                aws_secret_access_key=self.secret_key,
+                region_name=self.region,
+            )
+            stack = AsyncExitStack()
+            self._client = await stack.enter_async_context(
+                session.client(
+                    "s3",
+                    endpoint_url=self.endpoint,
+                    config=AioConfig(signature_version="s3v4", max_pool_connections=self.max_pool_connections),
+                    use_ssl=self.secure,
+                    verify=self.secure,
+                )
+            )
+            self._stack = stack
+
+    async def close(self) -> None:
+        if self._stack is not None:
+            await self._stack.aclose()
+            self._stack = None
+            self._client = None
+
+    async def _get_client(self):
+        if self._client is None:
+            await self.start()
+        return self._client
+
+    async def put_fileobj(self, key: str, fileobj: BinaryIO, bucket: Optional[str] = None) -> None:
+        client = await self._get_client()
+        bucket = bucket or self.bucket
+        first = await asyncio.to_thread(fileobj.read, self.part_size)
+        if len(first) < self.part_size:
+            await client.put_object(Bucket=bucket, Key=key, Body=first)
+            return
+        upload = await client.create_multipart_upload(Bucket=bucket, Key=key)
+        upload_id = upload["UploadId"]
+        limiter = asyncio.Semaphore(self.concurrency)
+        tasks: List[asyncio.Task] = []
+
+        async def send(number: int, body: bytes) -> Dict[str, Any]:
+            try:
+                resp = await client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=body)
+                return {"PartNumber": number, "ETag": resp["ETag"]}
+            finally:
+                limiter.release()
+
+        try:
+            number, body = 1, first
+            while body:
+                # читаем следующую часть, только когда есть свободный слот: в памяти не больше concurrency частей
+                await limiter.acquire()
+                tasks.append(asyncio.create_task(send(number, body)))
+                number += 1
+                body = await asyncio.to_thread(fileobj.read, self.part_size)
+            parts = await asyncio.gather(*tasks)
+            await client.complete_multipart_upload(
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": sorted(parts, key=lambda p: p["PartNumber"])},
+            )
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                await client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+            except Exception:
+                logger.warning("s3_abort_multipart_failed", bucket=bucket, key=key)
+            raise
+
+    async def presign(self, key: str, expires_in: int, bucket: Optional[str] = None) -> str:
+        client = await self._get_client()
+        return await client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": bucket or self.bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
+
+    async def get_to_file(self, key: str, target: Path, bucket: Optional[str] = None) -> Path:
+        client = await self._get_client()
+        bucket = bucket or self.bucket
+        head = await client.head_object(Bucket=bucket, Key=key)
+        size = int(head["ContentLength"])
+        etag = head["ETag"]
+        ranges: List[Tuple[int, int]] = [(start, min(start + self.part_size, size) - 1) for start in range(0, size, self.part_size)]
+        limiter = asyncio.Semaphore(self.concurrency)
+        tasks: List[asyncio.Task] = []
+        fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+        async def fetch(start: int, end: int) -> None:
+            async with limiter:
+                # IfMatch: объект, перезаписанный после head_object, не склеится из двух версий
+                resp = await client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}", IfMatch=etag)
+                async with resp["Body"] as stream:
+                    data = await stream.read()
+                write = asyncio.ensure_future(asyncio.to_thread(os.pwrite, fd, data, start))
+                try:
+                    await asyncio.shield(write)
+                except asyncio.CancelledError:
+                    await write  # поток с pwrite не отменить: fd закрывается только после него
+                    raise
+
+        try:
+            os.ftruncate(fd, size)
+            tasks = [asyncio.create_task(fetch(start, end)) for start, end in ranges]
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            os.close(fd)
+        return target
@@ -1,13 +1,53 @@
 from __future__ import annotations
 
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Deque, Iterator, List, Optional, Tuple
+
+DOCX_PAGE_WORDS = 800
+
+
+def _extract_pdf_range(file_path: str, start: int, end: int) -> List[Tuple[str, float]]:
+    """Извлекает текст страниц [start, end) в отдельном процессе: каждый воркер сам открывает файл."""
+    import PyPDF2  # type: ignore
+
+    result: List[Tuple[str, float]] = []
+    with open(file_path, "rb") as fh:
+        reader = PyPDF2.PdfReader(fh)
+        for idx in range(start, end):
+            started = time.perf_counter()
+            try:
+                text = DocumentParser._clean_text(reader.pages[idx].extract_text() or "")
+            except Exception:
+                text = ""
+            result.append((text, time.perf_counter() - started))
+    return result
+
+
+def create_parse_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """Пул процессов для извлечения страниц PDF — один на сервис, создаётся в lifespan.
+
+    Процессы запускаются через ``spawn``: fork многопоточного процесса (клиенты Redis, httpx,
+    S3, Chroma) может унаследовать захваченные блокировки и подвесить дочерний процесс.
+    """
+    if workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
 
 
 class DocumentParser:
-    def __init__(self, max_pages: int, max_file_mb: int) -> None:
+    def __init__(
+        self, max_pages: int, max_file_mb: int, workers: int = 0, shard_pages: int = 32, pool: Optional[Executor] = None
+    ) -> None:
         self.max_pages = max_pages
         self.max_file_mb = max_file_mb
+        # workers > 1 и общий пул процессов (create_parse_pool) включают параллельное извлечение страниц PDF
+        self.workers = workers
+        self.shard_pages = max(1, shard_pages)
+        self.pool = pool
 
     @staticmethod
     def _clean_text(text: str) -> str:
@@ -15,37 +55,114 @@ class DocumentParser:
         return text.replace("\x00", "").strip()
 
     def parse(self, file_path: Path) -> Tuple[List[str], dict]:
+        pages, meta = self.stream(file_path)
+        return list(pages), meta
+
+    def stream(self, file_path: Path) -> Tuple[Iterator[str], dict]:
+        """Ленивый вариант parse: метаданные сразу, страницы — генератором по одной."""
         size_mb = file_path.stat().st_size / (1024 * 1024)
         if size_mb > self.max_file_mb:
             raise ValueError(f"file too large: {size_mb:.1f} MB > {self.max_file_mb} MB")
 
         ext = file_path.suffix.lower()
         if ext == ".pdf":
-            return self._parse_pdf(file_path)
+            return self._stream_pdf(file_path)
         if ext in {".docx", ".doc"}:
-            return self._parse_docx(file_path)
+            pages, meta = self._parse_docx(file_path)
+            return iter(pages), meta
         # fallback: treat as text
         text = file_path.read_text(encoding="utf-8", errors="ignore")
-        return [self._clean_text(text)], {"pages": 1, "title": file_path.name}
+        return iter([self._clean_text(text)]), {"pages": 1, "title": file_path.name}
 
     def _parse_pdf(self, file_path: Path) -> Tuple[List[str], dict]:
+        pages, meta = self._stream_pdf(file_path)
+        return list(pages), meta
+
+    def _stream_pdf(self, file_path: Path) -> Tuple[Iterator[str], dict]:
         try:
             import PyPDF2  # type: ignore
         except ImportError:
             text = file_path.read_text(encoding="utf-8", errors="ignore")
-            return [text], {"pages": 1, "title": file_path.name}
+            return iter([text]), {"pages": 1, "title": file_path.name}
 
-        pages: List[str] = []
-        with open(file_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            if len(reader.pages) > self.max_pages:
-                raise ValueError(f"too many pages: {len(reader.pages)} > {self.max_pages}")
-            for page in reader.pages:
+        # PdfReader по пути читает весь файл в BytesIO, поэтому передаём открытый handle:
+        # объекты страниц подгружаются с диска по мере обхода.
+        fh = open(file_path, "rb")
+        try:
+            reader = PyPDF2.PdfReader(fh)
+            total = len(reader.pages)
+        except Exception:
+            fh.close()
+            raise
+        if total > self.max_pages:
+            fh.close()
+            raise ValueError(f"too many pages: {total} > {self.max_pages}")
+        # page_timings заполняется по мере обхода генератора: секунды на извлечение каждой страницы
+        meta = {"pages": total, "title": file_path.name, "page_timings": [], "outline": self._pdf_outline(reader)}
+        if self.pool is not None and self.workers > 1 and total > self.shard_pages:
+            fh.close()
+            return self._stream_pdf_parallel(file_path, total, meta["page_timings"], self.pool), meta
+
+        def pages() -> Iterator[str]:
+            try:
+                for page in reader.pages:
+                    started = time.perf_counter()
+                    try:
+                        text = self._clean_text(page.extract_text() or "")
+                    except Exception:
+                        text = ""
+                    meta["page_timings"].append(time.perf_counter() - started)
+                    yield text
+            finally:
+                fh.close()
+
+        return pages(), meta
+
+    @staticmethod
+    def _pdf_outline(reader) -> List[dict]:
+        """Плоское оглавление PDF: [{"title", "page" (с 1), "level"}]."""
+        entries: List[dict] = []
+
+        def walk(items, level: int) -> None:
+            for item in items:
+                if isinstance(item, list):
+                    walk(item, level + 1)
+                    continue
                 try:
-                    pages.append(self._clean_text(page.extract_text() or ""))
+                    page = reader.get_destination_page_number(item)
                 except Exception:
-                    pages.append("")
-        return pages, {"pages": len(pages), "title": file_path.name}
+                    continue
+                title = str(getattr(item, "title", "") or "").strip()
+                if title and page is not None and page >= 0:
+                    entries.append({"title": title, "page": page + 1, "level": level})
+
+        try:
+            walk(reader.outline, 1)
+        except Exception:
+            return []
+        return entries
+
+    def _stream_pdf_parallel(self, file_path: Path, total: int, timings: List[float], executor: Executor) -> Iterator[str]:
+        """Шардирует диапазоны страниц по общему пулу процессов и отдаёт страницы в исходном порядке.
+
+        В полёте держим не больше ``2 * workers`` шардов, чтобы память оставалась ограниченной.
+        """
+        ranges = [(start, min(start + self.shard_pages, total)) for start in range(0, total, self.shard_pages)]
+        pending: Deque[Future] = deque()
+        try:
+            next_range = 0
+            while next_range < len(ranges) or pending:
+                while next_range < len(ranges) and len(pending) < 2 * self.workers:
+                    start, end = ranges[next_range]
+                    pending.append(executor.submit(_extract_pdf_range, str(file_path), start, end))
+                    next_range += 1
+                for text, seconds in pending.popleft().result():
+                    timings.append(seconds)
+                    yield text
+        finally:
+            # пул общий: отменяем только свои ещё не начатые шарды
+            for future in pending:
+                future.cancel()
 
     def _parse_docx(self, file_path: Path) -> Tuple[List[str], dict]:
         try:
@@ -55,9 +172,36 @@ class DocumentParser:
             return [text], {"pages": 1, "title": file_path.name}
 
         document = docx.Document(file_path)
-        paragraphs = [p.text for p in document.paragraphs]
-        text = "\n".join(paragraphs)
-        approx_pages = max(1, len(text.split()) // 800)
-        if approx_pages > self.max_pages:
-            raise ValueError(f"too many pages (approx): {approx_pages} > {self.max_pages}")
-        return [self._clean_text(text)], {"pages": approx_pages, "title": file_path.name}
+        # DOCX не хранит разбиение на страницы: режем по абзацам на «страницы» ~DOCX_PAGE_WORDS слов,
+        # чтобы номера страниц у секций и чанков были осмысленными.
+        pages: List[str] = []
+        outline: List[dict] = []
+        current: List[str] = []
+        words = 0
+        for paragraph in document.paragraphs:
+            text = paragraph.text
+            level = self._docx_heading_level(paragraph)
+            if current and (words >= DOCX_PAGE_WORDS or (level and words >= DOCX_PAGE_WORDS // 2)):
+                pages.append(self._clean_text("\n".join(current)))
+                current, words = [], 0
+            if level and text.strip():
+                outline.append({"title": text.strip(), "page": len(pages) + 1, "level": level})
+            current.append(text)
+            words += len(text.split())
+        if current or not pages:
+            pages.append(self._clean_text("\n".join(current)))
+        if len(pages) > self.max_pages:
+            raise ValueError(f"too many pages (approx): {len(pages)} > {self.max_pages}")
+        return pages, {"pages": len(pages), "title": file_path.name, "outline": outline}
+
+    @staticmethod
+    def _docx_heading_level(paragraph) -> int | None:
+        style = getattr(paragraph, "style", None)
+        name = (getattr(style, "name", "") or "").strip()
+        for prefix in ("Heading", "Заголовок"):
+            if name.startswith(prefix):
+                suffix = name[len(prefix):].strip()
+                return int(suffix) if suffix.isdigit() else 1
+        if name == "Title":
+            return 1
+        return None
@@ -1,85 +1,105 @@
 from __future__ import annotations
 
-import tempfile
-from pathlib import Path
+from concurrent.futures import Executor
+from contextlib import ExitStack, nullcontext
 import time
-from typing import List, Sequence
-from urllib.parse import urlparse
+from typing import Dict, Iterable, Iterator, List, Sequence, TypeVar
 
 import httpx
 import structlog
 
+from ingestion_service.core.chunker import TokenChunker, load_tokenizer
 from ingestion_service.core.embedding import EmbeddingClient
 from ingestion_service.core.jobs import JobStore
 from ingestion_service.core.parser import DocumentParser
+from ingestion_service.core.profiling import StageProfiler, get_profiler
+from ingestion_service.core.sectioning import SectionDraft, StructureSegmenter
 from ingestion_service.core.summarizer import Summarizer
 from ingestion_service.core.storage import StorageClient
 from ingestion_service.schemas import IngestionTicket
 
 logger = structlog.get_logger(__name__)
 
+T = TypeVar("T")
 
-def _split_chunks(text: str, max_len: int = 2048, overlap: int = 0) -> List[str]:
-    """Разбивает текст на чанки с возможным перекрытием по символам."""
-    words = text.split()
-    chunks: List[str] = []
-    start = 0
-    n = len(words)
-    if n == 0:
-        return [text]
-
-    while start < n:
-        end = start
-        length = 0
-        while end < n and length + len(words[end]) + 1 <= max_len:
-            length += len(words[end]) + 1
-            end += 1
-        if end == start:  # слово длиннее max_len — минимальный прогон
-            end = start + 1
-        chunk = " ".join(words[start:end])
-        chunks.append(chunk)
-        if end >= n:
-            break
-        if overlap <= 0:
-            start = end
-        else:
-            # рассчитываем новый старт так, чтобы перекрытие по символам было ~overlap
-            overlap_chars = 0
-            new_start = end
-            while new_start > 0 and overlap_chars < overlap and new_start - 1 >= 0:
-                new_start -= 1
-                overlap_chars += len(words[new_start]) + 1
-            start = new_start
-    return chunks or [text]
-
-
-def _build_sections_from_pages(pages: Sequence[str], chunk_size: int, chunk_overlap: int) -> tuple[List[dict], List[tuple[str, str]]]:
-    """Возвращает секции и список (chunk_id, chunk_text)."""
+
+def _timing_summary(values_ms: Sequence[int]) -> dict:
+    """Сводка по временам страниц для лога job: полный список на тысячи страниц туда не пишется."""
+    ordered = sorted(values_ms)
+    slowest = max(range(len(values_ms)), key=values_ms.__getitem__)
+    return {
+        "count": len(ordered),
+        "p50": ordered[(len(ordered) - 1) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+        "slowest_page": slowest + 1,
+    }
+
+
+def _build_sections(
+    drafts: Sequence[SectionDraft],
+    chunker: TokenChunker,
+    start_index: int = 1,
+    page_chunk_counts: Dict[int, int] | None = None,
+) -> tuple[List[dict], List[tuple[str, str]]]:
+    """Возвращает секции и список (chunk_id, chunk_text).
+
+    Чанки режутся по страницам внутри секции и сохраняют id вида ``chunk_<page>_<n>``:
+    по нему vector store и chunk window восстанавливают порядок. ``page_chunk_counts``
+    продолжает нумерацию, если страница разделена между секциями.
+    """
+    counts = page_chunk_counts if page_chunk_counts is not None else {}
     sections: List[dict] = []
     chunks: List[tuple[str, str]] = []
-    for idx, page_text in enumerate(pages, start=1):
-        section_id = f"sec_{idx}"
-        page_chunks = _split_chunks(page_text, max_len=chunk_size, overlap=chunk_overlap)
+    for idx, draft in enumerate(drafts, start=start_index):
         chunk_ids = []
-        for c_idx, chunk_text in enumerate(page_chunks, start=1):
-            cid = f"chunk_{idx}_{c_idx}"
-            chunk_ids.append(cid)
-            chunks.append((cid, chunk_text))
+        for page, part_text in draft.parts:
+            for chunk_text in chunker.split(part_text):
+                counts[page] = counts.get(page, 0) + 1
+                cid = f"chunk_{page}_{counts[page]}"
+                chunk_ids.append(cid)
+                chunks.append((cid, chunk_text))
+        text = draft.text
         sections.append(
             {
-                "section_id": section_id,
-                "title": f"Page {idx}",
-                "page_start": idx,
-                "page_end": idx,
+                "section_id": f"sec_{idx}",
+                "title": draft.display_title(),
+                "page_start": draft.page_start,
+                "page_end": draft.page_end,
                 "chunk_ids": chunk_ids,
-                "summary": page_text[:200],
+                "summary": text[:200],
                 "storage_path": None,
-                "text": page_text,
+                "text": text,
             }
         )
     return sections, chunks
 
 
+def _batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    batch: List[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _timed_pages(pages: Iterable[str], stages, stage: str) -> Iterator[str]:
+    """Учитывает время извлечения страниц ленивого парсера в стадии ``stage``."""
+    iterator = iter(pages)
+    while True:
+        started = time.perf_counter()
+        try:
+            page = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            stages.add(stage, time.perf_counter() - started)
+        yield page
+
+
 def process_file(
     *,
     ticket: IngestionTicket,
@@ -96,8 +116,25 @@ def process_file(
     product: str | None = None,
     version: str | None = None,
     tags: str | list[str] | None = None,
+    page_batch_size: int = 16,
+    doc_embedding_max_chars: int = 32000,
+    parse_workers: int = 0,
+    parse_shard_pages: int = 32,
+    parse_pool: Executor | None = None,
+    section_min_chars: int = 400,
+    section_max_chars: int = 8000,
+    tokenizer_name: str | None = None,
+    profiler: StageProfiler | None = None,
+    http_client: httpx.Client | None = None,
 ) -> bool:
+    """Потоковый пайплайн: страницы из парсера режутся на секции по структуре документа,
+    секции пачками по ``page_batch_size`` идут сразу в чанкование, эмбеддинги, summary
+    и vector store. Тексты и эмбеддинги живут только в пределах пачки; до финального вызова
+    Document Service копятся лишь метаданные секций (id, заголовок, страницы, summary).
+    При ошибке записанные в vector store секции и чанки документа удаляются."""
     start_time = time.perf_counter()
+    profiler = profiler or get_profiler()
+    stages = profiler.accumulate()
     tags_list: list[str] = []
     if tags:
         if isinstance(tags, str):
@@ -105,6 +142,8 @@ def process_file(
         elif isinstance(tags, (list, tuple, set)):
             tags_list = [str(t).strip() for t in tags if str(t).strip()]
     tags_value = ", ".join(tags_list) if tags_list else None
+    extra_meta = {k: v for k, v in {"product": product, "version": version, "tags": tags_value}.items() if v is not None}
+    model = embedding.settings.embedding_model if hasattr(embedding, "settings") else None
     logger.info(
         "ingestion_process_started",
         job_id=ticket.job_id,
@@ -112,64 +151,163 @@ def process_file(
         tenant_id=ticket.tenant_id,
         storage_uri=ticket.storage_uri,
     )
-    tmp_file: Path | None = None
+    resources = ExitStack()
+    # записи лога job копятся и уходят в Redis одним pipeline на границах стадий
+    job_log = jobs.log_buffer(ticket.job_id)
+    written_sections: List[str] = []
+    written_chunks: List[str] = []
     try:
-        content_bytes = storage.download_bytes(ticket.storage_uri or "")
-        tmp_path = storage.resolve_local_path(ticket.storage_uri or "") if ticket.storage_uri else None
-        # Для S3/remote URI пишем во временный файл, чтобы парсер (PyPDF2/docx) корректно работал.
-        if not tmp_path or not tmp_path.exists():
-            parsed = urlparse(ticket.storage_uri or "")
-            suffix = Path(parsed.path).suffix or ".bin"
-            fh = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-            fh.write(content_bytes)
-            fh.flush()
-            fh.close()
-            tmp_path = Path(fh.name)
-            tmp_file = tmp_path
-
-        parser = DocumentParser(max_pages=max_pages, max_file_mb=max_file_mb)
-        text = DocumentParser._clean_text(content_bytes.decode("utf-8", errors="ignore"))
-        if tmp_path and tmp_path.exists():
-            pages, meta = parser.parse(tmp_path)
-            text = "\n".join(pages)
-        else:
-            pages = [text]
-            meta = {"pages": len(pages), "title": "unknown"}
+        with profiler.span("download"):
+            # локальный файл парсится на месте, S3-объект потоково пишется во временный файл
+            local_path = resources.enter_context(storage.materialize(ticket.storage_uri or ""))
+
+        parser = DocumentParser(
+            max_pages=max_pages, max_file_mb=max_file_mb, workers=parse_workers, shard_pages=parse_shard_pages, pool=parse_pool
+        )
+        with stages.span("parse"):
+            page_iter, meta = parser.stream(local_path)
+
+        doc_text_parts: List[str] = []
+        doc_text_len = 0
+        sections_payload: List[dict] = []
+        section_keys: set[str] = set()
+        page_chunk_counts: Dict[int, int] = {}
+        pages_seen = 0
+        chunks_total = 0
+        dimensions = {"sections": 0, "chunks": 0}
+        # Для логов job храним только первую пачку входов, иначе они растут вместе с документом.
+        first_section_texts: List[str] | None = None
+        first_chunk_texts: List[str] | None = None
+        first_summary_requests: List[dict] | None = None
+        first_summary_responses: List[dict] | None = None
+        summary_fallback = False
+
+        def pages_stream() -> Iterator[str]:
+            nonlocal pages_seen, doc_text_len
+            for page_text in _timed_pages(page_iter, stages, "parse"):
+                pages_seen += 1
+                if doc_text_len < doc_embedding_max_chars:
+                    part = page_text[: doc_embedding_max_chars - doc_text_len]
+                    doc_text_parts.append(part)
+                    doc_text_len += len(part) + 1
+                yield page_text
+
+        chunker = TokenChunker(chunk_size, chunk_overlap, tokenizer=load_tokenizer(tokenizer_name))
+        segmenter = StructureSegmenter(
+            outline=meta.get("outline"),
+            min_section_chars=section_min_chars,
+            max_section_chars=section_max_chars,
+        )
+        for batch in _batched(segmenter.segment(pages_stream()), max(1, page_batch_size)):
+            with stages.span("chunk"):
+                sections, chunk_pairs = _build_sections(
+                    batch,
+                    chunker,
+                    start_index=len(sections_payload) + 1,
+                    page_chunk_counts=page_chunk_counts,
+                )
+                chunk_texts = [c[1] for c in chunk_pairs]
+            section_texts = [s["text"] for s in sections]
+
+            with stages.span("embed"):
+                section_embeddings = embedding.embed(section_texts)
+                chunk_embeddings = embedding.embed(chunk_texts) if chunk_texts else []
+            if section_embeddings and not dimensions["sections"]:
+                dimensions["sections"] = len(section_embeddings[0])
+            if chunk_embeddings and not dimensions["chunks"]:
+                dimensions["chunks"] = len(chunk_embeddings[0])
+            chunks_total += len(chunk_embeddings)
+
+            # LLM summary для секций
+            try:
+                with stages.span("summarize"):
+                    section_summaries = summarizer.summarize(section_texts)
+            except Exception:
+                summary_fallback = True
+                section_summaries = [DocumentParser._clean_text(text)[:200] for text in section_texts]
+
+            if first_section_texts is None:
+                first_section_texts = section_texts
+                first_chunk_texts = chunk_texts
+                first_summary_requests = [{"section_id": sec["section_id"], "prompt": sec["text"][:4000]} for sec in sections]
+                first_summary_responses = [
+                    {"section_id": sec["section_id"], "summary": summary} for sec, summary in zip(sections, section_summaries)
+                ]
+
+            batch_payload = []
+            for sec, summary in zip(sections, section_summaries):
+                payload = {
+                    "section_id": sec["section_id"],
+                    "title": sec["title"],
+                    "page_start": sec["page_start"],
+                    "page_end": sec["page_end"],
+                    "chunk_ids": sec["chunk_ids"],
+                    "summary": summary,
+                    "storage_path": sec["storage_path"],
+                }
+                batch_payload.append(payload)
+            # до конца документа копятся только метаданные секций для Document Service, без эмбеддингов
+            sections_payload.extend(batch_payload)
+
+            # vector store запись секций и чанков текущей пачки
+            if vector_store:
+                with stages.span("upsert"):
+                    # product/version/tags нужны только фильтрам Chroma, в payload Document Service не попадают
+                    section_metas = [{**payload, **extra_meta} for payload in batch_payload]
+                    for section_meta in section_metas:
+                        section_keys.update(section_meta.keys())
+                    written_sections.extend(payload["section_id"] for payload in batch_payload)
+                    vector_store.upsert_sections(ticket.doc_id, ticket.tenant_id, section_embeddings, section_metas)
+                    if chunk_embeddings:
+                        written_chunks.extend(chunk_id for chunk_id, _ in chunk_pairs)
+                        vector_store.upsert_chunks(ticket.doc_id, ticket.tenant_id, chunk_embeddings, chunk_pairs, extra_meta=extra_meta or None)
+
+        page_timings = meta.get("page_timings") or []
+        for seconds in page_timings:
+            profiler.observe("parse_page", seconds)
+        page_ms = [int(seconds * 1000) for seconds in page_timings]
         logger.debug(
             "ingestion_parsed",
             doc_id=ticket.doc_id,
             tenant_id=ticket.tenant_id,
-            pages=len(pages),
+            pages=pages_seen,
             chunk_size=chunk_size,
+            parse_workers=parse_workers,
+            page_ms_max=max(page_ms) if page_ms else None,
         )
+        if page_ms:
+            job_log.append(
+                {
+                    "type": "parse",
+                    "pages": pages_seen,
+                    "workers": parse_workers,
+                    "page_ms": _timing_summary(page_ms),
+                },
+            )
+            job_log.flush()
 
-        sections, chunk_pairs = _build_sections_from_pages(pages, chunk_size, chunk_overlap)
-        chunk_texts = [c[1] for c in chunk_pairs]
-
-        # Embeddings: документ, секции, чанки
-        doc_embedding = embedding.embed([text])[0]
-        section_embeddings = embedding.embed([s["text"] for s in sections])
-        chunk_embeddings = embedding.embed(chunk_texts) if chunk_texts else []
+        text = "\n".join(doc_text_parts)[:doc_embedding_max_chars]
+        with stages.span("embed"):
+            doc_embedding = embedding.embed([text])[0]
         logger.debug(
             "ingestion_embeddings_ready",
             doc_id=ticket.doc_id,
             tenant_id=ticket.tenant_id,
-            sections=len(sections),
-            chunks=len(chunk_pairs),
+            sections=len(sections_payload),
+            chunks=chunks_total,
         )
         log_entry = {
             "type": "embedding",
             "stage": "document",
-            "model": embedding.settings.embedding_model if hasattr(embedding, "settings") else None,
+            "model": model,
             "items": 1,
             "dimensions": len(doc_embedding) if doc_embedding else 0,
             "status": "ok",
         }
-        jobs.append_log(ticket.job_id, log_entry)
+        job_log.append(log_entry)
         logger.info("model_call", job_id=ticket.job_id, doc_id=ticket.doc_id, tenant_id=ticket.tenant_id, **log_entry)
 
-        jobs.append_log(
-            ticket.job_id,
+        job_log.append(
             {
                 "type": "embedding_payload",
                 "stage": "document",
@@ -180,163 +318,131 @@ def process_file(
         log_entry = {
             "type": "embedding",
             "stage": "sections",
-            "model": embedding.settings.embedding_model if hasattr(embedding, "settings") else None,
-            "items": len(sections),
-            "dimensions": len(section_embeddings[0]) if section_embeddings else 0,
+            "model": model,
+            "items": len(sections_payload),
+            "dimensions": dimensions["sections"],
             "status": "ok",
         }
-        jobs.append_log(ticket.job_id, log_entry)
+        job_log.append(log_entry)
         logger.info("model_call", job_id=ticket.job_id, doc_id=ticket.doc_id, tenant_id=ticket.tenant_id, **log_entry)
-        jobs.append_log(
-            ticket.job_id,
+        job_log.append(
             {
                 "type": "embedding_payload",
                 "stage": "sections",
-                "input": [s["text"] for s in sections],
+                "input": first_section_texts or [],
+                "items": len(sections_payload),
             },
         )
-        if chunk_embeddings:
+        if chunks_total:
             log_entry = {
                 "type": "embedding",
                 "stage": "chunks",
-                "model": embedding.settings.embedding_model if hasattr(embedding, "settings") else None,
-                "items": len(chunk_embeddings),
-                "dimensions": len(chunk_embeddings[0]) if chunk_embeddings else 0,
+                "model": model,
+                "items": chunks_total,
+                "dimensions": dimensions["chunks"],
                 "status": "ok",
             }
-            jobs.append_log(ticket.job_id, log_entry)
+            job_log.append(log_entry)
             logger.info("model_call", job_id=ticket.job_id, doc_id=ticket.doc_id, tenant_id=ticket.tenant_id, **log_entry)
-            jobs.append_log(
-                ticket.job_id,
+            job_log.append(
                 {
                     "type": "embedding_payload",
                     "stage": "chunks",
-                    "input": chunk_texts,
+                    "input": first_chunk_texts or [],
+                    "items": chunks_total,
                 },
             )
 
-        # LLM summary для секций
-        try:
-            section_summaries = summarizer.summarize([s["text"] for s in sections])
+        if not summary_fallback:
             log_entry = {
                 "type": "summary",
                 "stage": "sections",
                 "model": getattr(summarizer, "model", None),
-                "items": len(section_summaries),
+                "items": len(sections_payload),
                 "status": "ok",
-                "preview": [s[:200] for s in section_summaries[:3]],
+                "preview": [s["summary"][:200] for s in sections_payload[:3]],
             }
-            jobs.append_log(ticket.job_id, log_entry)
+            job_log.append(log_entry)
             logger.info("model_call", job_id=ticket.job_id, doc_id=ticket.doc_id, tenant_id=ticket.tenant_id, **log_entry)
-            jobs.append_log(
-                ticket.job_id,
+            job_log.append(
                 {
                     "type": "summary_payload",
                     "stage": "sections",
                     "system_prompt": getattr(summarizer, "system_prompt", None),
-                    "requests": [{"section_id": sec["section_id"], "prompt": sec["text"][:4000]} for sec in sections],
-                    "responses": [
-                        {"section_id": sec["section_id"], "summary": summary}
-                        for sec, summary in zip(sections, section_summaries)
-                    ],
+                    "requests": first_summary_requests or [],
+                    "responses": first_summary_responses or [],
                 },
             )
-        except Exception:
+        else:
             log_entry = {
                 "type": "summary",
                 "stage": "sections",
                 "model": getattr(summarizer, "model", None),
-                "items": len(sections),
+                "items": len(sections_payload),
                 "status": "fallback",
             }
-            jobs.append_log(ticket.job_id, log_entry)
+            job_log.append(log_entry)
             logger.info("model_call", job_id=ticket.job_id, doc_id=ticket.doc_id, tenant_id=ticket.tenant_id, **log_entry)
-            section_summaries = [DocumentParser._clean_text(s["text"])[:200] for s in sections]
-
-        sections_payload = []
-        for sec, emb, summary in zip(sections, section_embeddings, section_summaries):
-            payload = {
-                "section_id": sec["section_id"],
-                "title": sec["title"],
-                "page_start": sec["page_start"],
-                "page_end": sec["page_end"],
-                "chunk_ids": sec["chunk_ids"],
-                "summary": summary,
-                "storage_path": sec["storage_path"],
-            }
-            payload["embedding"] = emb  # можно игнорировать на стороне Document Service
-            sections_payload.append(payload)
+        job_log.flush()
 
-        if doc_service_base_url:
-            try:
-                with httpx.Client(timeout=10.0) as client:
-                    client.post(
-                        f"{doc_service_base_url}/internal/documents/{ticket.doc_id}/sections",
-                        json={"sections": sections_payload},
-                        headers={"X-Tenant-ID": ticket.tenant_id},
-                    )
-                    client.post(
-                        f"{doc_service_base_url}/internal/documents/status",
-                        json={
-                            "doc_id": ticket.doc_id,
-                            "status": "indexed",
-                            "storage_uri": ticket.storage_uri,
-                            "pages": meta.get("pages", len(pages)),
-                        },
-                        headers={"X-Tenant-ID": ticket.tenant_id},
+        with stages.span("upsert"):
+            if doc_service_base_url:
+                try:
+                    with nullcontext(http_client) if http_client is not None else httpx.Client(timeout=10.0) as client:
+                        client.post(
+                            f"{doc_service_base_url}/internal/documents/{ticket.doc_id}/sections",
+                            json={"sections": sections_payload},
+                            params={"return_detail": "false"},
+                            headers={"X-Tenant-ID": ticket.tenant_id},
+                            timeout=10.0,
+                        )
+                        client.post(
+                            f"{doc_service_base_url}/internal/documents/status",
+                            json={
+                                "doc_id": ticket.doc_id,
+                                "status": "indexed",
+                                "storage_uri": ticket.storage_uri,
+                                "pages": meta.get("pages", pages_seen),
+                            },
+                            headers={"X-Tenant-ID": ticket.tenant_id},
+                            timeout=10.0,
+                        )
+                    logger.debug(
+                        "ingestion_document_service_updated",
+                        doc_id=ticket.doc_id,
+                        tenant_id=ticket.tenant_id,
+                        sections=len(sections_payload),
                     )
+                except Exception:
+                    logger.exception("ingestion_document_service_update_failed", doc_id=ticket.doc_id, tenant_id=ticket.tenant_id)
+
+            # vector store запись документа (секции и чанки уже записаны по пачкам)
+            if vector_store:
+                doc_title = meta.get("title") or ticket.doc_id
+                doc_metadata = {"title": doc_title}
+                if product:
+                    doc_metadata["product"] = product
+                if version:
+                    doc_metadata["version"] = version
+                if tags_value:
+                    doc_metadata["tags"] = tags_value
+                vector_store.upsert_document(
+                    ticket.doc_id,
+                    ticket.tenant_id,
+                    doc_embedding,
+                    doc_metadata,
+                )
+                chunk_keys = ["tenant_id", "doc_id", "chunk_id", "text", "page", "chunk_index"] + list(extra_meta.keys())
                 logger.debug(
-                    "ingestion_document_service_updated",
+                    "ingestion_vectorstore_upserted",
                     doc_id=ticket.doc_id,
                     tenant_id=ticket.tenant_id,
                     sections=len(sections_payload),
+                    chunks=chunks_total,
+                    doc_meta_keys=list(doc_metadata.keys()),
+                    section_meta_keys=sorted(section_keys) if section_keys else None,
+                    chunk_meta_keys=chunk_keys,
                 )
-            except Exception:
-                logger.exception("ingestion_document_service_update_failed", doc_id=ticket.doc_id, tenant_id=ticket.tenant_id)
-
-        # vector store запись
-        if vector_store:
-            doc_title = meta.get("title") or ticket.doc_id
-            doc_metadata = {"title": doc_title}
-            if product:
-                doc_metadata["product"] = product
-            if version:
-                doc_metadata["version"] = version
-            if tags_value:
-                doc_metadata["tags"] = tags_value
-            vector_store.upsert_document(
-                ticket.doc_id,
-                ticket.tenant_id,
-                doc_embedding,
-                doc_metadata,
-            )
-            # Enrich section metadata to keep filters working inside Chroma
-            section_keys = set()
-            for payload in sections_payload:
-                if product:
-                    payload["product"] = product
-                if version:
-                    payload["version"] = version
-                if tags_value:
-                    payload["tags"] = tags_value
-                section_keys.update(k for k in payload.keys() if k != "embedding")
-            vector_store.upsert_sections(ticket.doc_id, ticket.tenant_id, section_embeddings, sections_payload)
-            if chunk_embeddings:
-                extra_meta = {k: v for k, v in {"product": product, "version": version, "tags": tags_value}.items() if v is not None}
-                vector_store.upsert_chunks(ticket.doc_id, ticket.tenant_id, chunk_embeddings, chunk_pairs, extra_meta=extra_meta or None)
-                chunk_keys = ["tenant_id", "doc_id", "chunk_id", "text", "page", "chunk_index"] + list(extra_meta.keys()) if extra_meta else ["tenant_id", "doc_id", "chunk_id", "text", "page", "chunk_index"]
-            else:
-                chunk_keys = ["tenant_id", "doc_id", "chunk_id", "text", "page", "chunk_index"]
-            logger.debug(
-                "ingestion_vectorstore_upserted",
-                doc_id=ticket.doc_id,
-                tenant_id=ticket.tenant_id,
-                sections=len(sections_payload),
-                chunks=len(chunk_pairs),
-                doc_meta_keys=list(doc_metadata.keys()),
-                section_meta_keys=sorted(section_keys) if section_keys else None,
-                chunk_meta_keys=chunk_keys,
-            )
 
         jobs.update(ticket.job_id, status="indexed", storage_uri=ticket.storage_uri)
         jobs.publish_event(
@@ -344,23 +450,31 @@ def process_file(
                 "event": "document_ingested",
                 "doc_id": ticket.doc_id,
                 "tenant_id": ticket.tenant_id,
-                "sections": len(sections),
-                "chunks": len(chunk_texts),
+                "sections": len(sections_payload),
+                "chunks": chunks_total,
             }
         )
+        stages.flush()
+        duration = time.perf_counter() - start_time
+        profiler.observe("total", duration)
         logger.info(
             "ingestion_process_finished",
             job_id=ticket.job_id,
             doc_id=ticket.doc_id,
             tenant_id=ticket.tenant_id,
             status="indexed",
-            pages=len(pages),
-            sections=len(sections),
-            chunks=len(chunk_texts),
-            duration_ms=int((time.perf_counter() - start_time) * 1000),
+            pages=pages_seen,
+            sections=len(sections_payload),
+            chunks=chunks_total,
+            duration_ms=int(duration * 1000),
         )
         return True
-    except Exception as exc:  # pragma: no cover
+    except Exception as exc:
+        if vector_store and (written_sections or written_chunks):
+            try:
+                vector_store.delete(ticket.doc_id, section_ids=written_sections, chunk_ids=written_chunks)
+            except Exception:
+                logger.warning("ingestion_vectorstore_cleanup_failed", doc_id=ticket.doc_id, tenant_id=ticket.tenant_id)
         jobs.update(ticket.job_id, status="failed", error=str(exc))
         jobs.publish_event({"event": "ingestion_failed", "doc_id": ticket.doc_id, "tenant_id": ticket.tenant_id, "error": str(exc)})
         logger.exception(
@@ -372,8 +486,11 @@ def process_file(
         )
         return False
     finally:
-        if tmp_file and tmp_file.exists():
-            try:
-                tmp_file.unlink()
-            except OSError:
-                pass
+        try:
+            job_log.flush()
+        except Exception:
+            logger.warning("ingestion_job_log_flush_failed", job_id=ticket.job_id)
+        try:
+            resources.close()
+        except OSError:
+            pass
@@ -2,10 +2,23 @@ from __future__ import annotations
 
 import asyncio
 import json
-from dataclasses import dataclass
-from typing import Any, Optional
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
 
+import structlog
 from redis import asyncio as aioredis  # type: ignore
+from redis.exceptions import ResponseError, WatchError  # type: ignore
+
+logger = structlog.get_logger(__name__)
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BULK = "bulk"
+DEFAULT_PRIORITY_WEIGHTS: Mapping[str, int] = {PRIORITY_INTERACTIVE: 4, PRIORITY_BULK: 1}
 
 
 @dataclass
@@ -18,35 +31,395 @@ class WorkItem:
     version: Optional[str] = None
     tags: Optional[str] = None
     attempt: int = 1
+    priority: str = PRIORITY_INTERACTIVE
+    # id сообщения в stream, выставляется при выдаче воркеру (для ack/retry)
+    receipt: Optional[str] = field(default=None, compare=False, repr=False)
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data.pop("receipt", None)
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, payload: Any, receipt: Optional[str] = None) -> "WorkItem":
+        decoded = payload.decode() if isinstance(payload, (bytes, bytearray)) else payload
+        data: dict[str, Any] = json.loads(decoded)
+        data.pop("receipt", None)
+        return cls(**data, receipt=receipt)
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, (bytes, bytearray)) else str(value)
 
 
 class IngestionQueue:
-    def __init__(self, redis_url: Optional[str], queue_name: str = "ingestion_queue") -> None:
+    """Надёжная очередь на Redis Streams с consumer group и справедливым планированием.
+
+    ``enqueue`` кладёт элемент в список ожидания своего класса приоритета и тенанта
+    (``<queue>:pending:<priority>:<tenant>``). ``pop`` выбирает класс взвешенным round-robin
+    (``priority_weights``), внутри класса — следующего тенанта из кольца активных тенантов
+    (тенант с весом ``w`` занимает ``w`` позиций в кольце) и переносит ровно один элемент
+    в stream. Поэтому тенант с тысячами документов не блокирует одиночные загрузки других.
+
+    Выданное воркеру сообщение остаётся в PEL до ``ack``; если воркер упал и не продлевал
+    аренду дольше ``visibility_timeout`` секунд, сообщение забирает другой воркер (XAUTOCLAIM).
+    Повторы откладываются в sorted set ``<queue>:delayed`` (score — время готовности) и не
+    блокируют воркер; исчерпавшие попытки элементы уходят в stream ``<queue>:dead``.
+    Без Redis работает in-memory очередь с тем же планированием.
+    """
+
+    group = "ingestion_workers"
+
+    def __init__(
+        self,
+        redis_url: Optional[str],
+        queue_name: str = "ingestion_queue",
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 3,
+        dead_letter_maxlen: int = 10000,
+        priority_weights: Mapping[str, int] | None = None,
+        tenant_weights: Mapping[str, int] | None = None,
+        poll_interval: float = 0.5,
+    ) -> None:
         self.queue_name = queue_name
+        self.stream = f"{queue_name}:stream"
+        self.delayed_key = f"{queue_name}:delayed"
+        self.dead_stream = f"{queue_name}:dead"
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.dead_letter_maxlen = dead_letter_maxlen
+        weights = {name: int(w) for name, w in (priority_weights or DEFAULT_PRIORITY_WEIGHTS).items() if int(w) > 0}
+        self.priority_weights: Dict[str, int] = weights or dict(DEFAULT_PRIORITY_WEIGHTS)
+        self.tenant_weights: Dict[str, int] = {tenant: max(1, int(w)) for tenant, w in (tenant_weights or {}).items()}
+        self.poll_interval = poll_interval
+        # классы в порядке убывания веса и расписание взвешенного round-robin по ним
+        self._classes = sorted(self.priority_weights, key=lambda name: -self.priority_weights[name])
+        self._schedule = [name for name in self._classes for _ in range(self.priority_weights[name])]
+        self._memory_seq = 0
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
         self._redis = aioredis.from_url(redis_url) if redis_url else None
-        self._memory_queue: asyncio.Queue[WorkItem] = asyncio.Queue()
+        self._group_ready = False
+        self._memory_pending: Dict[Tuple[str, str], Deque[WorkItem]] = {}
+        self._memory_rings: Dict[str, Deque[str]] = {name: deque() for name in self._classes}
+        self._memory_ready = asyncio.Event()
+        self._memory_dead: List[dict] = []
 
     @property
     def enabled(self) -> bool:
         return True
 
-    async def enqueue(self, item: WorkItem) -> None:
+    async def _ensure_group(self) -> None:
+        if self._group_ready or not self._redis:
+            return
+        try:
+            await self._redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        # элементы, оставшиеся в старой FIFO-очереди (BLPOP), переносим в stream
+        while True:
+            payload = await self._redis.lpop(self.queue_name)
+            if payload is None:
+                break
+            await self._redis.xadd(self.stream, {"payload": payload})
+        self._group_ready = True
+
+    def validate_priority(self, priority: str) -> str:
+        if priority not in self.priority_weights:
+            raise ValueError(f"unknown priority {priority!r}, expected one of {sorted(self.priority_weights)}")
+        return priority
+
+    def _tenant_weight(self, tenant_id: str) -> int:
+        return self.tenant_weights.get(tenant_id, 1)
+
+    def _pending_key(self, priority: str, tenant_id: str) -> str:
+        return f"{self.queue_name}:pending:{priority}:{tenant_id}"
+
+    def _ring_key(self, priority: str) -> str:
+        return f"{self.queue_name}:ring:{priority}"
+
+    def _active_key(self, priority: str) -> str:
+        return f"{self.queue_name}:active:{priority}"
+
+    def _class_order(self, seq: int) -> List[str]:
+        first = self._schedule[seq % len(self._schedule)]
+        return [first] + [name for name in self._classes if name != first]
+
+    async def enqueue(self, item: WorkItem, delay: float = 0.0) -> None:
+        if item.priority not in self.priority_weights:
+            item.priority = self._classes[0]
         if self._redis:
-            payload = json.dumps(item.__dict__)
-            await self._redis.rpush(self.queue_name, payload)
+            await self._ensure_group()
+            if delay > 0:
+                await self._redis.zadd(self.delayed_key, {item.to_json(): time.time() + delay})
+                return
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.rpush(self._pending_key(item.priority, item.tenant_id), item.to_json())
+                pipe.sadd(self._active_key(item.priority), item.tenant_id)
+                _, added = await pipe.execute()
+            if added:
+                # тенант стал активным — занимает ``weight`` позиций в кольце своего класса
+                await self._redis.rpush(self._ring_key(item.priority), *([item.tenant_id] * self._tenant_weight(item.tenant_id)))
+            return
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._memory_put, item)
+        else:
+            self._memory_put(item)
+
+    async def enqueue_many(self, items: List[WorkItem]) -> None:
+        """Ставит пачку элементов в очередь одним pipeline (batch upload)."""
+        for item in items:
+            if item.priority not in self.priority_weights:
+                item.priority = self._classes[0]
+        if not self._redis:
+            for item in items:
+                self._memory_put(item)
             return
-        await self._memory_queue.put(item)
+        if not items:
+            return
+        await self._ensure_group()
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for item in items:
+                pipe.rpush(self._pending_key(item.priority, item.tenant_id), item.to_json())
+            activations = list(dict.fromkeys((item.priority, item.tenant_id) for item in items))
+            for priority, tenant_id in activations:
+                pipe.sadd(self._active_key(priority), tenant_id)
+            results = await pipe.execute()
+        added = results[len(items):]
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for (priority, tenant_id), was_added in zip(activations, added):
+                if was_added:
+                    pipe.rpush(self._ring_key(priority), *([tenant_id] * self._tenant_weight(tenant_id)))
+            await pipe.execute()
+
+    def _memory_put(self, item: WorkItem) -> None:
+        key = (item.priority, item.tenant_id)
+        pending = self._memory_pending.get(key)
+        if pending is None:
+            pending = self._memory_pending[key] = deque()
+            self._memory_rings[item.priority].extend([item.tenant_id] * self._tenant_weight(item.tenant_id))
+        pending.append(item)
+        self._memory_ready.set()
+
+    def _memory_next(self) -> Optional[WorkItem]:
+        order = self._class_order(self._memory_seq)
+        self._memory_seq += 1
+        for priority in order:
+            ring = self._memory_rings[priority]
+            while ring:
+                tenant_id = ring[0]
+                ring.rotate(-1)
+                pending = self._memory_pending.get((priority, tenant_id))
+                if pending:
+                    item = pending.popleft()
+                    if not pending:
+                        del self._memory_pending[(priority, tenant_id)]
+                        self._memory_rings[priority] = deque(t for t in ring if t != tenant_id)
+                    return item
+                self._memory_rings[priority] = ring = deque(t for t in ring if t != tenant_id)
+        return None
+
+    async def _move_one(self, priority: str, tenant_id: str) -> Optional[bool]:
+        """Переносит голову списка тенанта в stream. None — список пуст."""
+        assert self._redis is not None
+        key = self._pending_key(priority, tenant_id)
+        for _ in range(3):
+            async with self._redis.pipeline(transaction=True) as pipe:
+                try:
+                    await pipe.watch(key)
+                    payload = await pipe.lindex(key, 0)
+                    if payload is None:
+                        pipe.multi()
+                        pipe.srem(self._active_key(priority), tenant_id)
+                        pipe.lrem(self._ring_key(priority), 0, tenant_id)
+                        await pipe.execute()
+                        return None
+                    pipe.multi()
+                    pipe.lpop(key)
+                    pipe.xadd(self.stream, {"payload": payload})
+                    await pipe.execute()
+                    return True
+                except WatchError:
+                    continue
+        return False
+
+    async def _dispatch(self) -> bool:
+        """Переносит в stream один элемент следующего по расписанию класса и тенанта."""
+        assert self._redis is not None
+        seq = await self._redis.incr(f"{self.queue_name}:dispatch_seq")
+        for priority in self._class_order(seq):
+            ring = self._ring_key(priority)
+            for _ in range(await self._redis.llen(ring)):
+                tenant = await self._redis.lmove(ring, ring, "LEFT", "RIGHT")
+                if tenant is None:
+                    break
+                moved = await self._move_one(priority, _decode(tenant))
+                if moved:
+                    return True
+        return False
+
+    async def _promote_due(self, limit: int = 100) -> int:
+        """Переносит отложенные повторы, чьё время пришло, в stream."""
+        assert self._redis is not None
+        promoted = 0
+        due = await self._redis.zrangebyscore(self.delayed_key, "-inf", time.time(), start=0, num=limit)
+        for payload in due:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                try:
+                    await pipe.watch(self.delayed_key)
+                    if await pipe.zscore(self.delayed_key, payload) is None:
+                        continue  # уже забрал другой воркер
+                    pipe.multi()
+                    pipe.zrem(self.delayed_key, payload)
+                    pipe.xadd(self.stream, {"payload": payload})
+                    await pipe.execute()
+                    promoted += 1
+                except WatchError:
+                    continue
+        return promoted
+
+    async def _claim_stale(self) -> Optional[WorkItem]:
+        """Забирает сообщение, чья аренда истекла (воркер упал или завис)."""
+        assert self._redis is not None
+        result = await self._redis.xautoclaim(
+            self.stream,
+            self.group,
+            self.consumer,
+            min_idle_time=int(self.visibility_timeout * 1000),
+            start_id="0-0",
+            count=1,
+        )
+        messages = result[1] if len(result) > 1 else []
+        for message_id, fields in messages:
+            if not fields:
+                continue
+            receipt = _decode(message_id)
+            item = WorkItem.from_json(fields.get(b"payload", fields.get("payload")), receipt)
+            pending = await self._redis.xpending_range(self.stream, self.group, min=receipt, max=receipt, count=1)
+            deliveries = pending[0]["times_delivered"] if pending else 2
+            # каждая истёкшая аренда считается неудачной попыткой
+            item.attempt += max(0, deliveries - 1)
+            logger.warning("ingestion_queue_reclaimed", job_id=item.job_id, attempt=item.attempt, consumer=self.consumer)
+            if item.attempt > self.max_attempts:
+                await self.dead_letter(item, reason="visibility_timeout")
+                continue
+            return item
+        return None
 
     async def pop(self, timeout: int = 5) -> Optional[WorkItem]:
+        deadline = time.monotonic() + timeout
         if self._redis:
-            result = await self._redis.blpop(self.queue_name, timeout=timeout)
-            if not result:
+            await self._ensure_group()
+            while True:
+                await self._promote_due()
+                item = await self._claim_stale()
+                if item:
+                    return item
+                dispatched = await self._dispatch()
+                remaining = deadline - time.monotonic()
+                block = 1 if dispatched else int(max(0.001, min(self.poll_interval, remaining)) * 1000)
+                result = await self._redis.xreadgroup(self.group, self.consumer, {self.stream: ">"}, count=1, block=block)
+                if result and result[0][1]:
+                    message_id, fields = result[0][1][0]
+                    payload = fields.get(b"payload", fields.get("payload"))
+                    return WorkItem.from_json(payload, _decode(message_id))
+                if time.monotonic() >= deadline:
+                    return None
+        while True:
+            item = self._memory_next()
+            if item:
+                return item
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 return None
-            _, payload = result
-            decoded = payload.decode() if isinstance(payload, (bytes, bytearray)) else payload
-            data: dict[str, Any] = json.loads(decoded)
-            return WorkItem(**data)
-        try:
-            return await asyncio.wait_for(self._memory_queue.get(), timeout=timeout)
-        except asyncio.TimeoutError:
-            return None
+            self._memory_ready.clear()
+            try:
+                await asyncio.wait_for(self._memory_ready.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return None
+
+    async def extend(self, item: WorkItem) -> None:
+        """Продлевает аренду: сбрасывает idle-время сообщения в PEL."""
+        if self._redis and item.receipt:
+            await self._redis.xclaim(self.stream, self.group, self.consumer, min_idle_time=0, message_ids=[item.receipt], justid=True)
+
+    async def ack(self, item: WorkItem) -> None:
+        if self._redis and item.receipt:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.xack(self.stream, self.group, item.receipt)
+                pipe.xdel(self.stream, item.receipt)
+                await pipe.execute()
+
+    async def retry(self, item: WorkItem, delay: float) -> None:
+        """Подтверждает текущую доставку и планирует следующую попытку через ``delay`` секунд."""
+        next_item = WorkItem(**{**asdict(item), "attempt": item.attempt + 1, "receipt": None})
+        if self._redis:
+            await self._ensure_group()
+            async with self._redis.pipeline(transaction=True) as pipe:
+                if item.receipt:
+                    pipe.xack(self.stream, self.group, item.receipt)
+                    pipe.xdel(self.stream, item.receipt)
+                pipe.zadd(self.delayed_key, {next_item.to_json(): time.time() + delay})
+                await pipe.execute()
+            return
+        await self.enqueue(next_item, delay=delay)
+
+    async def dead_letter(self, item: WorkItem, reason: str) -> None:
+        entry = {"payload": item.to_json(), "reason": reason, "failed_at": str(time.time())}
+        if self._redis:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.xadd(self.dead_stream, entry, maxlen=self.dead_letter_maxlen, approximate=True)
+                if item.receipt:
+                    pipe.xack(self.stream, self.group, item.receipt)
+                    pipe.xdel(self.stream, item.receipt)
+                await pipe.execute()
+        else:
+            self._memory_dead.append(entry)
+        logger.error("ingestion_queue_dead_lettered", job_id=item.job_id, attempt=item.attempt, reason=reason)
+
+    async def stats(self) -> dict:
+        """Глубина очереди по классам приоритета и тенантам, плюс in-flight/отложенные/DLQ."""
+        depths: List[dict] = []
+        if self._redis:
+            await self._ensure_group()
+            for priority in self._classes:
+                tenants = sorted(_decode(t) for t in await self._redis.smembers(self._active_key(priority)))
+                if not tenants:
+                    continue
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for tenant_id in tenants:
+                        pipe.llen(self._pending_key(priority, tenant_id))
+                    lengths = await pipe.execute()
+                depths.extend(
+                    {"priority": priority, "tenant_id": tenant_id, "depth": length}
+                    for tenant_id, length in zip(tenants, lengths)
+                    if length
+                )
+            pending = await self._redis.xpending(self.stream, self.group)
+            return {
+                "pending": depths,
+                "inflight": pending.get("pending", 0) if isinstance(pending, dict) else 0,
+                "delayed": await self._redis.zcard(self.delayed_key),
+                "dead": await self._redis.xlen(self.dead_stream),
+            }
+        for (priority, tenant_id), items in sorted(self._memory_pending.items()):
+            depths.append({"priority": priority, "tenant_id": tenant_id, "depth": len(items)})
+        return {"pending": depths, "inflight": 0, "delayed": 0, "dead": len(self._memory_dead)}
+
+    def render_prometheus(self, stats: dict, prefix: str = "ingestion_queue") -> str:
+        lines = [
+            f"# HELP {prefix}_depth Documents waiting in the ingestion queue.",
+            f"# TYPE {prefix}_depth gauge",
+        ]
+        for row in stats["pending"]:
+            lines.append(f'{prefix}_depth{{priority="{row["priority"]}",tenant_id="{row["tenant_id"]}"}} {row["depth"]}')
+        for state in ("inflight", "delayed", "dead"):
+            lines.append(f"# TYPE {prefix}_{state} gauge")
+            lines.append(f"{prefix}_{state} {stats[state]}")
+        return "\n".join(lines) + "\n"
+
+    async def dead_letters(self, limit: int = 50) -> List[dict]:
+        if self._redis:
+            raw = await self._redis.xrevrange(self.dead_stream, count=limit)
+            return [{_decode(k): _decode(v) for k, v in fields.items()} | {"id": _decode(message_id)} for message_id, fields in raw]
+        return list(reversed(self._memory_dead[-limit:]))
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# "3 Установка", "2.1. Настройка LDAP", "4.2.1 Параметры" — короткая строка без завершающей пунктуации
+NUMBERED_HEADING_RE = re.compile(r"^(\d{1,2}(?:\.\d{1,2}){0,3})\.?\s+(\S.{0,118})$")
+
+
+def _normalize(line: str) -> str:
+    return " ".join(line.split()).casefold()
+
+
+@dataclass
+class SectionDraft:
+    """Секция переменного размера: заголовок и куски текста с привязкой к страницам."""
+
+    title: Optional[str]
+    parts: List[Tuple[int, str]] = field(default_factory=list)
+
+    def add(self, page: int, text: str) -> None:
+        if not text.strip():
+            return
+        if self.parts and self.parts[-1][0] == page:
+            self.parts[-1] = (page, self.parts[-1][1] + "\n" + text)
+        else:
+            self.parts.append((page, text))
+
+    @property
+    def page_start(self) -> int:
+        return self.parts[0][0]
+
+    @property
+    def page_end(self) -> int:
+        return self.parts[-1][0]
+
+    @property
+    def size(self) -> int:
+        return sum(len(text) for _, text in self.parts)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(text for _, text in self.parts)
+
+    def display_title(self) -> str:
+        if self.title:
+            return self.title
+        if self.page_start == self.page_end:
+            return f"Page {self.page_start}"
+        return f"Pages {self.page_start}-{self.page_end}"
+
+
+class StructureSegmenter:
+    """Режет поток страниц на секции по структуре документа.
+
+    Границы секций берутся из оглавления (PDF outline / стили заголовков DOCX) и,
+    опционально, из нумерованных заголовков в тексте. Пустые страницы пропускаются,
+    секции короче ``min_section_chars`` поглощают следующий заголовок, а без заголовков
+    страницы копятся в одну секцию до ``max_section_chars``.
+    """
+
+    def __init__(
+        self,
+        outline: Sequence[dict] | None = None,
+        min_section_chars: int = 400,
+        max_section_chars: int = 8000,
+        numbered_headings: bool = True,
+    ) -> None:
+        self.min_section_chars = max(0, min_section_chars)
+        self.max_section_chars = max(0, max_section_chars)
+        self.numbered_headings = numbered_headings
+        self._outline: Dict[int, List[str]] = {}
+        for entry in outline or []:
+            title = (entry.get("title") or "").strip()
+            page = entry.get("page")
+            if title and isinstance(page, int):
+                self._outline.setdefault(page, []).append(title)
+
+    def _is_numbered_heading(self, line: str) -> bool:
+        if not self.numbered_headings:
+            return False
+        match = NUMBERED_HEADING_RE.match(line.strip())
+        if not match:
+            return False
+        title = match.group(2)
+        return title[0].isupper() and title[-1] not in ".,;:"
+
+    def _page_headings(self, page: int, lines: Sequence[str]) -> Dict[int, str]:
+        """Возвращает {номер строки: заголовок} для страницы."""
+        headings: Dict[int, str] = {}
+        pending = list(self._outline.get(page, []))
+        normalized = [_normalize(line) for line in lines]
+        for title in list(pending):
+            key = _normalize(title)
+            for idx, line in enumerate(normalized):
+                if idx not in headings and line and (line == key or line.startswith(key)):
+                    headings[idx] = title
+                    pending.remove(title)
+                    break
+        if pending and 0 not in headings:
+            # заголовок из оглавления не найден в тексте — секция начинается с начала страницы
+            first_text = next((i for i, line in enumerate(normalized) if line), 0)
+            headings[first_text] = pending[0]
+        if not self._outline:
+            for idx, line in enumerate(lines):
+                if idx not in headings and self._is_numbered_heading(line):
+                    headings[idx] = line.strip()
+        return headings
+
+    def segment(self, pages: Iterable[str]) -> Iterator[SectionDraft]:
+        current: Optional[SectionDraft] = None
+        for page_no, page_text in enumerate(pages, start=1):
+            if not page_text or not page_text.strip():
+                continue
+            lines = page_text.split("\n")
+            headings = self._page_headings(page_no, lines)
+            buffer: List[str] = []
+            for idx, line in enumerate(lines):
+                title = headings.get(idx)
+                if title is not None:
+                    if current is None and any(text.strip() for text in buffer):
+                        # текст до первого заголовка (титул, преамбула) или продолжение секции,
+                        # сброшенной по max_section_chars, — не теряем его
+                        current = SectionDraft(title=None)
+                    if current is None:
+                        current = SectionDraft(title=title)
+                    else:
+                        current.add(page_no, "\n".join(buffer))
+                        if current.size >= self.min_section_chars:
+                            if current.parts:
+                                yield current
+                            current = SectionDraft(title=title)
+                        elif current.title is None:
+                            current.title = title
+                    buffer = []
+                buffer.append(line)
+            if current is None:
+                current = SectionDraft(title=None)
+            current.add(page_no, "\n".join(buffer))
+            if self.max_section_chars and current.size >= self.max_section_chars:
+                yield current
+                current = None
+        if current is not None and current.parts:
+            yield current
@@ -1,48 +1,87 @@
 from __future__ import annotations
 
+import asyncio
+import io
+import shutil
+import tempfile
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, Coroutine, Iterator, Optional, TypeVar
 from urllib.parse import urlparse
 
-import boto3
-from botocore.client import Config
-
 from ingestion_service.config import Settings
+from ingestion_service.core.object_store import S3ObjectStore
+
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+T = TypeVar("T")
 
 
 class StorageClient:
-    def __init__(self, settings: Settings) -> None:
+    """Хранилище оригиналов: S3 (через async ``S3ObjectStore``), ``local://`` или файловая система.
+
+    Все S3-операции идут через один aioboto3-клиент с общим пулом соединений. Синхронные методы
+    (их вызывает пайплайн в потоке воркера) выполняют S3-вызовы на event loop сервиса,
+    запомненном в ``start()``.
+    """
+
+    def __init__(self, settings: Settings, object_store: Optional[S3ObjectStore] = None) -> None:
         self.settings = settings
         self.local_storage_path: Optional[Path] = settings.local_storage_path if settings.mock_mode else None
 
         self.bucket = settings.s3_bucket
-        self._s3_client = None
-        if settings.s3_bucket and settings.s3_access_key and settings.s3_secret_key:
-            session = boto3.session.Session(
-                aws_access_key_id=settings.s3_access_key,
-                aws_secret_access_key=settings.s3_secret_key,
-                region_name=settings.s3_region or "us-east-1",
-            )
-            self._s3_client = session.client(
-                "s3",
-                endpoint_url=settings.s3_endpoint,
-                config=Config(signature_version="s3v4"),
-                use_ssl=settings.s3_secure,
-                verify=settings.s3_secure,
+        self.object_store = object_store
+        if self.object_store is None and settings.s3_bucket and settings.s3_access_key and settings.s3_secret_key:
+            self.object_store = S3ObjectStore(
+                bucket=settings.s3_bucket,
+                endpoint=settings.s3_endpoint,
+                access_key=settings.s3_access_key,
+                secret_key=settings.s3_secret_key,
+                region=settings.s3_region,
+                secure=settings.s3_secure,
+                max_pool_connections=settings.s3_max_pool_connections,
+                part_size=settings.upload_part_bytes,
+                concurrency=settings.s3_transfer_concurrency,
             )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         if self.local_storage_path:
             self.local_storage_path.mkdir(parents=True, exist_ok=True)
 
-    def upload(self, tenant_id: str, filename: str, content: bytes) -> str:
+    async def start(self) -> None:
+        """Запоминает event loop сервиса (lifespan): на нём выполняются S3-вызовы синхронных методов."""
+        self._loop = asyncio.get_running_loop()
+
+    def _run_s3(self, call: Coroutine[Any, Any, T]) -> T:
+        """Выполняет вызов ``object_store`` из синхронного кода в потоке воркера."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self._loop is None or running is self._loop:
+            call.close()
+            raise RuntimeError("S3 calls from sync code need StorageClient.start() and a worker thread")
+        return asyncio.run_coroutine_threadsafe(call, self._loop).result()
+
+    def _s3_location(self, parsed) -> tuple[str, str]:
+        if self.object_store is None:
+            raise RuntimeError("S3 is not configured")
+        bucket = parsed.netloc or self.bucket
+        if not bucket:
+            raise RuntimeError("S3 bucket is not configured")
+        return bucket, parsed.path.lstrip("/")
+
+    @staticmethod
+    def _new_key(tenant_id: str, filename: str) -> str:
         ext = Path(filename).suffix or ".bin"
-        key = f"{tenant_id}/{uuid.uuid4().hex}{ext}"
+        return f"{tenant_id}/{uuid.uuid4().hex}{ext}"
 
-        if self._s3_client:
-            bucket = self.bucket
-            assert bucket, "S3 bucket must be configured"
-            self._s3_client.put_object(Bucket=bucket, Key=key, Body=content)
-            return f"s3://{bucket}/{key}"
+    def upload(self, tenant_id: str, filename: str, content: bytes) -> str:
+        key = self._new_key(tenant_id, filename)
+
+        if self.object_store is not None:
+            self._run_s3(self.object_store.put_fileobj(key, io.BytesIO(content)))
+            return f"s3://{self.object_store.bucket}/{key}"
 
         if self.local_storage_path:
             target = self.local_storage_path / key
@@ -56,25 +95,90 @@ class StorageClient:
         target.write_bytes(content)
         return target.as_uri()
 
+    def upload_stream(self, tenant_id: str, filename: str, fileobj: BinaryIO) -> str:
+        """Как ``upload``, но читает ``fileobj`` частями: в S3 — multipart upload по ``upload_part_bytes``,
+        локально — копирование блоками. Файл целиком в память не загружается."""
+        key = self._new_key(tenant_id, filename)
+
+        if self.object_store is not None:
+            self._run_s3(self.object_store.put_fileobj(key, fileobj))
+            return f"s3://{self.object_store.bucket}/{key}"
+
+        if self.local_storage_path:
+            target = self.local_storage_path / key
+            uri = f"local://{key}"
+        else:
+            target = Path(self.settings.storage_path) / key
+            uri = target.as_uri()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, "wb") as dst:
+            shutil.copyfileobj(fileobj, dst, DOWNLOAD_CHUNK_BYTES)
+        return uri
+
     def resolve_local_path(self, storage_uri: str) -> Path:
         parsed = urlparse(storage_uri)
         if parsed.scheme == "local" and self.local_storage_path:
             return (self.local_storage_path / (parsed.netloc + parsed.path).lstrip("/")).resolve()
         return Path(storage_uri.replace("file://", ""))
 
+    async def upload_async(self, tenant_id: str, filename: str, fileobj: BinaryIO) -> str:
+        """Загрузка из async-обработчика: S3 — через пул ``object_store`` с параллельными частями,
+        локальное хранилище — ``upload_stream`` в потоке, не блокируя event loop."""
+        if self.object_store is not None:
+            key = self._new_key(tenant_id, filename)
+            await self.object_store.put_fileobj(key, fileobj)
+            return f"s3://{self.object_store.bucket}/{key}"
+        return await asyncio.to_thread(self.upload_stream, tenant_id, filename, fileobj)
+
+    async def aclose(self) -> None:
+        if self.object_store is not None:
+            await self.object_store.close()
+
+    def local_path(self, storage_uri: str) -> Optional[Path]:
+        """Путь к объекту, если он уже лежит на локальном диске (``local://``, ``file://``, путь); иначе None."""
+        parsed = urlparse(storage_uri)
+        scheme = parsed.scheme or "file"
+        if scheme == "local":
+            if not self.local_storage_path:
+                return None
+            path = (self.local_storage_path / (parsed.netloc + parsed.path).lstrip("/")).resolve()
+        elif scheme == "file":
+            path = Path(parsed.path)
+        elif scheme == "s3":
+            return None
+        else:
+            path = self.resolve_local_path(storage_uri)
+        return path if path.is_file() else None
+
+    @contextmanager
+    def materialize(self, storage_uri: str, chunk_size: int = DOWNLOAD_CHUNK_BYTES) -> Iterator[Path]:
+        """Отдаёт путь к файлу объекта на время контекста.
+
+        Для локальных URI — существующий путь без копирования; для S3 и прочих — временный
+        файл (удаляется при выходе). S3-объект скачивается параллельными ranged GET по
+        ``upload_part_bytes`` через общий пул ``object_store``, прочие копируются блоками по
+        ``chunk_size``. Содержимое целиком в память Python не попадает.
+        """
+        existing = self.local_path(storage_uri)
+        if existing is not None:
+            yield existing
+            return
+        suffix = Path(urlparse(storage_uri).path).suffix or ".bin"
+        fh = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+        fh.close()
+        target = Path(fh.name)
+        try:
+            yield self.download_to_file(storage_uri, target, chunk_size)
+        finally:
+            target.unlink(missing_ok=True)
+
     def download_bytes(self, storage_uri: str) -> bytes:
         parsed = urlparse(storage_uri)
         scheme = parsed.scheme or "file"
 
         if scheme == "s3":
-            if not self._s3_client:
-                raise RuntimeError("S3 is not configured")
-            bucket = parsed.netloc or self.bucket
-            if not bucket:
-                raise RuntimeError("S3 bucket is not configured")
-            key = parsed.path.lstrip("/")
-            resp = self._s3_client.get_object(Bucket=bucket, Key=key)
-            return resp["Body"].read()
+            with self.materialize(storage_uri) as path:
+                return path.read_bytes()
 
         if scheme == "local":
             if not self.local_storage_path:
@@ -87,3 +191,25 @@ class StorageClient:
 
         path = self.resolve_local_path(storage_uri)
         return path.read_bytes()
+
+    def download_to_file(self, storage_uri: str, target: Path, chunk_size: int = DOWNLOAD_CHUNK_BYTES) -> Path:
+        """Копирует объект в ``target``, не держа его целиком в памяти: S3 — параллельными ranged GET,
+        файлы — блоками по ``chunk_size`` байт."""
+        parsed = urlparse(storage_uri)
+        scheme = parsed.scheme or "file"
+
+        if scheme == "s3":
+            bucket, key = self._s3_location(parsed)
+            return self._run_s3(self.object_store.get_to_file(key, target, bucket=bucket))
+
+        if scheme == "local":
+            if not self.local_storage_path:
+                raise RuntimeError("Local storage path is not configured")
+            source = (self.local_storage_path / (parsed.netloc + parsed.path).lstrip("/")).resolve()
+        elif scheme == "file":
+            source = Path(parsed.path)
+        else:
+            source = self.resolve_local_path(storage_uri)
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst, chunk_size)
+        return target
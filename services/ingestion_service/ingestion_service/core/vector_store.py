@@ -108,6 +108,20 @@ class VectorStore:
             for i, m, e in zip(ids, metas, embs):
                 self._chunks.append({"id": i, "metadata": m, "embedding": e})
 
+    def delete(self, doc_id: str, section_ids: Iterable[str] = (), chunk_ids: Iterable[str] = ()) -> None:
+        """Удаляет записанные секции и чанки документа (откат частично проиндексированного файла)."""
+        section_keys = [f"{doc_id}:{section_id}" for section_id in section_ids]
+        chunk_keys = [f"{doc_id}:{chunk_id}" for chunk_id in chunk_ids]
+        if self.enabled and self.section_collection and self.chunk_collection:
+            if section_keys:
+                self.section_collection.delete(ids=section_keys)
+            if chunk_keys:
+                self.chunk_collection.delete(ids=chunk_keys)
+        else:
+            drop_sections, drop_chunks = set(section_keys), set(chunk_keys)
+            self._sections = [s for s in self._sections if s["id"] not in drop_sections]
+            self._chunks = [c for c in self._chunks if c["id"] not in drop_chunks]
+
     def get_chunks(self, doc_id: str, tenant_id: str) -> List[dict]:
         if self.enabled and self.chunk_collection:
             where = {"$and": [{"doc_id": doc_id}, {"tenant_id": tenant_id}]}
@@ -3,15 +3,19 @@ import asyncio
 import structlog
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from ingestion_service.config import Settings, get_settings
 from ingestion_service.core.embedding import EmbeddingClient
 from ingestion_service.core.jobs import JobStore
+from ingestion_service.core.parser import create_parse_pool
 from ingestion_service.core.queue import IngestionQueue, WorkItem
 from ingestion_service.core.summarizer import Summarizer
 from ingestion_service.core.storage import StorageClient
 from ingestion_service.core.vector_store import VectorStore
 from ingestion_service.core.pipeline import process_file
+from ingestion_service.core.profiling import get_profiler
+from ingestion_service.http_client import PoolMetrics, create_http_client, create_sync_http_client
 from ingestion_service.logging import configure_logging
 from ingestion_service.routers import ingestion
 
@@ -50,6 +54,16 @@ logger.info(
 )
 
 
+async def _keep_lease(queue: IngestionQueue, item: WorkItem, interval: float) -> None:
+    """Пока документ обрабатывается, периодически продлевает аренду сообщения в очереди."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await queue.extend(item)
+        except Exception:
+            logger.warning("ingestion_queue_extend_failed", job_id=item.job_id)
+
+
 async def worker_loop(app: FastAPI) -> None:
     queue: IngestionQueue = app.state.queue
     jobs: JobStore = app.state.jobs
@@ -65,58 +79,93 @@ async def worker_loop(app: FastAPI) -> None:
         ticket = jobs.get(item.job_id)
         if not ticket:
             logger.warning("ingestion_queue_skip_missing_job", job_id=item.job_id)
+            await queue.ack(item)
             continue
-        success = process_file(
-            ticket=ticket,
-            storage=storage,
-            embedding=embedding,
-            summarizer=summarizer,
-            jobs=jobs,
-            doc_service_base_url=settings.doc_service_base_url,
-            max_pages=settings.max_pages,
-            max_file_mb=settings.max_file_mb,
-            chunk_size=settings.chunk_size,
-            chunk_overlap=settings.chunk_overlap,
-            vector_store=vector_store,
-            product=item.product,
-            version=item.version,
-            tags=item.tags,
-        )
-        if not success and item.attempt < settings.max_attempts:
-            next_attempt = item.attempt + 1
+        lease = asyncio.create_task(_keep_lease(queue, item, max(1.0, settings.visibility_timeout_seconds / 3)))
+        try:
+            # process_file синхронный: уводим его в поток, чтобы event loop продлевал аренду
+            success = await asyncio.to_thread(
+                process_file,
+                ticket=ticket,
+                storage=storage,
+                embedding=embedding,
+                summarizer=summarizer,
+                jobs=jobs,
+                doc_service_base_url=settings.doc_service_base_url,
+                max_pages=settings.max_pages,
+                max_file_mb=settings.max_file_mb,
+                chunk_size=settings.chunk_size,
+                chunk_overlap=settings.chunk_overlap,
+                vector_store=vector_store,
+                product=item.product,
+                version=item.version,
+                tags=item.tags,
+                page_batch_size=settings.page_batch_size,
+                doc_embedding_max_chars=settings.doc_embedding_max_chars,
+                parse_workers=settings.parse_workers,
+                parse_shard_pages=settings.parse_shard_pages,
+                parse_pool=app.state.parse_pool,
+                section_min_chars=settings.section_min_chars,
+                section_max_chars=settings.section_max_chars,
+                tokenizer_name=settings.tokenizer_name,
+                profiler=app.state.profiler,
+                http_client=app.state.sync_http_client,
+            )
+        finally:
+            lease.cancel()
+        if success:
+            await queue.ack(item)
+        elif item.attempt < settings.max_attempts:
             logger.warning(
                 "ingestion_retry_scheduled",
                 job_id=item.job_id,
-                attempt=next_attempt,
-            )
-            await asyncio.sleep(settings.retry_delay_seconds)
-            await queue.enqueue(
-                WorkItem(
-                    job_id=item.job_id,
-                    tenant_id=item.tenant_id,
-                    doc_id=item.doc_id,
-                    storage_uri=item.storage_uri,
-                    product=item.product,
-                    version=item.version,
-                    tags=item.tags,
-                    attempt=next_attempt,
-                )
+                attempt=item.attempt + 1,
+                delay_seconds=settings.retry_delay_seconds,
             )
+            await queue.retry(item, delay=settings.retry_delay_seconds)
+        else:
+            await queue.dead_letter(item, reason="max_attempts")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    app.state.jobs = JobStore(redis_url=settings.redis_url)
+    app.state.jobs = JobStore(
+        redis_url=settings.redis_url,
+        log_preview_chars=settings.log_preview_chars,
+        log_preview_items=settings.log_preview_items,
+    )
     app.state.storage = StorageClient(settings)
+    await app.state.storage.start()
     app.state.settings = settings
-    app.state.embedding_client = EmbeddingClient(settings)
+    app.state.profiler = get_profiler()
+    pool_options = dict(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        http2=settings.http2,
+        metrics=PoolMetrics(),
+    )
+    app.state.http_metrics = pool_options["metrics"]
+    # async-пул — для вызовов Document Service из роутера, sync-пул — для пайплайна в потоках воркеров
+    app.state.http_client = create_http_client(timeout=10.0, **pool_options)
+    app.state.sync_http_client = create_sync_http_client(timeout=10.0, **pool_options)
+    # один пул процессов парсинга на сервис (spawn), а не новый пул на каждый документ
+    app.state.parse_pool = create_parse_pool(settings.parse_workers)
+    app.state.embedding_client = EmbeddingClient(settings, http_client=app.state.sync_http_client)
     app.state.summarizer = Summarizer(settings)
     app.state.vector_store = VectorStore(
         path=str(settings.chroma_path),
         host=str(settings.chroma_host) if settings.chroma_host else None,
         enabled=not settings.mock_mode,
     )
-    app.state.queue = IngestionQueue(settings.redis_url, settings.queue_name)
+    app.state.queue = IngestionQueue(
+        settings.redis_url,
+        settings.queue_name,
+        visibility_timeout=settings.visibility_timeout_seconds,
+        max_attempts=settings.max_attempts,
+        priority_weights=settings.queue_priority_weights,
+        tenant_weights=settings.queue_tenant_weights,
+    )
     app.state.worker_tasks: list[asyncio.Task] = []
     if settings.worker_count > 0:
         for _ in range(settings.worker_count):
@@ -136,6 +185,11 @@ async def lifespan(app: FastAPI):
     for task in getattr(app.state, "worker_tasks", []):
         task.cancel()
     await asyncio.gather(*getattr(app.state, "worker_tasks", []), return_exceptions=True)
+    await app.state.storage.aclose()
+    await app.state.http_client.aclose()
+    app.state.sync_http_client.close()
+    if app.state.parse_pool is not None:
+        app.state.parse_pool.shutdown(wait=True, cancel_futures=True)
 
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
@@ -145,3 +199,18 @@ app.include_router(ingestion.router)
 @app.get("/health", tags=["health"])
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics() -> str:
+    body = get_profiler().render_prometheus()
+    queue: IngestionQueue | None = getattr(app.state, "queue", None)
+    if queue is not None:
+        try:
+            body += queue.render_prometheus(await queue.stats())
+        except Exception:
+            logger.warning("ingestion_queue_stats_failed")
+    http_metrics: PoolMetrics | None = getattr(app.state, "http_metrics", None)
+    if http_metrics is not None:
+        body += http_metrics.render_prometheus()
+    return body
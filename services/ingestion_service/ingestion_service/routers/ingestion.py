@@ -1,7 +1,11 @@
+import asyncio
 import uuid
+from concurrent.futures import Executor
 from datetime import datetime
+from typing import List
 
 import httpx
+import structlog
 from fastapi import (
     APIRouter,
     BackgroundTasks,
@@ -16,13 +20,14 @@ from fastapi import (
 
 from ingestion_service.config import Settings
 from ingestion_service.core.jobs import JobRecord, JobStore
-from ingestion_service.core.queue import IngestionQueue, WorkItem
+from ingestion_service.core.queue import PRIORITY_BULK, PRIORITY_INTERACTIVE, IngestionQueue, WorkItem
 from ingestion_service.core.pipeline import process_file
 from ingestion_service.core.storage import StorageClient
 from ingestion_service.core.embedding import EmbeddingClient
 from ingestion_service.core.summarizer import Summarizer
 from ingestion_service.core.vector_store import VectorStore
 from ingestion_service.schemas import (
+    BatchEnqueueResponse,
     EnqueueResponse,
     JobStatusResponse,
     StatusPayload,
@@ -31,6 +36,7 @@ from ingestion_service.schemas import (
 )
 
 router = APIRouter(prefix="/internal/ingestion", tags=["ingestion"])
+logger = structlog.get_logger(__name__)
 
 
 def get_jobs(request: Request) -> JobStore:
@@ -61,6 +67,13 @@ def get_embedding_client(request: Request) -> EmbeddingClient:
     return client
 
 
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    client = getattr(request.app.state, "http_client", None)
+    if client is None:
+        raise RuntimeError("HTTP client is not initialized")
+    return client
+
+
 def get_vector_store(request: Request) -> VectorStore:
     store = getattr(request.app.state, "vector_store", None)
     if store is None:
@@ -75,6 +88,10 @@ def get_summarizer(request: Request) -> Summarizer:
     return client
 
 
+def get_parse_pool(request: Request) -> Executor | None:
+    return getattr(request.app.state, "parse_pool", None)
+
+
 def get_queue(request: Request) -> IngestionQueue:
     queue = getattr(request.app.state, "queue", None)
     if queue is None:
@@ -91,12 +108,72 @@ def get_tenant_id(request: Request) -> str:
     return tenant_id
 
 
+def _validate_priority(queue: IngestionQueue, priority: str) -> None:
+    try:
+        queue.validate_priority(priority)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+def _document_payload(ticket, name: str | None, product: str | None, version: str | None, tags: str | None) -> dict:
+    return {
+        "doc_id": ticket.doc_id,
+        "tenant_id": ticket.tenant_id,
+        "name": name,
+        "product": product,
+        "version": version,
+        "status": "uploaded",
+        "storage_uri": ticket.storage_uri,
+        "tags": (tags.split(",") if tags else []),
+    }
+
+
+def _schedule_processing(
+    background: BackgroundTasks,
+    ticket,
+    item: WorkItem,
+    storage: StorageClient,
+    embedding: EmbeddingClient,
+    summarizer: Summarizer,
+    jobs: JobStore,
+    vector_store: VectorStore,
+    settings: Settings,
+    parse_pool: Executor | None = None,
+) -> None:
+    background.add_task(
+        process_file,
+        ticket=ticket,
+        storage=storage,
+        embedding=embedding,
+        summarizer=summarizer,
+        jobs=jobs,
+        doc_service_base_url=settings.doc_service_base_url,
+        max_pages=settings.max_pages,
+        max_file_mb=settings.max_file_mb,
+        chunk_size=settings.chunk_size,
+        chunk_overlap=settings.chunk_overlap,
+        vector_store=vector_store,
+        product=item.product,
+        version=item.version,
+        tags=item.tags,
+        page_batch_size=settings.page_batch_size,
+        doc_embedding_max_chars=settings.doc_embedding_max_chars,
+        parse_workers=settings.parse_workers,
+        parse_shard_pages=settings.parse_shard_pages,
+        parse_pool=parse_pool,
+        section_min_chars=settings.section_min_chars,
+        section_max_chars=settings.section_max_chars,
+        tokenizer_name=settings.tokenizer_name,
+    )
+
+
 @router.post("/enqueue", response_model=EnqueueResponse)
 async def enqueue_document(
     file: UploadFile = File(...),
     product: str | None = Form(None),
     version: str | None = Form(None),
     tags: str | None = Form(None),
+    priority: str = Form(PRIORITY_INTERACTIVE),
     jobs: JobStore = Depends(get_jobs),
     storage: StorageClient = Depends(get_storage),
     settings: Settings = Depends(get_settings),
@@ -105,11 +182,14 @@ async def enqueue_document(
     vector_store: VectorStore = Depends(get_vector_store),
     tenant_id: str = Depends(get_tenant_id),
     queue: IngestionQueue = Depends(get_queue),
+    client: httpx.AsyncClient = Depends(get_http_client),
+    parse_pool: Executor | None = Depends(get_parse_pool),
     background: BackgroundTasks = None,
 ) -> EnqueueResponse:
-    content = await file.read()
+    _validate_priority(queue, priority)
     doc_id = f"doc_{uuid.uuid4().hex[:8]}"
-    storage_uri = storage.upload(tenant_id, file.filename, content)
+    # multipart-часть уже лежит во временном файле Starlette — отправляем её в хранилище частями
+    storage_uri = await storage.upload_async(tenant_id, file.filename, file.file)
     job_id = f"job_{uuid.uuid4().hex[:12]}"
     ticket = jobs.create(
         JobRecord(
@@ -126,20 +206,11 @@ async def enqueue_document(
     # опциональная регистрация документа в Document Service
     if settings.doc_service_base_url:
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                await client.post(
-                    f"{settings.doc_service_base_url}/internal/documents",
-                    json={
-                        "doc_id": doc_id,
-                        "tenant_id": tenant_id,
-                        "name": file.filename,
-                        "product": product,
-                        "version": version,
-                        "status": "uploaded",
-                        "storage_uri": storage_uri,
-                        "tags": (tags.split(",") if tags else []),
-                    },
-                )
+            await client.post(
+                f"{settings.doc_service_base_url}/internal/documents",
+                json=_document_payload(ticket, file.filename, product, version, tags),
+                timeout=5.0,
+            )
         except Exception:
             # Логируем, но не падаем
             pass
@@ -152,27 +223,12 @@ async def enqueue_document(
         product=product,
         version=version,
         tags=tags,
+        priority=priority,
     )
     if settings.worker_count > 0:
         await queue.enqueue(work_item)
     elif background is not None:
-        background.add_task(
-            process_file,
-            ticket=ticket,
-            storage=storage,
-            embedding=embedding,
-            summarizer=summarizer,
-            jobs=jobs,
-            doc_service_base_url=settings.doc_service_base_url,
-            max_pages=settings.max_pages,
-            max_file_mb=settings.max_file_mb,
-            chunk_size=settings.chunk_size,
-            chunk_overlap=settings.chunk_overlap,
-            vector_store=vector_store,
-            product=product,
-            version=version,
-            tags=tags,
-        )
+        _schedule_processing(background, ticket, work_item, storage, embedding, summarizer, jobs, vector_store, settings, parse_pool)
 
     return EnqueueResponse(
         job_id=ticket.job_id,
@@ -183,11 +239,110 @@ async def enqueue_document(
     )
 
 
+@router.post("/enqueue/batch", response_model=BatchEnqueueResponse)
+async def enqueue_documents(
+    files: List[UploadFile] = File(...),
+    product: str | None = Form(None),
+    version: str | None = Form(None),
+    tags: str | None = Form(None),
+    priority: str = Form(PRIORITY_BULK),
+    jobs: JobStore = Depends(get_jobs),
+    storage: StorageClient = Depends(get_storage),
+    settings: Settings = Depends(get_settings),
+    embedding: EmbeddingClient = Depends(get_embedding_client),
+    summarizer: Summarizer = Depends(get_summarizer),
+    vector_store: VectorStore = Depends(get_vector_store),
+    tenant_id: str = Depends(get_tenant_id),
+    queue: IngestionQueue = Depends(get_queue),
+    client: httpx.AsyncClient = Depends(get_http_client),
+    parse_pool: Executor | None = Depends(get_parse_pool),
+    background: BackgroundTasks = None,
+) -> BatchEnqueueResponse:
+    """Пакетная загрузка: файлы частями копируются в хранилище (до ``upload_concurrency`` файлов параллельно),
+    документы регистрируются в Document Service одним bulk-запросом, job ставятся в очередь одним pipeline."""
+    _validate_priority(queue, priority)
+    if len(files) > settings.batch_max_files:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"too many files: {len(files)} > {settings.batch_max_files}",
+        )
+    limiter = asyncio.Semaphore(max(1, settings.upload_concurrency))
+
+    async def upload(file: UploadFile) -> str:
+        async with limiter:
+            return await storage.upload_async(tenant_id, file.filename, file.file)
+
+    storage_uris = await asyncio.gather(*(upload(file) for file in files))
+    submitted_at = datetime.utcnow()
+    tickets = jobs.create_many(
+        [
+            JobRecord(
+                job_id=f"job_{uuid.uuid4().hex[:12]}",
+                tenant_id=tenant_id,
+                doc_id=f"doc_{uuid.uuid4().hex[:8]}",
+                status="queued",
+                submitted_at=submitted_at,
+                storage_uri=storage_uri,
+                error=None,
+            )
+            for storage_uri in storage_uris
+        ]
+    )
+
+    if settings.doc_service_base_url:
+        try:
+            await client.post(
+                f"{settings.doc_service_base_url}/internal/documents/bulk",
+                json={
+                    "documents": [
+                        _document_payload(ticket, file.filename, product, version, tags)
+                        for ticket, file in zip(tickets, files)
+                    ]
+                },
+                timeout=10.0,
+            )
+        except Exception:
+            logger.warning("ingestion_bulk_register_failed", tenant_id=tenant_id, documents=len(tickets))
+
+    work_items = [
+        WorkItem(
+            job_id=ticket.job_id,
+            tenant_id=ticket.tenant_id,
+            doc_id=ticket.doc_id,
+            storage_uri=ticket.storage_uri,
+            product=product,
+            version=version,
+            tags=tags,
+            priority=priority,
+        )
+        for ticket in tickets
+    ]
+    if settings.worker_count > 0:
+        await queue.enqueue_many(work_items)
+    elif background is not None:
+        for ticket, item in zip(tickets, work_items):
+            _schedule_processing(background, ticket, item, storage, embedding, summarizer, jobs, vector_store, settings, parse_pool)
+
+    return BatchEnqueueResponse(
+        items=[
+            EnqueueResponse(
+                job_id=ticket.job_id,
+                tenant_id=ticket.tenant_id,
+                doc_id=ticket.doc_id,
+                status=ticket.status,
+                storage_uri=ticket.storage_uri,
+            )
+            for ticket in tickets
+        ]
+    )
+
+
 @router.post("/status", response_model=EnqueueResponse)
 async def update_status(
     payload: StatusPayload,
     jobs: JobStore = Depends(get_jobs),
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
 ) -> EnqueueResponse:
     try:
         ticket = jobs.update(payload.job_id, status=payload.status, error=payload.error)
@@ -198,17 +353,17 @@ async def update_status(
 
     if settings.doc_service_base_url:
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                await client.post(
-                    f"{settings.doc_service_base_url}/internal/documents/status",
-                    json={
-                        "doc_id": ticket.doc_id,
-                        "status": payload.status,
-                        "error": payload.error,
-                        "storage_uri": ticket.storage_uri,
-                    },
-                    headers={"X-Tenant-ID": ticket.tenant_id},
-                )
+            await client.post(
+                f"{settings.doc_service_base_url}/internal/documents/status",
+                json={
+                    "doc_id": ticket.doc_id,
+                    "status": payload.status,
+                    "error": payload.error,
+                    "storage_uri": ticket.storage_uri,
+                },
+                headers={"X-Tenant-ID": ticket.tenant_id},
+                timeout=5.0,
+            )
         except Exception:
             pass
 
@@ -243,6 +398,19 @@ async def get_job(
     )
 
 
+@router.get("/queue/stats")
+async def get_queue_stats(queue: IngestionQueue = Depends(get_queue)) -> dict:
+    return await queue.stats()
+
+
+@router.get("/queue/dead-letters")
+async def get_dead_letters(
+    limit: int = 50,
+    queue: IngestionQueue = Depends(get_queue),
+) -> dict:
+    return {"items": await queue.dead_letters(limit=limit)}
+
+
 @router.get("/summarizer/config", response_model=SummarizerConfig)
 async def get_summarizer_config(
     summarizer: Summarizer = Depends(get_summarizer),
@@ -285,6 +453,7 @@ async def get_document_tree(
     vector_store: VectorStore = Depends(get_vector_store),
     settings: Settings = Depends(get_settings),
     tenant_id: str = Depends(get_tenant_id),
+    client: httpx.AsyncClient = Depends(get_http_client),
 ):
     if not settings.doc_service_base_url:
         raise HTTPException(
@@ -292,13 +461,13 @@ async def get_document_tree(
             detail="document_service_not_configured",
         )
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                f"{settings.doc_service_base_url}/internal/documents/{doc_id}",
-                headers={"X-Tenant-ID": tenant_id},
-            )
-            resp.raise_for_status()
-            detail = resp.json()
+        resp = await client.get(
+            f"{settings.doc_service_base_url}/internal/documents/{doc_id}",
+            headers={"X-Tenant-ID": tenant_id},
+            timeout=10.0,
+        )
+        resp.raise_for_status()
+        detail = resp.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(
             status_code=exc.response.status_code, detail=exc.response.text
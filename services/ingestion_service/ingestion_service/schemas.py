@@ -24,6 +24,10 @@ class EnqueueResponse(BaseModel):
     storage_uri: str | None = None
 
 
+class BatchEnqueueResponse(BaseModel):
+    items: List[EnqueueResponse]
+
+
 class StatusPayload(BaseModel):
     job_id: str
     status: str
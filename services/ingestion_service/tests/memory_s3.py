@@ -0,0 +1,78 @@
+"""In-memory замена aiobotocore S3-клиента для тестов: тот же набор вызовов, без MinIO."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+
+class MemoryS3Client:
+    """Хранит объекты и незавершённые multipart upload'ы в словарях процесса."""
+
+    class _Body:
+        def __init__(self, data: bytes) -> None:
+            self._data = data
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc) -> None:
+            return None
+
+        async def read(self) -> bytes:
+            return self._data
+
+    def __init__(self) -> None:
+        self.objects: Dict[Tuple[str, str], bytes] = {}
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        self.calls: List[str] = []
+
+    async def put_object(self, Bucket: str, Key: str, Body: bytes) -> dict:
+        self.calls.append("put_object")
+        self.objects[(Bucket, Key)] = bytes(Body)
+        return {"ETag": f'"{len(Body)}"'}
+
+    async def create_multipart_upload(self, Bucket: str, Key: str) -> dict:
+        self.calls.append("create_multipart_upload")
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    async def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes) -> dict:
+        self.calls.append("upload_part")
+        await asyncio.sleep(0)
+        self.uploads[UploadId][PartNumber] = bytes(Body)
+        return {"ETag": f'"{UploadId}-{PartNumber}"'}
+
+    async def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict) -> dict:
+        self.calls.append("complete_multipart_upload")
+        parts = self.uploads.pop(UploadId)
+        self.objects[(Bucket, Key)] = b"".join(parts[p["PartNumber"]] for p in MultipartUpload["Parts"])
+        return {}
+
+    async def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str) -> dict:
+        self.calls.append("abort_multipart_upload")
+        self.uploads.pop(UploadId, None)
+        return {}
+
+    @staticmethod
+    def _etag(data: bytes) -> str:
+        return f'"{hashlib.md5(data).hexdigest()}"'
+
+    async def head_object(self, Bucket: str, Key: str) -> dict:
+        data = self.objects[(Bucket, Key)]
+        return {"ContentLength": len(data), "ETag": self._etag(data)}
+
+    async def get_object(self, Bucket: str, Key: str, Range: Optional[str] = None, IfMatch: Optional[str] = None) -> dict:
+        self.calls.append("get_object")
+        data = self.objects[(Bucket, Key)]
+        if IfMatch is not None and IfMatch != self._etag(data):
+            raise RuntimeError("PreconditionFailed")
+        if Range:
+            start, end = (int(x) for x in Range.removeprefix("bytes=").split("-"))
+            data = data[start : end + 1]
+        return {"Body": self._Body(data)}
+
+    async def generate_presigned_url(self, ClientMethod: str, Params: dict, ExpiresIn: int) -> str:
+        return f"memory://{Params['Bucket']}/{Params['Key']}?expires={ExpiresIn}"
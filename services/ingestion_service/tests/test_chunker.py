@@ -0,0 +1,62 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+TEST_DIR = Path(__file__).parent
+ROOT = TEST_DIR.parents[2]
+sys.path.append(str(ROOT / "services" / "ingestion_service"))
+
+from ingestion_service.core.chunker import RegexTokenizer, TokenChunker  # noqa: E402
+from ingestion_service.core.parser import DocumentParser  # noqa: E402
+
+
+def test_windows_are_measured_in_tokens_and_slice_source_text():
+    text = " ".join(f"w{i}" for i in range(25))
+    chunker = TokenChunker(max_tokens=10, overlap_tokens=2)
+    chunks = chunker.split(text)
+    tokenizer = RegexTokenizer()
+    assert [len(tokenizer.offsets(c)) for c in chunks] == [10, 10, 9]
+    assert all(chunk in text for chunk in chunks)
+    # перекрытие — последние 2 токена предыдущего окна
+    assert chunks[1].startswith("w8 w9 ")
+    assert chunks[2].startswith("w16 w17 ")
+    assert chunks[-1].endswith("w24")
+
+
+def test_window_end_snaps_to_sentence_boundary():
+    text = "One two three four five six seven. Eight nine ten eleven twelve thirteen fourteen."
+    chunks = TokenChunker(max_tokens=10, overlap_tokens=0).split(text)
+    assert chunks[0] == "One two three four five six seven."
+    assert chunks[1] == "Eight nine ten eleven twelve thirteen fourteen."
+
+
+def test_regex_fast_path_matches_offset_windows():
+    rnd = random.Random(7)
+    pieces = ["word", "Слово", "a1", ".", "!", "?", "…", ",", " ", " ", "\n", "\n\n", " \n \n ", "\t"]
+    for _ in range(500):
+        text = "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 80)))
+        chunker = TokenChunker(max_tokens=rnd.randint(1, 12), overlap_tokens=rnd.randint(0, 12))
+        assert chunker._skip_spans(text) == chunker._offset_spans(text), text
+
+
+def test_empty_text_returns_single_chunk():
+    assert TokenChunker(max_tokens=8).split("   ") == ["   "]
+
+
+def test_docx_is_paginated_with_outline_pages(tmp_path):
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.add_heading("Intro", level=1)
+    for _ in range(50):
+        document.add_paragraph(" ".join(["word"] * 10))
+    document.add_heading("Setup", level=1)
+    document.add_paragraph("Install the agent.")
+    path = tmp_path / "guide.docx"
+    document.save(str(path))
+
+    pages, meta = DocumentParser(max_pages=100, max_file_mb=10).parse(path)
+    assert len(pages) == 2
+    assert "Install the agent." in pages[1]
+    assert [(e["title"], e["page"]) for e in meta["outline"]] == [("Intro", 1), ("Setup", 2)]
@@ -39,3 +39,19 @@ def test_update_status():
         )
         assert resp.status_code == 200
         assert resp.json()["status"] == "processing"
+
+
+def test_enqueue_batch_uploads_all_files():
+    with TestClient(app) as client:
+        files = [
+            ("files", ("a.txt", b"first", "text/plain")),
+            ("files", ("b.txt", b"second", "text/plain")),
+        ]
+        resp = client.post("/internal/ingestion/enqueue/batch", files=files, headers=tenant_headers())
+        assert resp.status_code == 200, resp.text
+        items = resp.json()["items"]
+        assert len(items) == 2
+        assert len({item["job_id"] for item in items}) == 2
+        assert all(item["status"] == "queued" and item["storage_uri"] for item in items)
+        job = client.get(f"/internal/ingestion/jobs/{items[0]['job_id']}")
+        assert job.status_code == 200
@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+TEST_DIR = Path(__file__).parent
+ROOT = TEST_DIR.parents[2]
+sys.path.append(str(ROOT / "services" / "ingestion_service"))
+
+from ingestion_service.core.jobs import JobStore, preview_payload  # noqa: E402
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def rpush(self, key, *values):
+        self.commands.append(("rpush", key, values))
+
+    def ltrim(self, key, start, end):
+        self.commands.append(("ltrim", key, start, end))
+
+    def execute(self):
+        self.redis.round_trips += 1
+        for cmd in self.commands:
+            if cmd[0] == "rpush":
+                self.redis.lists.setdefault(cmd[1], []).extend(cmd[2])
+            else:
+                self.redis.lists[cmd[1]] = self.redis.lists[cmd[1]][cmd[2]:]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.lists = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def lrange(self, key, start, end):
+        return self.lists.get(key, [])[start:]
+
+
+def test_preview_payload_truncates_strings_and_lists():
+    payload = {"input": ["x" * 50] * 8, "stage": "chunks"}
+    preview = preview_payload(payload, max_chars=10, max_items=3)
+    assert preview["stage"] == "chunks"
+    assert preview["input"][:3] == ["x" * 10 + "… [+40 chars]"] * 3
+    assert preview["input"][3] == "… [+5 items]"
+
+
+def test_log_buffer_writes_batch_in_one_round_trip():
+    jobs = JobStore(redis_url=None, log_preview_chars=20)
+    jobs._redis = _FakeRedis()
+    log = jobs.log_buffer("job_1")
+    for i in range(6):
+        log.append({"type": "embedding", "items": i})
+    log.append({"type": "embedding_payload", "input": "y" * 100})
+    assert jobs._redis.round_trips == 0
+    log.flush()
+    log.flush()
+    assert jobs._redis.round_trips == 1
+    logs = jobs.get_logs("job_1")
+    assert [entry.get("items") for entry in logs[:6]] == list(range(6))
+    assert logs[-1]["input"].startswith("y" * 20 + "…")
@@ -0,0 +1,90 @@
+import asyncio
+import io
+import sys
+from pathlib import Path
+
+TEST_DIR = Path(__file__).parent
+ROOT = TEST_DIR.parents[2]
+sys.path.append(str(ROOT / "services" / "ingestion_service"))
+
+from ingestion_service.core.object_store import MIN_PART_BYTES, S3ObjectStore  # noqa: E402
+from memory_s3 import MemoryS3Client  # noqa: E402
+
+
+def test_multipart_upload_and_ranged_download_roundtrip(tmp_path):
+    client = MemoryS3Client()
+    store = S3ObjectStore(bucket="docs", part_size=MIN_PART_BYTES, concurrency=2, client=client)
+    data = bytes(range(256)) * (MIN_PART_BYTES * 2 // 256 + 100)
+
+    async def scenario():
+        await store.put_fileobj("tenant_1/big.pdf", io.BytesIO(data))
+        await store.put_fileobj("tenant_1/small.pdf", io.BytesIO(b"tiny"))
+        return await store.get_to_file("tenant_1/big.pdf", tmp_path / "big.pdf")
+
+    target = asyncio.run(scenario())
+    assert client.calls.count("upload_part") == 3
+    assert client.calls.count("put_object") == 1
+    assert client.objects[("docs", "tenant_1/small.pdf")] == b"tiny"
+    assert client.calls.count("get_object") == 3
+    assert target.read_bytes() == data
+
+
+def test_failed_part_aborts_multipart_upload():
+    class FailingClient(MemoryS3Client):
+        async def upload_part(self, **kwargs):
+            if kwargs["PartNumber"] == 2:
+                raise RuntimeError("boom")
+            return await super().upload_part(**kwargs)
+
+    client = FailingClient()
+    store = S3ObjectStore(bucket="docs", part_size=MIN_PART_BYTES, client=client)
+    try:
+        asyncio.run(store.put_fileobj("k", io.BytesIO(b"x" * (MIN_PART_BYTES * 2))))
+    except RuntimeError:
+        pass
+    else:  # pragma: no cover
+        raise AssertionError("expected failure")
+    assert "abort_multipart_upload" in client.calls
+    assert not client.uploads
+
+
+def test_failed_range_stops_sibling_reads_before_closing_file(tmp_path):
+    class FailingRangeClient(MemoryS3Client):
+        async def get_object(self, **kwargs):
+            if kwargs["Range"].startswith("bytes=0-"):
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    self.calls.append("range_cancelled")
+                    raise
+            raise RuntimeError("connection reset")
+
+    client = FailingRangeClient()
+    client.objects[("docs", "big.pdf")] = b"x" * (MIN_PART_BYTES * 2)
+    store = S3ObjectStore(bucket="docs", part_size=MIN_PART_BYTES, concurrency=2, client=client)
+
+    async def scenario():
+        try:
+            await store.get_to_file("big.pdf", tmp_path / "big.pdf")
+        except RuntimeError:
+            return list(client.calls)  # до выхода из event loop: соседние чтения уже остановлены
+        raise AssertionError("expected failure")  # pragma: no cover
+
+    assert "range_cancelled" in asyncio.run(scenario())
+
+
+def test_ranged_download_rejects_object_overwritten_after_head(tmp_path):
+    class OverwritingClient(MemoryS3Client):
+        async def get_object(self, **kwargs):
+            self.objects[("docs", "big.pdf")] = b"y" * (MIN_PART_BYTES * 2)
+            return await super().get_object(**kwargs)
+
+    client = OverwritingClient()
+    client.objects[("docs", "big.pdf")] = b"x" * (MIN_PART_BYTES * 2)
+    store = S3ObjectStore(bucket="docs", part_size=MIN_PART_BYTES, client=client)
+    try:
+        asyncio.run(store.get_to_file("big.pdf", tmp_path / "big.pdf"))
+    except RuntimeError as exc:
+        assert "PreconditionFailed" in str(exc)
+    else:  # pragma: no cover
+        raise AssertionError("expected failure")
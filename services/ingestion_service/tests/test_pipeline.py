@@ -0,0 +1,192 @@
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+TEST_DIR = Path(__file__).parent
+ROOT = TEST_DIR.parents[2]
+sys.path.append(str(ROOT / "services" / "ingestion_service"))
+
+from ingestion_service.config import Settings  # noqa: E402
+from ingestion_service.core.embedding import EmbeddingClient  # noqa: E402
+from ingestion_service.core.jobs import JobRecord, JobStore  # noqa: E402
+from ingestion_service.core.parser import DocumentParser, create_parse_pool  # noqa: E402
+from ingestion_service.core.pipeline import process_file  # noqa: E402
+from ingestion_service.core.profiling import StageProfiler  # noqa: E402
+from ingestion_service.core.storage import StorageClient  # noqa: E402
+from ingestion_service.core.summarizer import Summarizer  # noqa: E402
+from ingestion_service.core.vector_store import VectorStore  # noqa: E402
+
+
+def _write_text_pdf(path: Path, texts: list[str]) -> None:
+    """Минимальный PDF с одной строкой Helvetica на страницу."""
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(len(texts)))
+    objs = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(texts)} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(texts):
+        stream = f"BT /F1 12 Tf 20 100 Td ({text}) Tj ET"
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 300 200] /Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for num, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(out)
+
+
+def test_parser_streams_pdf_pages_lazily(tmp_path):
+    pdf = tmp_path / "manual.pdf"
+    _write_text_pdf(pdf, ["Page one", "Page two", "Page three"])
+    pages, meta = DocumentParser(max_pages=10, max_file_mb=5).stream(pdf)
+    assert meta["pages"] == 3
+    assert meta["title"] == "manual.pdf"
+    assert not isinstance(pages, list)
+    assert list(pages) == ["Page one", "Page two", "Page three"]
+    assert len(meta["page_timings"]) == 3
+
+
+def test_parser_parallel_pdf_preserves_page_order(tmp_path):
+    pdf = tmp_path / "manual.pdf"
+    _write_text_pdf(pdf, [f"Page {i}" for i in range(1, 8)])
+    pool = create_parse_pool(2)
+    try:
+        parser = DocumentParser(max_pages=10, max_file_mb=5, workers=2, shard_pages=2, pool=pool)
+        for _ in range(2):  # пул переиспользуется между документами
+            pages, meta = parser.stream(pdf)
+            assert list(pages) == [f"Page {i}" for i in range(1, 8)]
+            assert len(meta["page_timings"]) == 7
+    finally:
+        pool.shutdown()
+
+
+def test_process_file_streams_pages_in_batches(tmp_path):
+    settings = Settings(mock_mode=True, local_storage_path=tmp_path / "storage", redis_url=None)
+    storage = StorageClient(settings)
+    pdf = tmp_path / "manual.pdf"
+    _write_text_pdf(pdf, [f"Page {i}" for i in range(1, 6)])
+    storage_uri = storage.upload("tenant_1", "manual.pdf", pdf.read_bytes())
+    jobs = JobStore(redis_url=None)
+    ticket = jobs.create(
+        JobRecord(job_id="job_1", tenant_id="tenant_1", doc_id="doc_1", status="queued", submitted_at=datetime.utcnow(), storage_uri=storage_uri)
+    )
+    vector_store = VectorStore(path=str(tmp_path / "chroma"), enabled=False)
+    profiler = StageProfiler("ingestion_stage_latency_seconds")
+
+    ok = process_file(
+        ticket=ticket,
+        storage=storage,
+        embedding=EmbeddingClient(settings),
+        summarizer=Summarizer(settings),
+        jobs=jobs,
+        doc_service_base_url=None,
+        max_pages=10,
+        max_file_mb=5,
+        chunk_size=64,
+        chunk_overlap=0,
+        vector_store=vector_store,
+        page_batch_size=2,
+        profiler=profiler,
+    )
+
+    assert ok
+    assert jobs.get("job_1").status == "indexed"
+    # короткие страницы без заголовков сливаются в одну секцию, чанки сохраняют номер страницы
+    assert [s["metadata"]["section_id"] for s in vector_store._sections] == ["sec_1"]
+    assert vector_store._sections[0]["metadata"]["chunk_ids"] == ", ".join(f"chunk_{i}_1" for i in range(1, 6))
+    parse_log = next(entry for entry in jobs.get_logs("job_1") if entry["type"] == "parse")
+    assert parse_log["page_ms"]["count"] == 5
+    assert set(parse_log["page_ms"]) == {"count", "p50", "p95", "max", "slowest_page"}
+    snapshot = profiler.snapshot()
+    assert snapshot["parse"]["count"] == 1
+    assert snapshot["embed"]["count"] == 1
+
+
+class _FailingEmbeddingClient(EmbeddingClient):
+    """Падает на ``fail_on``-м вызове, когда часть пачек уже записана в vector store."""
+
+    def __init__(self, settings: Settings, fail_on: int) -> None:
+        super().__init__(settings)
+        self.fail_on = fail_on
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise RuntimeError("embedding backend is down")
+        return super().embed(texts)
+
+
+def _ingest(tmp_path, embedding_factory, http_client=None):
+    settings = Settings(mock_mode=True, local_storage_path=tmp_path / "storage", redis_url=None)
+    storage = StorageClient(settings)
+    pdf = tmp_path / "manual.pdf"
+    _write_text_pdf(pdf, [f"Page {i}" for i in range(1, 6)])
+    jobs = JobStore(redis_url=None)
+    ticket = jobs.create(
+        JobRecord(
+            job_id="job_1",
+            tenant_id="tenant_1",
+            doc_id="doc_1",
+            status="queued",
+            submitted_at=datetime.utcnow(),
+            storage_uri=storage.upload("tenant_1", "manual.pdf", pdf.read_bytes()),
+        )
+    )
+    vector_store = VectorStore(path=str(tmp_path / "chroma"), enabled=False)
+    ok = process_file(
+        ticket=ticket,
+        storage=storage,
+        embedding=embedding_factory(settings),
+        summarizer=Summarizer(settings),
+        jobs=jobs,
+        doc_service_base_url="http://documents" if http_client else None,
+        max_pages=10,
+        max_file_mb=5,
+        chunk_size=64,
+        chunk_overlap=0,
+        vector_store=vector_store,
+        product="observer",
+        version="2.1",
+        page_batch_size=2,
+        http_client=http_client,
+    )
+    return ok, jobs, vector_store
+
+
+def test_process_file_removes_written_vectors_on_failure(tmp_path):
+    # вызовы 1-2 — секции и чанки (уже записаны в vector store), 3-й — эмбеддинг документа
+    ok, jobs, vector_store = _ingest(tmp_path, lambda settings: _FailingEmbeddingClient(settings, fail_on=3))
+
+    assert not ok
+    assert jobs.get("job_1").status == "failed"
+    assert vector_store._sections == []
+    assert vector_store._chunks == []
+
+
+def test_document_service_payload_has_no_embeddings_or_vector_metadata(tmp_path):
+    posted = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        posted.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, json={})
+
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        ok, _, vector_store = _ingest(tmp_path, EmbeddingClient, http_client=client)
+
+    assert ok
+    sections = next(body["sections"] for path, body in posted if path.endswith("/sections"))
+    assert sections and all(not {"embedding", "product", "version"} & section.keys() for section in sections)
+    # фильтры Chroma по-прежнему получают product/version
+    assert vector_store._sections[0]["metadata"]["product"] == "observer"
+    assert vector_store._chunks[0]["metadata"]["version"] == "2.1"
@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+TEST_DIR = Path(__file__).parent
+ROOT = TEST_DIR.parents[2]
+sys.path.append(str(ROOT / "services" / "ingestion_service"))
+
+from ingestion_service.core.profiling import LatencyHistogram, StageProfiler  # noqa: E402
+
+
+def test_histogram_quantiles_within_bucket_precision():
+    hist = LatencyHistogram()
+    for ms in range(1, 1001):
+        hist.record(ms / 1000)
+    assert hist.count == 1000
+    assert abs(hist.quantile(0.5) - 0.5) <= 0.5 / 16
+    assert abs(hist.quantile(0.99) - 0.99) <= 0.99 / 16
+    assert hist.quantile(1.0) == 1.0
+
+
+def test_profiler_renders_prometheus_summary():
+    profiler = StageProfiler("ingestion_stage_latency_seconds")
+    with profiler.span("parse"):
+        pass
+    profiler.observe("embed", 0.25)
+    text = profiler.render_prometheus()
+    assert "# TYPE ingestion_stage_latency_seconds summary" in text
+    assert 'ingestion_stage_latency_seconds{stage="embed",quantile="0.5"} 0.250000' in text
+    assert 'ingestion_stage_latency_seconds_count{stage="parse"} 1' in text
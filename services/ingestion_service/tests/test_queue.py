@@ -0,0 +1,114 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import fakeredis
+
+TEST_DIR = Path(__file__).parent
+ROOT = TEST_DIR.parents[2]
+sys.path.append(str(ROOT / "services" / "ingestion_service"))
+
+from ingestion_service.core.queue import IngestionQueue, WorkItem  # noqa: E402
+
+
+def _queue(**kwargs) -> IngestionQueue:
+    queue = IngestionQueue(None, "test_queue", **kwargs)
+    queue._redis = fakeredis.FakeAsyncRedis()
+    return queue
+
+
+def _item(job_id: str = "job_1") -> WorkItem:
+    return WorkItem(job_id=job_id, tenant_id="tenant_1", doc_id="doc_1", storage_uri=None)
+
+
+def test_unacked_item_is_redelivered_after_visibility_timeout():
+    async def scenario():
+        crashed = _queue(visibility_timeout=0.05)
+        await crashed.enqueue(_item())
+        first = await crashed.pop(timeout=1)
+        assert first.receipt and first.attempt == 1
+        # воркер "упал" без ack; другой экземпляр забирает сообщение после таймаута
+        other = _queue(visibility_timeout=0.05)
+        other._redis = crashed._redis
+        await asyncio.sleep(0.1)
+        second = await other.pop(timeout=1)
+        assert second.job_id == "job_1" and second.attempt == 2
+        await other.ack(second)
+        assert await other.pop(timeout=0.05) is None
+
+    asyncio.run(scenario())
+
+
+def test_retry_is_delayed_and_exhausted_items_are_dead_lettered():
+    async def scenario():
+        queue = _queue(max_attempts=2)
+        await queue.enqueue(_item())
+        item = await queue.pop(timeout=1)
+        await queue.retry(item, delay=0.05)
+        assert await queue.pop(timeout=0.01) is None
+        await asyncio.sleep(0.06)
+        retried = await queue.pop(timeout=1)
+        assert retried.attempt == 2
+        await queue.dead_letter(retried, reason="max_attempts")
+        dead = await queue.dead_letters()
+        assert dead[0]["reason"] == "max_attempts"
+        assert '"job_1"' in dead[0]["payload"]
+        assert await queue.pop(timeout=0.01) is None
+
+    asyncio.run(scenario())
+
+
+def test_legacy_list_items_are_moved_to_stream():
+    async def scenario():
+        queue = _queue()
+        await queue._redis.rpush("test_queue", _item("legacy").to_json())
+        item = await queue.pop(timeout=1)
+        assert item.job_id == "legacy"
+
+    asyncio.run(scenario())
+
+
+def _tenant_item(tenant_id: str, n: int, priority: str = "interactive") -> WorkItem:
+    return WorkItem(job_id=f"{tenant_id}_{n}", tenant_id=tenant_id, doc_id=f"doc_{n}", storage_uri=None, priority=priority)
+
+
+async def _drain(queue: IngestionQueue, count: int) -> list:
+    popped = []
+    for _ in range(count):
+        item = await queue.pop(timeout=1)
+        await queue.ack(item)
+        popped.append(item)
+    return popped
+
+
+def test_tenants_are_served_round_robin_with_weights():
+    async def scenario(queue):
+        for n in range(20):
+            await queue.enqueue(_tenant_item("bulk_tenant", n))
+        await queue.enqueue(_tenant_item("small_tenant", 0))
+        await queue.enqueue(_tenant_item("vip", 0))
+        await queue.enqueue(_tenant_item("vip", 1))
+        stats = await queue.stats()
+        assert {(row["tenant_id"], row["depth"]) for row in stats["pending"]} == {("bulk_tenant", 20), ("small_tenant", 1), ("vip", 2)}
+        first = [item.tenant_id for item in await _drain(queue, 4)]
+        # одиночная загрузка не ждёт, пока разберутся 20 документов большого тенанта
+        assert "small_tenant" in first
+        assert first.count("vip") == 2
+
+    asyncio.run(scenario(IngestionQueue(None, "test_queue", tenant_weights={"vip": 2})))
+    asyncio.run(scenario(_queue(tenant_weights={"vip": 2})))
+
+
+def test_interactive_priority_outweighs_bulk_backfill():
+    async def scenario(queue):
+        for n in range(10):
+            await queue.enqueue(_tenant_item("backfill", n, priority="bulk"))
+        for n in range(4):
+            await queue.enqueue(_tenant_item("uploader", n))
+        order = [item.priority for item in await _drain(queue, 5)]
+        assert order.count("interactive") == 4
+        assert order.count("bulk") == 1
+        assert (await queue.stats())["pending"] == [{"priority": "bulk", "tenant_id": "backfill", "depth": 9}]
+
+    asyncio.run(scenario(IngestionQueue(None, "test_queue")))
+    asyncio.run(scenario(_queue()))
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+TEST_DIR = Path(__file__).parent
+ROOT = TEST_DIR.parents[2]
+sys.path.append(str(ROOT / "services" / "ingestion_service"))
+
+from ingestion_service.core.sectioning import StructureSegmenter  # noqa: E402
+
+
+def _body(words: int) -> str:
+    return " ".join(["text"] * words)
+
+
+def test_outline_titles_split_sections_and_skip_empty_pages():
+    pages = [f"Introduction\n{_body(100)}", "", f"{_body(50)}\nInstallation\n{_body(100)}", _body(100)]
+    outline = [{"title": "Introduction", "page": 1}, {"title": "Installation", "page": 3}]
+    sections = list(StructureSegmenter(outline=outline, min_section_chars=100).segment(pages))
+    assert [s.title for s in sections] == ["Introduction", "Installation"]
+    assert (sections[0].page_start, sections[0].page_end) == (1, 3)
+    assert (sections[1].page_start, sections[1].page_end) == (3, 4)
+    assert [page for page, _ in sections[1].parts] == [3, 4]
+
+
+def test_numbered_headings_and_tiny_sections_are_merged():
+    pages = [f"1 Overview\n{_body(5)}\n2 Setup\n{_body(200)}\n2.1 Configure LDAP\n{_body(200)}"]
+    sections = list(StructureSegmenter(min_section_chars=200).segment(pages))
+    # "1 Overview" слишком короткая — поглощает следующий заголовок
+    assert [s.title for s in sections] == ["1 Overview", "2.1 Configure LDAP"]
+    assert "2 Setup" in sections[0].text
+
+
+def test_pages_without_headings_accumulate_up_to_max_size():
+    pages = [_body(101)] * 5  # ~500 символов на страницу
+    sections = list(StructureSegmenter(max_section_chars=1000).segment(pages))
+    assert [(s.page_start, s.page_end) for s in sections] == [(1, 2), (3, 4), (5, 5)]
+    assert sections[0].display_title() == "Pages 1-2"
+
+
+def test_text_before_first_heading_and_after_max_size_flush_is_kept():
+    pages = [
+        f"Cover page Company ACME\n1 Overview\n{_body(60)}",
+        f"LOST continuation line\n2 Setup\n{_body(60)}",
+    ]
+    sections = list(StructureSegmenter(min_section_chars=100, max_section_chars=300).segment(pages))
+    text = "\n".join(s.text for s in sections)
+    assert "Cover page Company ACME" in text
+    assert "LOST continuation line" in text
+    assert [s.title for s in sections] == ["1 Overview", "2 Setup"]
+
+
+def test_long_preamble_becomes_untitled_section():
+    pages = [f"{_body(60)}\n1 Overview\n{_body(60)}"]
+    sections = list(StructureSegmenter(min_section_chars=100).segment(pages))
+    assert [s.display_title() for s in sections] == ["Page 1", "1 Overview"]
@@ -0,0 +1,60 @@
+import asyncio
+import sys
+from pathlib import Path
+
+TEST_DIR = Path(__file__).parent
+ROOT = TEST_DIR.parents[2]
+sys.path.append(str(ROOT / "services" / "ingestion_service"))
+
+from ingestion_service.config import Settings  # noqa: E402
+from ingestion_service.core.object_store import MIN_PART_BYTES, S3ObjectStore  # noqa: E402
+from ingestion_service.core.storage import StorageClient  # noqa: E402
+from memory_s3 import MemoryS3Client  # noqa: E402
+
+
+def test_materialize_local_uri_returns_existing_path(tmp_path):
+    storage = StorageClient(Settings(mock_mode=True, local_storage_path=tmp_path / "storage", redis_url=None))
+    uri = storage.upload("tenant_1", "guide.pdf", b"%PDF-1.4")
+    with storage.materialize(uri) as path:
+        assert path.parent.parent == (tmp_path / "storage").resolve()
+        assert path.read_bytes() == b"%PDF-1.4"
+    assert path.exists()
+
+
+def test_materialize_s3_downloads_ranges_through_object_store(tmp_path):
+    client = MemoryS3Client()
+    data = b"x" * (MIN_PART_BYTES + 10)
+    client.objects[("bucket", "tenant_1/doc.pdf")] = data
+    storage = StorageClient(
+        Settings(mock_mode=True, local_storage_path=tmp_path / "storage", redis_url=None),
+        object_store=S3ObjectStore(bucket="bucket", part_size=MIN_PART_BYTES, client=client),
+    )
+
+    def read_in_worker_thread():
+        with storage.materialize("s3://bucket/tenant_1/doc.pdf") as path:
+            return path, path.suffix, path.read_bytes()
+
+    async def scenario():
+        await storage.start()
+        uri = await asyncio.to_thread(storage.upload, "tenant_1", "notes.txt", b"tiny")
+        return uri, await asyncio.to_thread(read_in_worker_thread)
+
+    uri, (path, suffix, content) = asyncio.run(scenario())
+    assert suffix == ".pdf"
+    assert content == data
+    assert client.calls.count("get_object") == 2  # два ranged GET по part_size
+    assert not path.exists()
+    assert uri.startswith("s3://bucket/tenant_1/") and client.objects[("bucket", uri[len("s3://bucket/"):])] == b"tiny"
+
+
+def test_sync_s3_call_without_started_loop_fails_fast(tmp_path):
+    storage = StorageClient(
+        Settings(mock_mode=True, local_storage_path=tmp_path / "storage", redis_url=None),
+        object_store=S3ObjectStore(bucket="bucket", client=MemoryS3Client()),
+    )
+    try:
+        storage.upload("tenant_1", "doc.pdf", b"x")
+    except RuntimeError:
+        pass
+    else:  # pragma: no cover
+        raise AssertionError("expected RuntimeError")
@@ -6,6 +6,7 @@ import httpx
 from fastapi import HTTPException, status
 
 from llm_service.config import Settings
+from llm_service.deadline import deadline_headers, hop_timeout
 
 
 class MCPClient:
@@ -25,7 +26,12 @@ class MCPClient:
             "trace_id": trace_id,
         }
         try:
-            response = await self.http_client.post(self.settings.mcp_proxy_url, json=payload)
+            response = await self.http_client.post(
+                self.settings.mcp_proxy_url,
+                json=payload,
+                headers=deadline_headers(),
+                timeout=hop_timeout(self.settings.http_timeout_seconds),
+            )
             response.raise_for_status()
             return response.json()
         except httpx.HTTPError as exc:  # pragma: no cover
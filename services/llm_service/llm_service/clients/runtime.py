@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 import structlog
 from fastapi import HTTPException, status
 
 from llm_service.config import Settings
+from llm_service.deadline import hop_timeout
 
 
 @dataclass
@@ -18,6 +19,8 @@ class LLMRuntimeResult:
     tool_name: Optional[str]
     tool_arguments: Optional[Dict[str, Any]]
     usage: Dict[str, int]
+    # все tool calls ответа как (name, arguments); tool_name/tool_arguments — первый из них
+    tool_calls: List[Tuple[Optional[str], Any]] = field(default_factory=list)
 
 
 class LLMRuntimeClient:
@@ -34,7 +37,9 @@ class LLMRuntimeClient:
             raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="LLM runtime URL not configured")
         headers = self._build_auth_headers()
         try:
-            response = await self.http_client.post(runtime_url, json=payload, headers=headers)
+            response = await self.http_client.post(
+                runtime_url, json=payload, headers=headers, timeout=hop_timeout(self.settings.http_timeout_seconds)
+            )
             response.raise_for_status()
             try:
                 data = response.json()
@@ -104,15 +109,19 @@ class LLMRuntimeClient:
 
     def _map_choice(self, choice: Dict[str, Any], usage: Dict[str, Any]) -> LLMRuntimeResult:
         message = choice.get("message", {})
-        tool_call = message.get("tool_calls", [{}])[-1] if message.get("tool_calls") else None
-        if tool_call:
-            arguments = tool_call.get("function", {}).get("arguments", "{}")
+        tool_calls = [
+            (call.get("function", {}).get("name"), call.get("function", {}).get("arguments", "{}"))
+            for call in message.get("tool_calls") or []
+            if call
+        ]
+        if tool_calls:
             return LLMRuntimeResult(
                 type="tool_call",
                 content=None,
-                tool_name=tool_call.get("function", {}).get("name"),
-                tool_arguments=arguments,
+                tool_name=tool_calls[0][0],
+                tool_arguments=tool_calls[0][1],
                 usage={"prompt_tokens": usage.get("prompt_tokens", 0), "completion_tokens": usage.get("completion_tokens", 0)},
+                tool_calls=tool_calls,
             )
         return LLMRuntimeResult(
             type="message",
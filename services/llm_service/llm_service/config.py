@@ -15,8 +15,14 @@ class Settings(BaseSettings):
     runtime_api_key: str | None = None
     default_model: str = "openai/gpt-5-mini"
     max_tool_steps: int = 10
+    max_parallel_tool_calls: int = 4
     enable_json_mode: bool = True
     mcp_proxy_url: str | None = None
+    http_timeout_seconds: float = 60.0  # потолок на один hop; дедлайн запроса может только сократить
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2: bool = True  # действует, только если установлен пакет h2
     mock_mode: bool = False
 
 
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 from fastapi import HTTPException, status
@@ -30,23 +32,25 @@ class LLMOrchestrator:
         result = await self.runtime.chat_completion(payload)
         usage = result.usage or {}
         if result.type == "tool_call":
-            # Return minimal OpenAI-compatible tool_call response
-            args = result.tool_arguments
-            if isinstance(args, dict):
-                try:
-                    import json
-                    args = json.dumps(args)
-                except Exception:
-                    args = "{}"
-            tool_call = {
-                "id": "call_0",
-                "type": "function",
-                "function": {
-                    "name": result.tool_name or "unknown",
-                    "arguments": args or "{}",
-                },
-            }
-            message = {"role": "assistant", "content": None, "tool_calls": [tool_call]}
+            # Return minimal OpenAI-compatible tool_call response (all calls of the turn)
+            tool_calls = []
+            for index, (name, args) in enumerate(self._tool_calls(result)):
+                if isinstance(args, dict):
+                    try:
+                        args = json.dumps(args)
+                    except Exception:
+                        args = "{}"
+                tool_calls.append(
+                    {
+                        "id": f"call_{index}",
+                        "type": "function",
+                        "function": {
+                            "name": name or "unknown",
+                            "arguments": args or "{}",
+                        },
+                    }
+                )
+            message = {"role": "assistant", "content": None, "tool_calls": tool_calls}
         else:
             message = {"role": "assistant", "content": result.content}
         return {
@@ -87,22 +91,24 @@ class LLMOrchestrator:
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail={"code": "LLM_LIMIT_EXCEEDED", "message": "Tool-call limit reached"},
                     )
-                tool_result = await self._execute_tool(result, request, trace_id)
-                tool_state.traces.append(
-                    ToolCallTrace(
-                        name=result.tool_name or "unknown",
-                        arguments=result.tool_arguments or {},
-                        result_summary=str(tool_result.get("result")),
+                calls = self._tool_calls(result)
+                tool_results = await self._execute_tools(calls, trace_id)
+                for (name, arguments), tool_result in zip(calls, tool_results):
+                    tool_state.traces.append(
+                        ToolCallTrace(
+                            name=name or "unknown",
+                            arguments=arguments or {},
+                            result_summary=str(tool_result.get("result")),
+                        )
+                    )
+                    messages.append(
+                        {
+                            "role": "assistant",
+                            "content": f"TOOL_RESULT:{tool_result.get('result')}"
+                            if tool_result.get("status") == "ok"
+                            else f"TOOL_ERROR:{tool_result.get('error')}",
+                        }
                     )
-                )
-                messages.append(
-                    {
-                        "role": "assistant",
-                        "content": f"TOOL_RESULT:{tool_result.get('result')}"
-                        if tool_result.get("status") == "ok"
-                        else f"TOOL_ERROR:{tool_result.get('error')}",
-                    }
-                )
                 continue
 
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"code": "LLM_LOOP", "message": "No final answer"})
@@ -131,8 +137,22 @@ class LLMOrchestrator:
             payload["response_format"] = {"type": "json_object"}
         return payload
 
-    async def _execute_tool(self, result: LLMRuntimeResult, request: GenerateRequest, trace_id: str) -> Dict[str, Any]:
-        tool_name = result.tool_name or "unknown"
-        arguments = result.tool_arguments or {}
+    @staticmethod
+    def _tool_calls(result: LLMRuntimeResult) -> List[Tuple[Optional[str], Any]]:
+        return result.tool_calls or [(result.tool_name, result.tool_arguments)]
+
+    async def _execute_tools(self, calls: List[Tuple[Optional[str], Any]], trace_id: str) -> List[Dict[str, Any]]:
+        """All tool calls of one turn run concurrently, at most ``max_parallel_tool_calls`` at a time."""
+        if len(calls) == 1:
+            return [await self._execute_tool(calls[0][0], calls[0][1], trace_id)]
+        semaphore = asyncio.Semaphore(max(1, self.settings.max_parallel_tool_calls))
+
+        async def run(name: Optional[str], arguments: Any) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._execute_tool(name, arguments, trace_id)
+
+        return list(await asyncio.gather(*(run(name, arguments) for name, arguments in calls)))
+
+    async def _execute_tool(self, tool_name: Optional[str], arguments: Any, trace_id: str) -> Dict[str, Any]:
         user_claim = {"user_id": "llm", "tenant_id": "tenant"}
-        return await self.mcp.execute(tool_name, arguments, user_claim, trace_id)
+        return await self.mcp.execute(tool_name or "unknown", arguments or {}, user_claim, trace_id)
@@ -1,9 +1,11 @@
 from contextlib import asynccontextmanager
 
-import httpx
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from llm_service.config import get_settings
+from llm_service.deadline import DeadlineExceeded, DeadlineMiddleware, deadline_exceeded_handler
+from llm_service.http_client import PoolMetrics, create_http_client
 from llm_service.core.orchestrator import LLMOrchestrator
 from llm_service.logging import configure_logging
 from llm_service.routers import llm
@@ -14,16 +16,32 @@ configure_logging(settings.log_level)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with httpx.AsyncClient() as client:
+    metrics = PoolMetrics()
+    async with create_http_client(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        http2=settings.http2,
+        metrics=metrics,
+        timeout=settings.http_timeout_seconds,
+    ) as client:
+        app.state.http_metrics = metrics
         app.state.orchestrator = LLMOrchestrator(settings, client)
         app.state.settings = settings
         yield
 
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
+app.add_middleware(DeadlineMiddleware)
+app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
 app.include_router(llm.router)
 
 
 @app.get("/health", tags=["health"])
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics() -> str:
+    return app.state.http_metrics.render_prometheus()
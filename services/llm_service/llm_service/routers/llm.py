@@ -3,6 +3,7 @@ from typing import Any, Dict
 from fastapi import APIRouter, Depends, Request
 
 from llm_service.core.orchestrator import LLMOrchestrator
+from llm_service.deadline import within_deadline
 from llm_service.schemas import GenerateRequest, GenerateResponse
 
 router = APIRouter(prefix="/internal/llm", tags=["llm"])
@@ -22,9 +23,9 @@ async def generate(
 ):
     # If payload looks like OpenAI chat, proxy it; otherwise, treat as legacy GenerateRequest
     if "model" in payload and "messages" in payload and "system_prompt" not in payload:
-        return await orchestrator.chat_proxy(payload)
+        return await within_deadline(orchestrator.chat_proxy(payload))
     request = GenerateRequest(**payload)
-    return await orchestrator.generate(request)
+    return await within_deadline(orchestrator.generate(request))
 
 
 @router.get("/config")
@@ -54,3 +54,36 @@ def test_generate_accepts_openai_chat_payload():
         assert "choices" in body
         assert "usage" in body
         assert body["choices"][0]["message"]["role"] == "assistant"
+
+
+def test_chat_proxy_returns_all_tool_calls():
+    import asyncio
+
+    import httpx
+
+    from llm_service.config import Settings
+    from llm_service.core.orchestrator import LLMOrchestrator
+
+    async def scenario():
+        async with httpx.AsyncClient() as client:
+            orchestrator = LLMOrchestrator(Settings(mock_mode=False), client)
+            choice = {
+                "message": {
+                    "tool_calls": [
+                        {"function": {"name": "read_doc_section", "arguments": '{"doc_id": "d", "section_id": "s1"}'}},
+                        {"function": {"name": "read_doc_section", "arguments": '{"doc_id": "d", "section_id": "s2"}'}},
+                    ]
+                }
+            }
+            result = orchestrator.runtime._map_choice(choice, {})
+
+            async def fake_chat(payload):
+                return result
+
+            orchestrator.runtime.chat_completion = fake_chat
+            return await orchestrator.chat_proxy({"messages": []})
+
+    body = asyncio.run(scenario())
+    calls = body["choices"][0]["message"]["tool_calls"]
+    assert [call["id"] for call in calls] == ["call_0", "call_1"]
+    assert [call["function"]["arguments"] for call in calls] == ['{"doc_id": "d", "section_id": "s1"}', '{"doc_id": "d", "section_id": "s2"}']
@@ -4,18 +4,30 @@ from typing import Any, Dict
 
 import httpx
 from fastapi import HTTPException, status
+from mcp_tools_proxy.deadline import DeadlineExceeded, deadline_headers, hop_timeout
+from mcp_tools_proxy.http_client import create_http_client
 from mcp_tools_proxy.logging import get_logger
 
 
 class RetrievalClient:
     """Lightweight client for Retrieval Service chunk window endpoint."""
 
-    def __init__(self, chunk_window_url: str, timeout: float = 10.0, transport: httpx.BaseTransport | None = None) -> None:
+    def __init__(
+        self,
+        chunk_window_url: str,
+        timeout: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
         self.chunk_window_url = chunk_window_url.rstrip("/")
         self.timeout = timeout
-        self._transport = transport
+        # один keep-alive пул на всё время жизни клиента вместо нового соединения на каждый вызов
+        self.http_client = http_client or create_http_client(transport=transport)
         self._logger = get_logger(__name__)
 
+    async def aclose(self) -> None:
+        await self.http_client.aclose()
+
     async def fetch_chunk_window(
         self,
         *,
@@ -45,8 +57,14 @@ class RetrievalClient:
             trace_id=trace_id,
         )
         try:
-            async with httpx.AsyncClient(transport=self._transport) as client:
-                resp = await client.post(self.chunk_window_url, json=payload, timeout=self.timeout)
+            resp = await self.http_client.post(
+                self.chunk_window_url, json=payload, headers=deadline_headers(), timeout=hop_timeout(self.timeout)
+            )
+        except (DeadlineExceeded, httpx.TimeoutException) as exc:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail={"code": "deadline_exceeded", "message": str(exc)},
+            ) from exc
         except httpx.HTTPError as exc:  # pragma: no cover - network path
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
@@ -20,6 +20,10 @@ class Settings(BaseSettings):
     mock_mode: bool = True
     retrieval_window_url: str | None = None
     retrieval_timeout: float = 5.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2: bool = True  # действует, только если установлен пакет h2
     max_window_radius: int | None = Field(
         default=None,
         ge=0,
@@ -8,6 +8,7 @@ from fastapi import HTTPException, status
 from mcp_tools_proxy.clients.documents import DocumentRepository
 from mcp_tools_proxy.clients.retrieval import RetrievalClient
 from mcp_tools_proxy.config import Settings
+from mcp_tools_proxy.http_client import PoolMetrics, create_http_client
 from mcp_tools_proxy.core.rate_limit import ToolRateLimiter
 from mcp_tools_proxy.logging import get_logger
 from mcp_tools_proxy.schemas import MCPExecuteRequest, MCPExecuteResponse, MCPError, ToolExecutionContext
@@ -24,8 +25,9 @@ class ToolRegistry:
     def __init__(self, settings: Settings, retrieval_client: RetrievalClient | None = None) -> None:
         self.settings = settings
         self.repository = DocumentRepository(mock_mode=settings.mock_mode)
+        self.http_metrics = PoolMetrics()
         self.retrieval_client = retrieval_client or (
-            RetrievalClient(settings.retrieval_window_url, timeout=settings.retrieval_timeout)
+            RetrievalClient(settings.retrieval_window_url, timeout=settings.retrieval_timeout, http_client=self._create_http_client())
             if settings.retrieval_window_url
             else None
         )
@@ -34,6 +36,20 @@ class ToolRegistry:
         self.rate_limiter = ToolRateLimiter(settings.rate_limit_calls, settings.rate_limit_tokens)
         self._logger = get_logger(__name__)
 
+    def _create_http_client(self):
+        return create_http_client(
+            max_connections=self.settings.http_max_connections,
+            max_keepalive_connections=self.settings.http_max_keepalive_connections,
+            keepalive_expiry=self.settings.http_keepalive_expiry_seconds,
+            http2=self.settings.http2,
+            metrics=self.http_metrics,
+        )
+
+    async def aclose(self) -> None:
+        close = getattr(self.retrieval_client, "aclose", None)
+        if close is not None:
+            await close()
+
     def _init_tools(self) -> None:
         tool_classes = [
             ReadDocSectionTool,
@@ -1,14 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from mcp_tools_proxy.config import get_settings
 from mcp_tools_proxy.core.executor import ToolRegistry
+from mcp_tools_proxy.deadline import DeadlineMiddleware
 from mcp_tools_proxy.logging import configure_logging
 from mcp_tools_proxy.routers import mcp
 
 settings = get_settings()
 configure_logging(settings.log_level)
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await app.state.tool_registry.aclose()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
+app.add_middleware(DeadlineMiddleware)
 app.include_router(mcp.router)
 app.state.tool_registry = ToolRegistry(settings)
 
@@ -16,3 +28,8 @@ app.state.tool_registry = ToolRegistry(settings)
 @app.get("/health", tags=["health"])
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics() -> str:
+    return app.state.tool_registry.http_metrics.render_prometheus()
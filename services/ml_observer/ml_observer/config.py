@@ -17,12 +17,23 @@ class Settings(BaseSettings):
     allowed_tenant: str = "observer_tenant"
 
     db_dsn: str = "sqlite+aiosqlite:///./ml_observer.db"
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
+    db_pool_recycle_seconds: int = 1800
+    db_pool_timeout_seconds: float = 30.0
+    db_statement_cache_size: int = 500
+    db_auto_migrate: Optional[bool] = None  # None — как mock_mode: в prod миграции запускаются отдельным шагом
 
     ingestion_base_url: Optional[str] = None
     document_base_url: Optional[str] = None
     retrieval_base_url: Optional[str] = None
     llm_base_url: Optional[str] = None
     orchestrator_base_url: Optional[str] = None
+    http_timeout_seconds: float = 120.0  # таймаут и дедлайн (X-Request-Deadline) прокси-вызовов
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2: bool = True  # действует, только если установлен пакет h2
 
     minio_endpoint: Optional[str] = None
     minio_bucket: Optional[str] = None
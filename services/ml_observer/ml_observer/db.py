@@ -1,16 +1,42 @@
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-from ml_observer.models import Base
+from ml_observer.migrations import pending, upgrade
 
 
-def create_engine(dsn: str) -> AsyncEngine:
-    return create_async_engine(dsn, pool_pre_ping=True, future=True)
+def create_engine(
+    dsn: str,
+    pool_size: int = 10,
+    max_overflow: int = 10,
+    pool_recycle: int = 1800,
+    pool_timeout: float = 30.0,
+    statement_cache_size: int = 500,
+) -> AsyncEngine:
+    """Async engine с настраиваемым пулом; для asyncpg — кэш prepared statements на соединение.
+
+    Для SQLite параметры пула не применяются (aiosqlite работает со своим пулом SQLAlchemy).
+    ``statement_cache_size=0`` отключает prepared statements (нужно за pgbouncer в transaction mode).
+    """
+    url = make_url(dsn)
+    kwargs: dict = {"pool_pre_ping": True}
+    if url.get_backend_name() != "sqlite":
+        kwargs.update(pool_size=pool_size, max_overflow=max_overflow, pool_recycle=pool_recycle, pool_timeout=pool_timeout)
+    if url.get_driver_name() == "asyncpg":
+        kwargs["connect_args"] = {"prepared_statement_cache_size": statement_cache_size}
+    return create_async_engine(url, **kwargs)
 
 
 def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(engine, expire_on_commit=False)
 
 
-async def init_db(engine: AsyncEngine) -> None:
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+async def init_db(engine: AsyncEngine, auto_migrate: bool = True) -> None:
+    """Применяет миграции (``auto_migrate``) или проверяет, что схема актуальна."""
+    if auto_migrate:
+        await upgrade(engine)
+        return
+    missing = await pending(engine)
+    if missing:
+        raise RuntimeError(
+            "Database schema is out of date, run `python -m ml_observer.migrations`: " + ", ".join(missing)
+        )
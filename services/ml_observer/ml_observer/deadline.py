@@ -0,0 +1,120 @@
+"""Дедлайн запроса, передаваемый между сервисами в заголовке ``X-Request-Deadline``.
+
+API Gateway выставляет абсолютный дедлайн (UNIX time в секундах) каждому запросу. Остальные
+сервисы читают его в ``DeadlineMiddleware``, ограничивают оставшимся бюджетом таймауты исходящих
+вызовов (``hop_timeout``) и передают заголовок дальше (``deadline_headers``). Запрос, пришедший
+с уже истёкшим дедлайном, отклоняется с ``504`` без выполнения.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+DEADLINE_HEADER = "X-Request-Deadline"
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Deadline:
+    at: float  # UNIX time, секунды
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.time() + seconds)
+
+    @classmethod
+    def from_header(cls, value: Optional[str]) -> Optional["Deadline"]:
+        if not value:
+            return None
+        try:
+            return cls(float(value))
+        except ValueError:
+            return None
+
+    def remaining(self) -> float:
+        return self.at - time.time()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def header_value(self) -> str:
+        return f"{self.at:.3f}"
+
+
+class DeadlineExceeded(Exception):
+    """Бюджет запроса исчерпан."""
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+def remaining_budget() -> Optional[float]:
+    deadline = _current_deadline.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def hop_timeout(cap: Optional[float]) -> Optional[float]:
+    """Таймаут исходящего вызова: ``cap``, но не больше оставшегося бюджета запроса."""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return cap
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded("request deadline exceeded")
+    return remaining if cap is None else min(cap, remaining)
+
+
+def deadline_headers() -> Dict[str, str]:
+    deadline = _current_deadline.get()
+    return {DEADLINE_HEADER: deadline.header_value()} if deadline is not None else {}
+
+
+async def within_deadline(awaitable: Awaitable[T]) -> T:
+    """Ждёт ``awaitable`` не дольше оставшегося бюджета; по истечении отменяет его (вместе со всеми
+    исходящими вызовами) и поднимает ``DeadlineExceeded``."""
+    remaining = remaining_budget()
+    if remaining is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout=max(0.0, remaining))
+    except asyncio.TimeoutError as exc:
+        raise DeadlineExceeded("request deadline exceeded") from exc
+
+
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded) -> JSONResponse:
+    return JSONResponse(status_code=504, content={"detail": str(exc) or "request deadline exceeded"})
+
+
+class DeadlineMiddleware(BaseHTTPMiddleware):
+    """Делает дедлайн входящего запроса текущим; ``budget_seconds`` (только у Gateway) задаёт
+    дедлайн запросам без заголовка и сокращает слишком далёкий входящий."""
+
+    def __init__(self, app, budget_seconds: float = 0.0) -> None:
+        super().__init__(app)
+        self.budget_seconds = budget_seconds
+
+    async def dispatch(self, request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        deadline = Deadline.from_header(request.headers.get(DEADLINE_HEADER))
+        if self.budget_seconds > 0:
+            own = Deadline.after(self.budget_seconds)
+            deadline = own if deadline is None or deadline.at > own.at else deadline
+        if deadline is not None and deadline.expired():
+            return JSONResponse(status_code=504, content={"detail": "request deadline exceeded"})
+        token = _current_deadline.set(deadline)
+        try:
+            return await call_next(request)
+        finally:
+            _current_deadline.reset(token)
@@ -2,10 +2,14 @@ from __future__ import annotations
 
 from contextlib import asynccontextmanager
 
+import httpx
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from ml_observer.config import Settings, get_settings
 from ml_observer.db import create_engine, create_session_factory, init_db
+from ml_observer.deadline import DEADLINE_HEADER, Deadline
+from ml_observer.http_client import PoolMetrics, create_http_client
 from ml_observer.logging import configure_logging, get_logger
 from ml_observer.routers import observer, ui
 
@@ -26,7 +30,14 @@ def ensure_runtime_configuration(current: Settings) -> None:
 
 ensure_runtime_configuration(settings)
 
-engine = create_engine(settings.db_dsn)
+engine = create_engine(
+    settings.db_dsn,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    pool_timeout=settings.db_pool_timeout_seconds,
+    statement_cache_size=settings.db_statement_cache_size,
+)
 SessionLocal = create_session_factory(engine)
 
 logger.info(
@@ -36,12 +47,31 @@ logger.info(
 )
 
 
+async def stamp_deadline(request: httpx.Request) -> None:
+    # Observer вызывает сервисы мимо Gateway, поэтому дедлайн прокси-вызовам задаёт сам
+    if DEADLINE_HEADER not in request.headers:
+        request.headers[DEADLINE_HEADER] = Deadline.after(settings.http_timeout_seconds).header_value()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db(engine)
+    auto_migrate = settings.mock_mode if settings.db_auto_migrate is None else settings.db_auto_migrate
+    await init_db(engine, auto_migrate=auto_migrate)
     app.state.session_factory = SessionLocal
     app.state.settings = settings
-    yield
+    metrics = PoolMetrics()
+    async with create_http_client(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        http2=settings.http2,
+        metrics=metrics,
+        timeout=settings.http_timeout_seconds,
+    ) as client:
+        client.event_hooks["request"].append(stamp_deadline)
+        app.state.http_client = client
+        app.state.http_metrics = metrics
+        yield
     await engine.dispose()
 
 
@@ -53,3 +83,8 @@ app.include_router(ui.router)
 @app.get("/health", tags=["health"])
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["health"])
+async def metrics() -> str:
+    return app.state.http_metrics.render_prometheus()
@@ -0,0 +1,102 @@
+"""Версионированные миграции схемы ML Observer.
+
+Применённые версии хранятся в таблице ``schema_migrations``. Запуск перед стартом сервиса:
+``python -m ml_observer.migrations [--dsn ...]``; при ``OBS_DB_AUTO_MIGRATE=true``
+(по умолчанию в mock-режиме) сервис применяет их сам в lifespan, иначе только проверяет,
+что схема актуальна.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, List
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ml_observer import models
+
+ADVISORY_LOCK_ID = 0x6F627376  # "obsv": сериализует параллельные migrate с нескольких реплик
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String(64), primary_key=True),
+    Column("applied_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: str
+    apply: Callable[[Connection], None]
+
+
+def _initial_schema(conn: Connection) -> None:
+    # checkfirst: базы, созданные прежним create_all на старте, принимаются как есть
+    tables = [models.Experiment.__table__, models.ExperimentRun.__table__, models.ObservedDocument.__table__]
+    models.Base.metadata.create_all(conn, tables=tables, checkfirst=True)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration("0001_initial_schema", _initial_schema),
+]
+
+
+def _applied(conn: Connection) -> set[str]:
+    if not inspect(conn).has_table(schema_migrations.name):
+        return set()
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def _upgrade(conn: Connection) -> List[str]:
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": ADVISORY_LOCK_ID})
+    schema_migrations.create(conn, checkfirst=True)
+    applied = _applied(conn)
+    done: List[str] = []
+    for migration in MIGRATIONS:
+        if migration.version in applied:
+            continue
+        migration.apply(conn)
+        conn.execute(schema_migrations.insert().values(version=migration.version))
+        done.append(migration.version)
+    return done
+
+
+async def upgrade(engine: AsyncEngine) -> List[str]:
+    """Применяет недостающие миграции одной транзакцией, возвращает их версии."""
+    async with engine.begin() as conn:
+        return await conn.run_sync(_upgrade)
+
+
+async def pending(engine: AsyncEngine) -> List[str]:
+    async with engine.connect() as conn:
+        applied = await conn.run_sync(_applied)
+    return [migration.version for migration in MIGRATIONS if migration.version not in applied]
+
+
+def main() -> None:
+    from ml_observer.config import get_settings
+    from ml_observer.db import create_engine
+
+    parser = argparse.ArgumentParser(description="Apply ML Observer schema migrations")
+    parser.add_argument("--dsn", default=None, help="SQLAlchemy async DSN (по умолчанию OBS_DB_DSN)")
+    args = parser.parse_args()
+
+    async def run() -> None:
+        engine = create_engine(args.dsn or get_settings().db_dsn)
+        try:
+            applied = await upgrade(engine)
+        finally:
+            await engine.dispose()
+        print("applied: " + (", ".join(applied) if applied else "nothing, schema is up to date"))
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -41,6 +41,10 @@ def get_tenant_id(request: Request) -> str:
     return tenant_id
 
 
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http_client
+
+
 def get_settings(request: Request) -> Settings:
     settings = getattr(request.app.state, "settings", None)
     if not settings:
@@ -111,26 +115,26 @@ async def get_document(
 async def proxy_ingestion_enqueue(
     file: UploadFile = File(...),
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ) -> DocumentStatus:
     if not settings.ingestion_base_url:
         raise HTTPException(status_code=503, detail="ingestion_not_configured")
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            resp = await client.post(
-                f"{settings.ingestion_base_url}/internal/ingestion/enqueue",
-                files={"file": (file.filename, await file.read(), file.content_type or "application/octet-stream")},
-                headers={"X-Tenant-ID": tenant_id},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            return DocumentStatus(
-                doc_id=data["doc_id"],
-                status=data.get("status", "queued"),
-                storage_uri=data.get("storage_uri"),
-                experiment_id=None,
-                meta={"job_id": data.get("job_id")},
-            )
+        resp = await client.post(
+            f"{settings.ingestion_base_url}/internal/ingestion/enqueue",
+            files={"file": (file.filename, await file.read(), file.content_type or "application/octet-stream")},
+            headers={"X-Tenant-ID": tenant_id},
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        return DocumentStatus(
+            doc_id=data["doc_id"],
+            status=data.get("status", "queued"),
+            storage_uri=data.get("storage_uri"),
+            experiment_id=None,
+            meta={"job_id": data.get("job_id")},
+        )
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -141,6 +145,7 @@ async def proxy_ingestion_enqueue(
 async def proxy_ingestion_status(
     payload: dict,
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ) -> DocumentStatus:
     if not settings.ingestion_base_url:
@@ -150,27 +155,26 @@ async def proxy_ingestion_status(
         raise HTTPException(status_code=400, detail="job_id required")
     override_status = payload.get("status")
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            if override_status:
-                resp = await client.post(
-                    f"{settings.ingestion_base_url}/internal/ingestion/status",
-                    json={"job_id": job_id, "status": override_status},
-                    headers={"X-Tenant-ID": tenant_id},
-                )
-                resp.raise_for_status()
-            job_resp = await client.get(
-                f"{settings.ingestion_base_url}/internal/ingestion/jobs/{job_id}",
+        if override_status:
+            resp = await client.post(
+                f"{settings.ingestion_base_url}/internal/ingestion/status",
+                json={"job_id": job_id, "status": override_status},
                 headers={"X-Tenant-ID": tenant_id},
             )
-            job_resp.raise_for_status()
-            data = job_resp.json()
-            return DocumentStatus(
-                doc_id=data["doc_id"],
-                status=data.get("status"),
-                storage_uri=data.get("storage_uri"),
-                experiment_id=None,
-                meta={"job_id": job_id, "logs": data.get("logs", []), "error": data.get("error")},
-            )
+            resp.raise_for_status()
+        job_resp = await client.get(
+            f"{settings.ingestion_base_url}/internal/ingestion/jobs/{job_id}",
+            headers={"X-Tenant-ID": tenant_id},
+        )
+        job_resp.raise_for_status()
+        data = job_resp.json()
+        return DocumentStatus(
+            doc_id=data["doc_id"],
+            status=data.get("status"),
+            storage_uri=data.get("storage_uri"),
+            experiment_id=None,
+            meta={"job_id": job_id, "logs": data.get("logs", []), "error": data.get("error")},
+        )
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -183,6 +187,7 @@ async def list_documents(
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.document_base_url:
@@ -190,14 +195,13 @@ async def list_documents(
     params = {"status": status_filter, "limit": limit, "offset": offset}
     params = {k: v for k, v in params.items() if v is not None}
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            resp = await client.get(
-                f"{settings.document_base_url}/internal/documents",
-                params=params,
-                headers={"X-Tenant-ID": tenant_id},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await client.get(
+            f"{settings.document_base_url}/internal/documents",
+            params=params,
+            headers={"X-Tenant-ID": tenant_id},
+        )
+        resp.raise_for_status()
+        return resp.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -207,18 +211,18 @@ async def list_documents(
 @router.get("/summarizer/config")
 async def get_summarizer_config(
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.ingestion_base_url:
         raise HTTPException(status_code=503, detail="ingestion_not_configured")
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            resp = await client.get(
-                f"{settings.ingestion_base_url}/internal/ingestion/summarizer/config",
-                headers={"X-Tenant-ID": tenant_id},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await client.get(
+            f"{settings.ingestion_base_url}/internal/ingestion/summarizer/config",
+            headers={"X-Tenant-ID": tenant_id},
+        )
+        resp.raise_for_status()
+        return resp.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -229,19 +233,19 @@ async def get_summarizer_config(
 async def update_summarizer_config(
     payload: dict,
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.ingestion_base_url:
         raise HTTPException(status_code=503, detail="ingestion_not_configured")
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            resp = await client.post(
-                f"{settings.ingestion_base_url}/internal/ingestion/summarizer/config",
-                json=payload,
-                headers={"X-Tenant-ID": tenant_id},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await client.post(
+            f"{settings.ingestion_base_url}/internal/ingestion/summarizer/config",
+            json=payload,
+            headers={"X-Tenant-ID": tenant_id},
+        )
+        resp.raise_for_status()
+        return resp.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -251,18 +255,18 @@ async def update_summarizer_config(
 @router.get("/chunking/config")
 async def get_chunking_config(
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.ingestion_base_url:
         raise HTTPException(status_code=503, detail="ingestion_not_configured")
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            resp = await client.get(
-                f"{settings.ingestion_base_url}/internal/ingestion/chunking/config",
-                headers={"X-Tenant-ID": tenant_id},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await client.get(
+            f"{settings.ingestion_base_url}/internal/ingestion/chunking/config",
+            headers={"X-Tenant-ID": tenant_id},
+        )
+        resp.raise_for_status()
+        return resp.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -273,19 +277,19 @@ async def get_chunking_config(
 async def update_chunking_config(
     payload: dict,
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.ingestion_base_url:
         raise HTTPException(status_code=503, detail="ingestion_not_configured")
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            resp = await client.post(
-                f"{settings.ingestion_base_url}/internal/ingestion/chunking/config",
-                json=payload,
-                headers={"X-Tenant-ID": tenant_id},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await client.post(
+            f"{settings.ingestion_base_url}/internal/ingestion/chunking/config",
+            json=payload,
+            headers={"X-Tenant-ID": tenant_id},
+        )
+        resp.raise_for_status()
+        return resp.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -296,18 +300,18 @@ async def update_chunking_config(
 async def get_document_tree(
     doc_id: str,
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.ingestion_base_url:
         raise HTTPException(status_code=503, detail="ingestion_not_configured")
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            resp = await client.get(
-                f"{settings.ingestion_base_url}/internal/ingestion/documents/{doc_id}/tree",
-                headers={"X-Tenant-ID": tenant_id},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await client.get(
+            f"{settings.ingestion_base_url}/internal/ingestion/documents/{doc_id}/tree",
+            headers={"X-Tenant-ID": tenant_id},
+        )
+        resp.raise_for_status()
+        return resp.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -318,18 +322,18 @@ async def get_document_tree(
 async def get_document_detail(
     doc_id: str,
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.document_base_url:
         raise HTTPException(status_code=503, detail="document_service_not_configured")
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            resp = await client.get(
-                f"{settings.document_base_url}/internal/documents/{doc_id}",
-                headers={"X-Tenant-ID": tenant_id},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await client.get(
+            f"{settings.document_base_url}/internal/documents/{doc_id}",
+            headers={"X-Tenant-ID": tenant_id},
+        )
+        resp.raise_for_status()
+        return resp.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -363,6 +367,7 @@ async def llm_dry_run(
     repo: ObserverRepository = Depends(get_repository),
     tenant_id: str = Depends(get_tenant_id),
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
 ) -> LLMDryRunResponse:
     if settings.llm_base_url:
         try:
@@ -373,21 +378,20 @@ async def llm_dry_run(
                 "context": ctx_chunks,
                 "tools": [],
             }
-            async with httpx.AsyncClient(timeout=None) as client:
-                resp = await client.post(f"{settings.llm_base_url}/internal/llm/generate", json=body)
-                resp.raise_for_status()
-                data = resp.json()
-                answer = ""
-                if isinstance(data, dict):
-                    message = data.get("choices", [{}])[0].get("message", {}) if data.get("choices") else {}
-                    answer = message.get("content", "") or data.get("answer", "")
-                return LLMDryRunResponse(
-                    run_id=uuid4().hex,
-                    status="completed",
-                    answer=answer or "OK",
-                    usage=data.get("usage", {}) if isinstance(data, dict) else {},
-                    metadata=payload.metadata,
-                )
+            resp = await client.post(f"{settings.llm_base_url}/internal/llm/generate", json=body)
+            resp.raise_for_status()
+            data = resp.json()
+            answer = ""
+            if isinstance(data, dict):
+                message = data.get("choices", [{}])[0].get("message", {}) if data.get("choices") else {}
+                answer = message.get("content", "") or data.get("answer", "")
+            return LLMDryRunResponse(
+                run_id=uuid4().hex,
+                status="completed",
+                answer=answer or "OK",
+                usage=data.get("usage", {}) if isinstance(data, dict) else {},
+                metadata=payload.metadata,
+            )
         except httpx.HTTPStatusError as exc:
             raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
         except Exception as exc:
@@ -419,6 +423,7 @@ async def llm_dry_run(
 async def retrieval_search(
     payload: RetrievalSearchRequest,
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.retrieval_base_url:
@@ -440,11 +445,9 @@ async def retrieval_search(
         "rerank_enabled": payload.rerank_enabled,
     }
     try:
-        timeout = None
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(f"{settings.retrieval_base_url}/internal/retrieval/search", json=body)
-            resp.raise_for_status()
-            return resp.json()
+        resp = await client.post(f"{settings.retrieval_base_url}/internal/retrieval/search", json=body)
+        resp.raise_for_status()
+        return resp.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -454,18 +457,18 @@ async def retrieval_search(
 @router.get("/retrieval/config")
 async def get_retrieval_config(
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.retrieval_base_url:
         raise HTTPException(status_code=503, detail="retrieval_not_configured")
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            resp = await client.get(
-                f"{settings.retrieval_base_url}/internal/retrieval/config",
-                headers={"X-Tenant-ID": tenant_id},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await client.get(
+            f"{settings.retrieval_base_url}/internal/retrieval/config",
+            headers={"X-Tenant-ID": tenant_id},
+        )
+        resp.raise_for_status()
+        return resp.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -476,19 +479,19 @@ async def get_retrieval_config(
 async def update_retrieval_config(
     payload: dict,
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.retrieval_base_url:
         raise HTTPException(status_code=503, detail="retrieval_not_configured")
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            resp = await client.post(
-                f"{settings.retrieval_base_url}/internal/retrieval/config",
-                json=payload,
-                headers={"X-Tenant-ID": tenant_id},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await client.post(
+            f"{settings.retrieval_base_url}/internal/retrieval/config",
+            json=payload,
+            headers={"X-Tenant-ID": tenant_id},
+        )
+        resp.raise_for_status()
+        return resp.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -499,6 +502,7 @@ async def update_retrieval_config(
 async def orchestrator_respond(
     payload: OrchestratorRequest,
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.orchestrator_base_url:
@@ -507,10 +511,9 @@ async def orchestrator_respond(
     body.setdefault("tenant_id", tenant_id)
     body.setdefault("user", {"user_id": "observer_user", "tenant_id": tenant_id, "roles": ["observer"]})
     try:
-        async with httpx.AsyncClient(timeout=None) as client:
-            resp = await client.post(f"{settings.orchestrator_base_url}/internal/orchestrator/respond", json=body)
-            resp.raise_for_status()
-            return resp.json()
+        resp = await client.post(f"{settings.orchestrator_base_url}/internal/orchestrator/respond", json=body)
+        resp.raise_for_status()
+        return resp.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(status_code=exc.response.status_code, detail=exc.response.text)
     except Exception as exc:
@@ -520,57 +523,60 @@ async def orchestrator_respond(
 @router.get("/orchestrator/config")
 async def get_orchestrator_config(
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.orchestrator_base_url:
         raise HTTPException(status_code=503, detail="orchestrator_not_configured")
-    async with httpx.AsyncClient(timeout=None) as client:
-        resp = await client.get(f"{settings.orchestrator_base_url}/internal/orchestrator/config", headers={"X-Tenant-ID": tenant_id})
-        resp.raise_for_status()
-        return resp.json()
+    resp = await client.get(f"{settings.orchestrator_base_url}/internal/orchestrator/config", headers={"X-Tenant-ID": tenant_id})
+    resp.raise_for_status()
+    return resp.json()
 
 
 @router.post("/orchestrator/config")
 async def update_orchestrator_config(
     payload: OrchestratorConfig,
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.orchestrator_base_url:
         raise HTTPException(status_code=503, detail="orchestrator_not_configured")
-    async with httpx.AsyncClient(timeout=None) as client:
-        resp = await client.post(
-            f"{settings.orchestrator_base_url}/internal/orchestrator/config",
-            json=payload.model_dump(exclude_none=True),
-            headers={"X-Tenant-ID": tenant_id},
-        )
-        resp.raise_for_status()
-        return resp.json()
+    resp = await client.post(
+        f"{settings.orchestrator_base_url}/internal/orchestrator/config",
+        json=payload.model_dump(exclude_none=True),
+        headers={"X-Tenant-ID": tenant_id},
+    )
+    resp.raise_for_status()
+    return resp.json()
 
 
 @router.get("/llm/config")
-async def get_llm_config(settings: Settings = Depends(get_settings), tenant_id: str = Depends(get_tenant_id)):
+async def get_llm_config(
+    settings: Settings = Depends(get_settings),
+    tenant_id: str = Depends(get_tenant_id),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
     if not settings.llm_base_url:
         raise HTTPException(status_code=503, detail="llm_not_configured")
-    async with httpx.AsyncClient(timeout=None) as client:
-        resp = await client.get(f"{settings.llm_base_url}/internal/llm/config", headers={"X-Tenant-ID": tenant_id})
-        resp.raise_for_status()
-        return resp.json()
+    resp = await client.get(f"{settings.llm_base_url}/internal/llm/config", headers={"X-Tenant-ID": tenant_id})
+    resp.raise_for_status()
+    return resp.json()
 
 
 @router.post("/llm/config")
 async def update_llm_config(
     payload: LLMConfig,
     settings: Settings = Depends(get_settings),
+    client: httpx.AsyncClient = Depends(get_http_client),
     tenant_id: str = Depends(get_tenant_id),
 ):
     if not settings.llm_base_url:
         raise HTTPException(status_code=503, detail="llm_not_configured")
-    async with httpx.AsyncClient(timeout=None) as client:
-        resp = await client.post(
-            f"{settings.llm_base_url}/internal/llm/config",
-            json=payload.model_dump(exclude_none=True),
-            headers={"X-Tenant-ID": tenant_id},
-        )
-        resp.raise_for_status()
-        return resp.json()
+    resp = await client.post(
+        f"{settings.llm_base_url}/internal/llm/config",
+        json=payload.model_dump(exclude_none=True),
+        headers={"X-Tenant-ID": tenant_id},
+    )
+    resp.raise_for_status()
+    return resp.json()
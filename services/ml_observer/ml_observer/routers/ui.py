@@ -92,10 +92,10 @@ async def ui() -> str:
 
     <section>
       <h3>Chunking</h3>
-      <label for="chunkSize">Chunk size (chars)</label>
-      <input id="chunkSize" type="number" value="2048" />
-      <label for="chunkOverlap">Overlap (chars)</label>
-      <input id="chunkOverlap" type="number" value="200" />
+      <label for="chunkSize">Chunk size (tokens)</label>
+      <input id="chunkSize" type="number" value="512" />
+      <label for="chunkOverlap">Overlap (tokens)</label>
+      <input id="chunkOverlap" type="number" value="64" />
       <div class="row-flex">
         <button onclick="loadChunkingConfig()">Загрузить</button>
         <button onclick="saveChunkingConfig()">Сохранить</button>
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+from typing import Any, AsyncIterator, Dict, Tuple
+
 import httpx
 from fastapi import HTTPException, status
 
@@ -16,11 +19,11 @@ class GatewayClient:
         self.http_client = http_client
         path = settings.gateway_assistant_path or "/api/v1/assistant/query"
         self.assistant_path = path if path.startswith("/") else f"/{path}"
+        stream_path = settings.gateway_stream_path
+        self.stream_path = (stream_path if stream_path.startswith("/") else f"/{stream_path}") if stream_path else None
 
     async def query(self, payload: GatewayAssistantRequest, authorization: str | None) -> httpx.Response:
-        headers = {}
-        if authorization:
-            headers["Authorization"] = authorization
+        headers = self._headers(authorization)
         timeout = self.settings.http_timeout_seconds
         try:
             if timeout is not None:
@@ -43,3 +46,56 @@ class GatewayClient:
             logger.error("gateway.request_failed", error=str(exc))
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Gateway request failed") from exc
         return response
+
+    async def open_stream(self, payload: GatewayAssistantRequest, authorization: str | None) -> httpx.Response:
+        """Открывает SSE-ответ Gateway; вызывающий обязан закрыть его через ``aclose()``.
+
+        Тело ответа с ошибкой (или не-SSE ответа) уже прочитано, ``json()`` доступен.
+        """
+        request = self.http_client.build_request(
+            "POST",
+            self.stream_path or self.assistant_path,
+            json=payload.model_dump(exclude_none=True),
+            headers=self._headers(authorization),
+            timeout=self.settings.http_timeout_seconds if self.settings.http_timeout_seconds is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+        try:
+            response = await self.http_client.send(request, stream=True)
+        except httpx.TimeoutException:
+            logger.error("gateway.timeout")
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Gateway timeout")
+        except httpx.HTTPError as exc:
+            logger.error("gateway.request_failed", error=str(exc))
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Gateway request failed") from exc
+        if response.status_code != status.HTTP_200_OK or not is_event_stream(response):
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+        return response
+
+    @staticmethod
+    def _headers(authorization: str | None) -> Dict[str, str]:
+        headers = {}
+        if authorization:
+            headers["Authorization"] = authorization
+        return headers
+
+
+def is_event_stream(response: httpx.Response) -> bool:
+    return response.headers.get("content-type", "").startswith("text/event-stream")
+
+
+async def iter_sse_events(response: httpx.Response) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Разбирает поток ``text/event-stream`` Gateway на пары (event, JSON data)."""
+    event, data_lines = "message", []
+    async for line in response.aiter_lines():
+        if line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+        elif not line and data_lines:
+            yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+    if data_lines:
+        yield event, json.loads("\n".join(data_lines))
@@ -15,6 +15,8 @@ class Settings(BaseSettings):
 
     gateway_base_url: str = "http://api_gateway:8080"
     gateway_assistant_path: str = "/api/v1/assistant/query"
+    # SSE-эндпоинт Gateway для stream=true; пустое значение — прежний режим (полный ответ, нарезанный на чанки)
+    gateway_stream_path: str | None = "/api/v1/assistant/query/stream"
     auth_mode: Literal["passthrough", "static_token"] = "passthrough"
     static_bearer_token: str | None = Field(
         default=None,
@@ -24,7 +26,14 @@ class Settings(BaseSettings):
     default_model_id: str = "orion-rag"
     default_language: str = "ru"
     http_timeout_seconds: float | None = None
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2: bool = True  # действует, только если установлен пакет h2
     stream_chunk_chars: int = Field(default=400, ge=1, le=4000)
+    # текст шага придерживается, пока не наберётся столько символов: chat.completion.chunk нельзя отозвать,
+    # а короткая преамбула перед вызовом инструмента отменяется событием reset; 0 — отдавать сразу
+    stream_holdback_chars: int = Field(default=200, ge=0)
     max_prefix_chars: int = Field(default=2000, ge=200)
 
     openai_base_url: HttpUrl | None = Field(default=None, description="Optional external base override for docs/samples")
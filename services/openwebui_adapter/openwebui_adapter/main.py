@@ -2,9 +2,11 @@ from contextlib import asynccontextmanager
 
 import httpx
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from openwebui_adapter.clients.gateway import GatewayClient
 from openwebui_adapter.config import get_settings
+from openwebui_adapter.http_client import PoolMetrics, create_http_client
 from openwebui_adapter.logging import configure_logging
 from openwebui_adapter.routers import openai
 
@@ -15,7 +17,17 @@ configure_logging(settings.log_level)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     timeout = httpx.Timeout(None) if settings.http_timeout_seconds is None else settings.http_timeout_seconds
-    async with httpx.AsyncClient(base_url=settings.gateway_base_url, timeout=timeout) as client:
+    metrics = PoolMetrics()
+    async with create_http_client(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        http2=settings.http2,
+        metrics=metrics,
+        base_url=settings.gateway_base_url,
+        timeout=timeout,
+    ) as client:
+        app.state.http_metrics = metrics
         app.state.gateway_client = GatewayClient(settings, client)
         app.state.settings = settings
         yield
@@ -28,3 +40,8 @@ app.include_router(openai.router)
 @app.get("/health", tags=["health"])
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics() -> str:
+    return app.state.http_metrics.render_prometheus()
@@ -5,10 +5,11 @@ import time
 from typing import Any, Dict
 from uuid import uuid4
 
+import httpx
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import JSONResponse, StreamingResponse
 
-from openwebui_adapter.clients.gateway import GatewayClient
+from openwebui_adapter.clients.gateway import GatewayClient, is_event_stream, iter_sse_events
 from openwebui_adapter.config import Settings, get_settings
 from openwebui_adapter.logging import get_logger
 from openwebui_adapter.schemas import (
@@ -52,7 +53,16 @@ async def chat_completions(
             language=payload.language or settings.default_language,
             context=AssistantContext(channel="openwebui", conversation_id=conversation_id),
         )
-        gw_response = await gateway_client.query(gateway_payload, auth_header)
+        if payload.stream and gateway_client.stream_path:
+            gw_response = await gateway_client.open_stream(gateway_payload, auth_header)
+            if gw_response.status_code == status.HTTP_200_OK and is_event_stream(gw_response):
+                return _relay_gateway_stream(gw_response, payload.model, settings.stream_holdback_chars)
+            if gw_response.status_code in (status.HTTP_404_NOT_FOUND, status.HTTP_405_METHOD_NOT_ALLOWED):
+                # Gateway без SSE-эндпоинта: полный ответ, нарезанный на чанки
+                logger.warning("gateway.stream_unavailable", status_code=gw_response.status_code)
+                gw_response = await gateway_client.query(gateway_payload, auth_header)
+        else:
+            gw_response = await gateway_client.query(gateway_payload, auth_header)
     except HTTPException as exc:
         return _openai_error_response(
             message=_detail_to_message(exc.detail),
@@ -168,6 +178,83 @@ def _streaming_response(answer: str, model: str, trace_id: str | None, settings:
     return StreamingResponse(iterator(), media_type="text/event-stream", headers=headers)
 
 
+def _relay_gateway_stream(gw_response: httpx.Response, model: str, holdback_chars: int = 0) -> StreamingResponse:
+    """Транслирует события ``delta``/``done``/``error`` Gateway в ``chat.completion.chunk``.
+
+    Отправленный chunk отозвать нельзя, поэтому текст придерживается, пока его меньше
+    ``holdback_chars``: ``reset`` (шаг LLM перешёл к вызову инструмента) отбрасывает придержанный
+    текст, ``done`` отдаёт его. Текст длиннее порога уходит сразу и после ``reset`` остаётся у клиента.
+    """
+    created = int(time.time())
+    trace_id = gw_response.headers.get("x-request-id") or uuid4().hex
+    completion_id = f"chatcmpl-{trace_id}"
+
+    def chunk(delta: Dict[str, Any], finish_reason: str | None = None) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    def error(message: str, status_code: int, details: Any = None) -> str:
+        error_body: Dict[str, Any] = {
+            "message": message,
+            "type": _error_type_for_status(status_code),
+            "code": _error_code_for_status(status_code),
+            "trace_id": trace_id,
+        }
+        if details is not None:
+            error_body["details"] = details
+        return f"data: {json.dumps({'error': error_body}, ensure_ascii=False)}\n\n"
+
+    async def iterator():
+        deltas = 0
+        held: list[str] = []
+        released = False
+        try:
+            async for event, data in iter_sse_events(gw_response):
+                if event == "delta":
+                    deltas += 1
+                    held.append(data.get("text", ""))
+                    if released or sum(len(part) for part in held) >= holdback_chars:
+                        released = True
+                        for part in held:
+                            yield chunk({"content": part})
+                        held.clear()
+                elif event == "reset":
+                    if released:
+                        logger.warning("completion.stream_reset_after_release", trace_id=trace_id)
+                    held.clear()
+                    released = False
+                elif event == "done":
+                    for part in held:
+                        yield chunk({"content": part})
+                    delta: Dict[str, Any] = {}
+                    sources = data.get("sources") or []
+                    if sources:
+                        delta["metadata"] = {"sources": sources, "trace_id": _extract_trace_id(data) or trace_id}
+                    yield chunk(delta, finish_reason="stop")
+                    break
+                elif event == "error":
+                    status_code = int(data.get("status_code") or status.HTTP_502_BAD_GATEWAY)
+                    yield error(_detail_to_message(data.get("detail")), status_code, data.get("detail"))
+                    break
+            else:
+                yield error("Gateway stream ended unexpectedly", status.HTTP_502_BAD_GATEWAY)
+        except httpx.HTTPError as exc:
+            logger.error("gateway.stream_failed", trace_id=trace_id, error=str(exc))
+            yield error("Gateway stream failed", status.HTTP_502_BAD_GATEWAY)
+        finally:
+            await gw_response.aclose()
+            logger.info("completion.stream", trace_id=trace_id, chunks=deltas, relayed=True)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(iterator(), media_type="text/event-stream", headers={"X-Trace-Id": trace_id})
+
+
 def _detail_to_message(detail: Any) -> str:
     if isinstance(detail, dict):
         return detail.get("message") or detail.get("reason") or detail.get("code") or "Request rejected"
@@ -95,6 +95,89 @@ async def test_chat_completions_streaming_chunks():
     assert chunks[-1] == "data: [DONE]"
 
 
+@pytest.mark.anyio
+async def test_chat_completions_streaming_relays_gateway_sse():
+    events = [
+        ("delta", {"text": "Hello "}),
+        ("delta", {"text": "world"}),
+        ("done", {"answer": "Hello world", "sources": [{"doc_id": "doc1"}], "meta": {"trace_id": "trace-sse"}}),
+    ]
+    body = "".join(f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/v1/assistant/query/stream"
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream", "X-Request-ID": "trace-sse"})
+
+    transport = httpx.MockTransport(handler)
+    app, settings = build_app_with_transport(transport)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://adapter") as client:
+        resp = await client.post(
+            "/v1/chat/completions",
+            json={"model": settings.default_model_id, "messages": [{"role": "user", "content": "hi"}], "stream": True},
+        )
+    await app.state.gateway_client.http_client.aclose()
+    assert resp.status_code == 200
+    assert resp.headers["x-trace-id"] == "trace-sse"
+    lines = [line[len("data: "):] for line in resp.text.splitlines() if line.startswith("data: ")]
+    assert lines[-1] == "[DONE]"
+    chunks = [json.loads(line) for line in lines[:-1]]
+    assert [c["choices"][0]["delta"].get("content") for c in chunks] == ["Hello ", "world", None]
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+    assert chunks[-1]["choices"][0]["delta"]["metadata"]["sources"] == [{"doc_id": "doc1"}]
+
+
+@pytest.mark.anyio
+async def test_chat_completions_streaming_drops_text_before_reset():
+    events = [
+        ("delta", {"text": "Let me check the docs… "}),
+        ("reset", {}),
+        ("delta", {"text": "Final "}),
+        ("delta", {"text": "answer"}),
+        ("done", {"answer": "Final answer", "meta": {"trace_id": "trace-reset"}}),
+    ]
+    body = "".join(f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    app, settings = build_app_with_transport(httpx.MockTransport(handler))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://adapter") as client:
+        resp = await client.post(
+            "/v1/chat/completions",
+            json={"model": settings.default_model_id, "messages": [{"role": "user", "content": "hi"}], "stream": True},
+        )
+    await app.state.gateway_client.http_client.aclose()
+    lines = [line[len("data: "):] for line in resp.text.splitlines() if line.startswith("data: ")]
+    chunks = [json.loads(line) for line in lines[:-1]]
+    assert "".join(c["choices"][0]["delta"].get("content") or "" for c in chunks) == "Final answer"
+
+
+@pytest.mark.anyio
+async def test_chat_completions_streaming_falls_back_without_gateway_sse():
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path.endswith("/stream"):
+            return httpx.Response(404, json={"detail": "Not Found"})
+        return httpx.Response(200, json={"answer": "full answer", "meta": {"trace_id": "trace-fallback"}})
+
+    transport = httpx.MockTransport(handler)
+    app, settings = build_app_with_transport(transport)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://adapter") as client:
+        resp = await client.post(
+            "/v1/chat/completions",
+            json={"model": settings.default_model_id, "messages": [{"role": "user", "content": "hi"}], "stream": True},
+        )
+    await app.state.gateway_client.http_client.aclose()
+    assert resp.status_code == 200
+    assert paths == ["/api/v1/assistant/query/stream", "/api/v1/assistant/query"]
+    assert "full answer" in resp.text
+
+
 @pytest.mark.anyio
 async def test_gateway_400_translated():
     def handler(_: httpx.Request) -> httpx.Response:
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import List
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -27,6 +28,12 @@ class Settings(BaseSettings):
     rerank_score_threshold: float = Field(default=0.2, ge=0.0, le=1.0)
     enable_section_cosine: bool = True
     enable_rerank: bool | None = True
+    rerank_min_budget_seconds: float = Field(default=3.0, ge=0.0)  # меньше бюджета запроса — rerank пропускается
+    coalesce_requests: bool = True  # одновременные одинаковые поиски выполняются один раз
+    degradation_enabled: bool = True
+    degradation_inflight_levels: List[int] = Field(default_factory=lambda: [8, 16, 32])  # поисков в работе для уровней 1/2/3
+    degradation_latency_target_seconds: float = Field(default=1.0, ge=0.0)  # p90 обязательных стадий; 0 — только по in-flight
+    degradation_window_seconds: float = Field(default=30.0, gt=0.0)
     chunks_enabled: bool = False
     window_radius: int | None = Field(default=None, ge=0, env=["RAG_WINDOW_RADIUS", "RETR_WINDOW_RADIUS"])
 
@@ -40,6 +47,10 @@ class Settings(BaseSettings):
     embedding_model: str = "baai/bge-m3"
     embedding_max_attempts: int = 2
     embedding_retry_delay_seconds: float = 1.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2: bool = True  # действует, только если установлен пакет h2
 
     rerank_enabled: bool = True
     rerank_model: str = "openai/gpt-5-nano"
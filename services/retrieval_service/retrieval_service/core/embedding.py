@@ -8,12 +8,16 @@ import httpx
 import structlog
 
 from retrieval_service.config import Settings
+from retrieval_service.deadline import hop_timeout
+from retrieval_service.http_client import create_sync_http_client
 
 
 class EmbeddingClient:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, http_client: httpx.Client | None = None) -> None:
         self.settings = settings
         self._mock = settings.mock_mode or not settings.embedding_api_base
+        # общий keep-alive пул: эмбеддинг запроса не платит за TCP/TLS handshake на каждом поиске
+        self._http_client = http_client or (None if self._mock else create_sync_http_client())
         self._logger = structlog.get_logger(__name__)
         self.max_attempts = max(1, settings.embedding_max_attempts)
         self.retry_delay = settings.embedding_retry_delay_seconds
@@ -32,28 +36,28 @@ class EmbeddingClient:
         last_error: Exception | None = None
         for attempt in range(1, self.max_attempts + 1):
             started = time.perf_counter()
+            timeout = hop_timeout(20.0)  # бюджет запроса исчерпан — без новых попыток
             try:
-                with httpx.Client(base_url=base, timeout=20.0) as client:
-                    self._logger.info(
-                        "retrieval_embedding_request",
-                        url=base + path,
-                        model=self.settings.embedding_model,
-                        items=len(texts),
-                        attempt=attempt,
-                    )
-                    resp = client.post(path, json=payload, headers=headers)
-                    latency_ms = int((time.perf_counter() - started) * 1000)
-                    self._logger.info(
-                        "retrieval_embedding_response",
-                        status_code=resp.status_code,
-                        model=self.settings.embedding_model,
-                        items=len(texts),
-                        latency_ms=latency_ms,
-                        attempt=attempt,
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
-                    return [item["embedding"] for item in data.get("data", [])]
+                self._logger.info(
+                    "retrieval_embedding_request",
+                    url=base + path,
+                    model=self.settings.embedding_model,
+                    items=len(texts),
+                    attempt=attempt,
+                )
+                resp = self._http_client.post(base + path, json=payload, headers=headers, timeout=timeout)  # type: ignore[union-attr]
+                latency_ms = int((time.perf_counter() - started) * 1000)
+                self._logger.info(
+                    "retrieval_embedding_response",
+                    status_code=resp.status_code,
+                    model=self.settings.embedding_model,
+                    items=len(texts),
+                    latency_ms=latency_ms,
+                    attempt=attempt,
+                )
+                resp.raise_for_status()
+                data = resp.json()
+                return [item["embedding"] for item in data.get("data", [])]
             except Exception as exc:  # pragma: no cover - network errors
                 last_error = exc
                 self._logger.warning("retrieval_embedding_attempt_failed", attempt=attempt, error=str(exc))
@@ -62,6 +66,10 @@ class EmbeddingClient:
         self._logger.error("retrieval_embedding_fallback", reason=str(last_error) if last_error else "unknown")
         return [self._pseudo_embedding(text) for text in texts]
 
+    def close(self) -> None:
+        if self._http_client is not None:
+            self._http_client.close()
+
     @staticmethod
     def _pseudo_embedding(text: str, dim: int = 8) -> List[float]:
         h = hashlib.sha256(text.encode("utf-8")).digest()
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 from __future__ import annotations
 
+import time
 from typing import Iterable, List, Optional, Set
 
 import structlog
 
 from retrieval_service.core.embedding import EmbeddingClient
+from retrieval_service.core.load import LEVEL_NONE, LEVEL_NO_RERANK, LEVEL_SHRINK_TOP_K, LEVEL_SKIP_CHUNKS, LoadPolicy
+from retrieval_service.core.profiling import StageProfiler, get_profiler
 from retrieval_service.core.reranker import SectionReranker
 from retrieval_service.schemas import RetrievalHit, RetrievalQuery, RetrievalStepResults
 from retrieval_service.core.bm25 import BM25Index
@@ -93,6 +96,8 @@ class ChromaIndex:
         bm25: BM25Index | None = None,
         bm25_top_k: int = 50,
         bm25_weight: float = 0.5,
+        profiler: StageProfiler | None = None,
+        load_policy: LoadPolicy | None = None,
     ) -> None:
         self.client = client
         self.collection = client.get_or_create_collection(collection_name)
@@ -116,6 +121,8 @@ class ChromaIndex:
         self.bm25 = bm25
         self.bm25_top_k = bm25_top_k
         self.bm25_weight = bm25_weight
+        self.profiler = profiler or get_profiler()
+        self.load_policy = load_policy
 
     def _build_where(self, query: RetrievalQuery) -> dict:
         conditions = [{"tenant_id": query.tenant_id}]
@@ -133,6 +140,12 @@ class ChromaIndex:
         return {"$and": conditions}
 
     def search(self, query: RetrievalQuery) -> tuple[List[RetrievalHit], RetrievalStepResults]:
+        if self.load_policy is None:
+            return self._search(query, LEVEL_NONE)
+        with self.load_policy.admit() as level:
+            return self._search(query, level)
+
+    def _search(self, query: RetrievalQuery, level: int) -> tuple[List[RetrievalHit], RetrievalStepResults]:
         where = self._build_where(query)
         max_results = query.max_results or self.max_results
         docs_top_k = max(1, query.docs_top_k or self.doc_top_k)
@@ -157,6 +170,16 @@ class ChromaIndex:
                 use_rerank = self.enable_rerank
             else:
                 use_rerank = bool(self.reranker.settings.rerank_enabled)
+        degraded: List[str] = []
+        if level >= LEVEL_NO_RERANK and use_rerank:
+            use_rerank = False
+            degraded.append("rerank")
+        if level >= LEVEL_SHRINK_TOP_K:
+            docs_top_k = max(1, (docs_top_k + 1) // 2)
+            sections_top_k = max(1, (sections_top_k + 1) // 2)
+            degraded.append("top_k")
+        if level:
+            self._logger.warning("retrieval_degraded", level=level, degraded=degraded, inflight=self.load_policy.inflight if self.load_policy else None)
 
         self._logger.info(
             "retrieval_parameters_resolved",
@@ -174,7 +197,9 @@ class ChromaIndex:
             min_docs=self.min_docs,
         )
 
-        query_embedding = self.embedding.embed([query.query])[0]
+        core_started = time.perf_counter()
+        with self.profiler.span("embed"):
+            query_embedding = self.embedding.embed([query.query])[0]
         steps = RetrievalStepResults()
         tags_filter: Set[str] | None = None
         if query.filters and query.filters.tags:
@@ -188,17 +213,18 @@ class ChromaIndex:
             where=where,
             requested=docs_top_k,
         )
-        doc_hits = self._search_collection(
-            self.doc_collection, query_embedding, where, docs_top_k, is_doc=True, tags_filter=tags_filter
-        )
-        steps.docs = doc_hits
-        doc_ids = [h.doc_id for h in doc_hits] if doc_hits else []
-        if len(doc_hits) < self.min_docs:
-            padded = self._pad_docs_with_metadata(where, doc_ids, self.min_docs - len(doc_hits), tags_filter=tags_filter)
-            if padded:
-                doc_hits.extend(padded)
-                steps.docs = doc_hits
-                doc_ids.extend([d.doc_id for d in padded if d.doc_id])
+        with self.profiler.span("docs"):
+            doc_hits = self._search_collection(
+                self.doc_collection, query_embedding, where, docs_top_k, is_doc=True, tags_filter=tags_filter
+            )
+            steps.docs = doc_hits
+            doc_ids = [h.doc_id for h in doc_hits] if doc_hits else []
+            if len(doc_hits) < self.min_docs:
+                padded = self._pad_docs_with_metadata(where, doc_ids, self.min_docs - len(doc_hits), tags_filter=tags_filter)
+                if padded:
+                    doc_hits.extend(padded)
+                    steps.docs = doc_hits
+                    doc_ids.extend([d.doc_id for d in padded if d.doc_id])
         self._logger.info(
             "retrieval_doc_cosine_ordering",
             ordering=[{"doc_id": d.doc_id, "score": d.score} for d in doc_hits],
@@ -225,6 +251,7 @@ class ChromaIndex:
                 per_doc=len(doc_ids),
             )
             doc_score_map = {d.doc_id: d.score for d in doc_hits}
+            sections_started = time.perf_counter()
             for doc_id in doc_ids:
                 doc_clause = {"doc_id": {"$in": [doc_id]}}
                 if "$and" in where:
@@ -246,15 +273,19 @@ class ChromaIndex:
                         "sections": [{"section_id": h.section_id, "score": h.score} for h in per_doc_hits],
                     }
                 )
+            self.profiler.observe("sections", time.perf_counter() - sections_started)
             self._logger.info("retrieval_section_cosine_ordering", per_doc=section_logs)
             section_hits.sort(key=lambda h: (doc_score_map.get(h.doc_id, 0.0), h.score), reverse=True)
             if max_sections_cap:
                 section_hits = section_hits[:max_sections_cap]
+        if self.load_policy is not None:
+            self.load_policy.observe_core(time.perf_counter() - core_started)
 
         bm25_hits: List[RetrievalHit] = []
         if self.bm25:
             try:
-                bm25_hits = self.bm25.search(query.query, self.bm25_top_k)
+                with self.profiler.span("bm25"):
+                    bm25_hits = self.bm25.search(query.query, self.bm25_top_k)
             except Exception as exc:  # pragma: no cover - optional
                 self._logger.warning("bm25_search_failed", error=str(exc))
         combined_hits = section_hits
@@ -293,7 +324,8 @@ class ChromaIndex:
         rerank_snapshot = reranked_sections
         if use_rerank and combined_hits:
             top_n = min(self.reranker.settings.rerank_top_n, max_sections_cap) if max_sections_cap else self.reranker.settings.rerank_top_n
-            reranked_sections = self.reranker.rerank(query.query, combined_hits, top_n=top_n)
+            with self.profiler.span("rerank"):
+                reranked_sections = self.reranker.rerank(query.query, combined_hits, top_n=top_n)
             rerank_snapshot = reranked_sections
             self._logger.info(
                 "retrieval_rerank_scores",
@@ -343,6 +375,10 @@ class ChromaIndex:
         final_hits = reranked_sections
         limited: list[RetrievalHit] = []
         chunk_where = where
+        if chunks_enabled and level >= LEVEL_SKIP_CHUNKS and reranked_sections:
+            # chunk-стадия — запасной путь на случай пустых секций; под нагрузкой отдаём секции
+            chunks_enabled = False
+            degraded.append("chunks")
         if chunks_enabled:
             clauses = []
             if doc_ids:
@@ -363,14 +399,15 @@ class ChromaIndex:
                 where=chunk_where,
                 requested=n_results,
             )
-            hits = self._search_collection(
-                self.collection,
-                query_embedding,
-                chunk_where,
-                n_results,
-                is_chunk=True,
-                tags_filter=tags_filter,
-            )
+            with self.profiler.span("chunks"):
+                hits = self._search_collection(
+                    self.collection,
+                    query_embedding,
+                    chunk_where,
+                    n_results,
+                    is_chunk=True,
+                    tags_filter=tags_filter,
+                )
 
             # enforce per-doc limit and max_results
             per_doc_counts: dict[str, int] = {}
@@ -388,8 +425,10 @@ class ChromaIndex:
             if not final_hits:
                 final_hits = limited
         else:
-            self._logger.info("retrieval_stage_skipped", stage="chunks", reason="disabled")
+            self._logger.info("retrieval_stage_skipped", stage="chunks", reason="degraded" if "chunks" in degraded else "disabled")
             steps.chunks = []
+        steps.degradation_level = level
+        steps.degraded_stages = degraded
         self._logger.info(
             "retrieval_chroma_results",
             tenant_id=query.tenant_id,
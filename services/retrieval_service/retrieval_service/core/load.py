@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Iterator, List, Sequence, Tuple
+
+# уровни деградации: каждый включает предыдущие
+LEVEL_NONE = 0
+LEVEL_NO_RERANK = 1
+LEVEL_SHRINK_TOP_K = 2
+LEVEL_SKIP_CHUNKS = 3
+
+
+class LoadPolicy:
+    """Уровень деградации поиска по текущей нагрузке.
+
+    Сигналы — число поисков в работе (включая текущий) и p90 длительности обязательных стадий
+    (эмбеддинг, docs, sections) за последние ``window_seconds``. Эти стадии не зависят от того,
+    был ли rerank, поэтому отключение rerank не маскирует перегрузку Chroma. Уровень — максимум из:
+    числа порогов ``inflight_levels``, которые достигнуты, и отношения p90 к ``latency_target_seconds``
+    (≥1 → 1, ≥1.5 → 2, ≥2 → 3). Потокобезопасна: поиск выполняется в пуле потоков.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        inflight_levels: Sequence[int] = (8, 16, 32),
+        latency_target_seconds: float = 1.0,
+        window_seconds: float = 30.0,
+        min_samples: int = 10,
+        max_samples: int = 512,
+    ) -> None:
+        self.enabled = enabled
+        self.inflight_levels = sorted(inflight_levels)
+        self.latency_target_seconds = latency_target_seconds
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self.inflight = 0
+        self.last_level = LEVEL_NONE
+        self.degraded_total = 0
+
+    @contextmanager
+    def admit(self) -> Iterator[int]:
+        """Учитывает поиск как выполняющийся и отдаёт уровень деградации для него."""
+        with self._lock:
+            self.inflight += 1
+            level = self._level() if self.enabled else LEVEL_NONE
+            self.last_level = level
+            if level:
+                self.degraded_total += 1
+        try:
+            yield level
+        finally:
+            with self._lock:
+                self.inflight -= 1
+
+    def observe_core(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append((time.monotonic(), seconds))
+
+    def _level(self) -> int:
+        by_inflight = sum(1 for threshold in self.inflight_levels if self.inflight >= threshold)
+        return min(LEVEL_SKIP_CHUNKS, max(by_inflight, self._latency_level()))
+
+    def _latency_level(self) -> int:
+        if self.latency_target_seconds <= 0:
+            return LEVEL_NONE
+        horizon = time.monotonic() - self.window_seconds
+        while self._samples and self._samples[0][0] < horizon:
+            self._samples.popleft()
+        if len(self._samples) < self.min_samples:
+            return LEVEL_NONE
+        durations = sorted(seconds for _, seconds in self._samples)
+        p90 = durations[min(len(durations) - 1, math.ceil(0.9 * len(durations)) - 1)]
+        ratio = p90 / self.latency_target_seconds
+        if ratio >= 2.0:
+            return LEVEL_SKIP_CHUNKS
+        if ratio >= 1.5:
+            return LEVEL_SHRINK_TOP_K
+        return LEVEL_NO_RERANK if ratio >= 1.0 else LEVEL_NONE
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = [
+            "# TYPE retrieval_inflight_searches gauge",
+            f"retrieval_inflight_searches {self.inflight}",
+            "# TYPE retrieval_degradation_level gauge",
+            f"retrieval_degradation_level {self.last_level}",
+            "# TYPE retrieval_degraded_searches_total counter",
+            f"retrieval_degraded_searches_total {self.degraded_total}",
+        ]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Sequence
+
+DEFAULT_QUANTILES: Sequence[float] = (0.5, 0.9, 0.99)
+
+
+class LatencyHistogram:
+    """HDR-подобная гистограмма: лог-линейные бакеты с фиксированной относительной точностью.
+
+    Значения хранятся в микросекундах. Каждая степень двойки делится на
+    ``2 ** sub_bucket_bits`` линейных под-бакетов, поэтому ошибка квантиля
+    не превышает ``1 / 2 ** sub_bucket_bits`` при константной памяти.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 4) -> None:
+        self.sub_bucket_bits = sub_bucket_bits
+        self._sub_buckets = 1 << sub_bucket_bits
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        if value_us < 2 * self._sub_buckets:
+            return value_us
+        magnitude = value_us.bit_length() - self.sub_bucket_bits - 1
+        return (magnitude << self.sub_bucket_bits) + (value_us >> magnitude)
+
+    def _upper_bound(self, index: int) -> int:
+        if index < 2 * self._sub_buckets:
+            return index
+        magnitude = (index >> self.sub_bucket_bits) - 1
+        top = index - (magnitude << self.sub_bucket_bits)
+        return ((top + 1) << magnitude) - 1
+
+    def record(self, seconds: float) -> None:
+        value_us = max(0, int(seconds * 1_000_000))
+        idx = self._index(value_us)
+        self._counts[idx] = self._counts.get(idx, 0) + 1
+        self.count += 1
+        self.total_us += value_us
+        self.max_us = max(self.max_us, value_us)
+
+    def quantile(self, q: float) -> float:
+        """Возвращает квантиль в секундах (верхняя граница бакета, но не больше max)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for idx in sorted(self._counts):
+            seen += self._counts[idx]
+            if seen >= rank:
+                return min(self._upper_bound(idx), self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+    @property
+    def total_seconds(self) -> float:
+        return self.total_us / 1_000_000
+
+
+class StageProfiler:
+    """Агрегирует длительности стадий поиска и отдаёт их в формате Prometheus."""
+
+    def __init__(self, metric_name: str, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> None:
+        self.metric_name = metric_name
+        self.quantiles = tuple(quantiles)
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                stage: {
+                    "count": hist.count,
+                    "sum_seconds": hist.total_seconds,
+                    "max_seconds": hist.max_us / 1_000_000,
+                    "quantiles": {q: hist.quantile(q) for q in self.quantiles},
+                }
+                for stage, hist in sorted(self._histograms.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        name = self.metric_name
+        lines: List[str] = [
+            f"# HELP {name} Pipeline stage latency in seconds.",
+            f"# TYPE {name} summary",
+        ]
+        for stage, data in self.snapshot().items():
+            for q, value in data["quantiles"].items():
+                lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {data["sum_seconds"]:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {data["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+@lru_cache
+def get_profiler() -> StageProfiler:
+    return StageProfiler("retrieval_stage_latency_seconds")
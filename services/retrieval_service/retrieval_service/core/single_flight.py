@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+from retrieval_service.deadline import SharedDeadline, current_deadline, under_shared_deadline
+
+T = TypeVar("T")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.split()).casefold()
+
+
+@dataclass
+class _Flight(Generic[T]):
+    task: "asyncio.Task[T]"
+    deadline: SharedDeadline = field(default_factory=SharedDeadline)
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Объединяет одновременные одинаковые вычисления (single-flight).
+
+    Первый вызов с ключом запускает ``call`` отдельной задачей, вызовы с тем же ключом, пришедшие
+    до её завершения, ждут тот же результат (или то же исключение). Результат не кэшируется: после
+    завершения следующий вызов считает заново. Отмена одного из ожидающих (клиент отключился,
+    истёк его дедлайн) не отменяет вычисление для остальных; задача отменяется, только когда
+    ждать её больше некому. Задача выполняется в контексте первого вызова, но не под его дедлайном:
+    бюджет вычисления — самый поздний дедлайн из ожидающих (``SharedDeadline``), а каждый ожидающий
+    ограничивает своё ожидание сам (``within_deadline``).
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _Flight[Any]] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Возвращает ``(результат, shared)``; ``shared`` — результат получен от чужого вычисления."""
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            deadline = SharedDeadline()
+            flight = _Flight(asyncio.ensure_future(under_shared_deadline(deadline, call())), deadline)
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task, key=key, flight=flight: self._finish(key, flight))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        flight.deadline.join(current_deadline())
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+
+    def _finish(self, key: Hashable, flight: _Flight[Any]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            flight.task.exception()  # помечает исключение как полученное, если все ожидающие ушли
+
+    def render_prometheus(self, prefix: str) -> str:
+        return "\n".join(
+            [
+                f"# TYPE {prefix}_started_total counter",
+                f"{prefix}_started_total {self.started}",
+                f"# TYPE {prefix}_coalesced_total counter",
+                f"{prefix}_coalesced_total {self.coalesced}",
+            ]
+        ) + "\n"
@@ -1,16 +1,23 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
 from retrieval_service.config import get_settings
+from retrieval_service.deadline import DeadlineMiddleware
 from retrieval_service.logging import configure_logging
 from retrieval_service.routers import retrieval
 from retrieval_service.routers import chunks
 from retrieval_service.core.index import InMemoryIndex, ChromaIndex, chromadb
 from retrieval_service.core.embedding import EmbeddingClient
 from retrieval_service.core.reranker import SectionReranker
+from retrieval_service.core.load import LoadPolicy
+from retrieval_service.core.single_flight import SingleFlight
 from retrieval_service.core.bm25 import BM25Index, ensure_index_dir
+from retrieval_service.core.profiling import get_profiler
+from retrieval_service.http_client import PoolMetrics, create_sync_http_client
 
 settings = get_settings()
 configure_logging(settings.log_level)
+http_metrics = PoolMetrics()
 
 
 def build_index():
@@ -24,7 +31,16 @@ def build_index():
             if settings.chroma_host
             else chromadb.PersistentClient(path=settings.chroma_path)
         )
-        embedding = EmbeddingClient(settings)
+        embedding = EmbeddingClient(
+            settings,
+            http_client=create_sync_http_client(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry_seconds,
+                http2=settings.http2,
+                metrics=http_metrics,
+            ),
+        )
         bm25 = None
         if settings.bm25_enabled:
             try:
@@ -53,13 +69,21 @@ def build_index():
             bm25=bm25,
             bm25_top_k=settings.bm25_top_k,
             bm25_weight=settings.bm25_weight,
+            load_policy=LoadPolicy(
+                enabled=settings.degradation_enabled,
+                inflight_levels=settings.degradation_inflight_levels,
+                latency_target_seconds=settings.degradation_latency_target_seconds,
+                window_seconds=settings.degradation_window_seconds,
+            ),
         )
     raise RuntimeError(f"Unsupported vector backend: {settings.vector_backend}")
 
 
 app = FastAPI(title=settings.app_name)
+app.add_middleware(DeadlineMiddleware)
 app.state.index = build_index()
 app.state.settings = settings
+app.state.search_flights = SingleFlight()
 app.include_router(retrieval.router)
 app.include_router(chunks.router)
 
@@ -76,3 +100,11 @@ async def health() -> dict[str, str]:
             status["status"] = "degraded"
             status["error"] = str(exc)
     return status
+
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics() -> str:
+    body = get_profiler().render_prometheus() + http_metrics.render_prometheus()
+    body += app.state.search_flights.render_prometheus("retrieval_search")
+    load_policy = getattr(app.state.index, "load_policy", None)
+    return body + load_policy.render_prometheus() if load_policy is not None else body
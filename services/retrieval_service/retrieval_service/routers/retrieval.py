@@ -1,9 +1,15 @@
+import json
+
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
 
 from retrieval_service.core.index import InMemoryIndex  # noqa
+from retrieval_service.core.profiling import get_profiler
+from retrieval_service.core.single_flight import SingleFlight, normalize_query
 from retrieval_service.schemas import RetrievalQuery, RetrievalResponse
 from retrieval_service.config import Settings
+from retrieval_service.deadline import DeadlineExceeded, remaining_budget, within_deadline
 
 router = APIRouter(prefix="/internal/retrieval", tags=["retrieval"])
 logger = structlog.get_logger(__name__)
@@ -16,6 +22,15 @@ def get_index(request: Request):
     return index
 
 
+def get_search_flights(request: Request) -> SingleFlight | None:
+    return getattr(request.app.state, "search_flights", None)
+
+
+def _search_key(query: RetrievalQuery) -> str:
+    # ключ — уже разрешённые параметры: запросы с разными top_k/rerank не объединяются
+    return json.dumps([normalize_query(query.query), query.model_dump(exclude={"query"})], sort_keys=True, default=str)
+
+
 def get_settings(request: Request) -> Settings:
     settings = getattr(request.app.state, "settings", None)
     if settings is None:
@@ -28,6 +43,7 @@ async def search(
     query: RetrievalQuery,
     index=Depends(get_index),
     settings: Settings = Depends(get_settings),
+    flights: SingleFlight | None = Depends(get_search_flights),
 ) -> RetrievalResponse:
     logger.info(
         "retrieval_http_request",
@@ -60,6 +76,11 @@ async def search(
         query.enable_section_cosine = settings.enable_section_cosine
     if query.enable_rerank is None:
         query.enable_rerank = query.rerank_enabled if query.rerank_enabled is not None else settings.enable_rerank
+    budget = remaining_budget()
+    if query.enable_rerank is not False and budget is not None and budget < settings.rerank_min_budget_seconds:
+        # rerank — самый дорогой необязательный этап: при малом остатке бюджета отдаём порядок без него
+        logger.info("retrieval_rerank_skipped", reason="low_budget", budget_seconds=round(budget, 3), trace_id=getattr(query, "trace_id", None))
+        query.enable_rerank = False
     if query.rerank_score_threshold is None:
         query.rerank_score_threshold = settings.rerank_score_threshold
     else:
@@ -67,7 +88,16 @@ async def search(
     if query.chunks_enabled is None:
         query.chunks_enabled = settings.chunks_enabled
     try:
-        search_result = index.search(query)
+        with get_profiler().span("total"):
+            # поиск синхронный (Chroma, эмбеддинг, rerank): в пуле потоков он не блокирует event loop,
+            # а параллельные запросы видны политике деградации как in-flight
+            if flights is not None and settings.coalesce_requests:
+                # общий поиск не ограничен дедлайном первого запроса: каждый ожидающий ждёт в пределах своего
+                search_result, shared = await within_deadline(flights.do(_search_key(query), lambda: run_in_threadpool(index.search, query)))
+            else:
+                search_result, shared = await run_in_threadpool(index.search, query), False
+        if shared:
+            logger.info("retrieval_search_coalesced", tenant_id=query.tenant_id, trace_id=getattr(query, "trace_id", None))
         if isinstance(search_result, tuple):
             hits, steps = search_result
         else:
@@ -90,6 +120,9 @@ async def search(
             trace_id=getattr(query, "trace_id", None),
         )
         return RetrievalResponse(hits=hits, steps=steps)
+    except DeadlineExceeded as exc:
+        logger.warning("retrieval_deadline_exceeded", trace_id=getattr(query, "trace_id", None))
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(exc)) from exc
     except Exception as exc:
         if index_logger:
             index_logger.error("retrieval_failed", error=str(exc))
@@ -36,6 +36,8 @@ class RetrievalStepResults(BaseModel):
     sections: List[RetrievalHit] = Field(default_factory=list)
     chunks: List[RetrievalHit] = Field(default_factory=list)
     bm25: Optional[List[RetrievalHit]] = None
+    degradation_level: int = 0  # 0 — полный поиск, 1 — без rerank, 2 — урезанные top_k, 3 — без chunk-стадии
+    degraded_stages: List[str] = Field(default_factory=list)
 
 
 class RetrievalHit(BaseModel):
@@ -1,8 +1,14 @@
+import asyncio
+import time
+
+import httpx
 from fastapi.testclient import TestClient
 
 from retrieval_service.main import app
 from retrieval_service.core.index import ChromaIndex, chromadb
 from retrieval_service.core.embedding import EmbeddingClient
+from retrieval_service.core.load import LoadPolicy
+from retrieval_service.core.single_flight import SingleFlight
 from retrieval_service.config import Settings
 from retrieval_service.schemas import RetrievalFilters, RetrievalQuery
 
@@ -121,3 +127,201 @@ def test_chroma_search_with_metadata_filters(tmp_path):
     assert hits[0].doc_id == "doc_meta"
     assert hits[0].anchor_chunk_id == "chunk_1_1"
     assert steps.chunks == []
+
+
+def test_metrics_exposes_stage_latency():
+    with TestClient(app) as client:
+        client.post("/internal/retrieval/search", json={"query": "ldap", "tenant_id": "tenant_1"})
+        resp = client.get("/metrics")
+        assert resp.status_code == 200
+        assert "# TYPE retrieval_stage_latency_seconds summary" in resp.text
+        assert 'retrieval_stage_latency_seconds_count{stage="total"}' in resp.text
+
+
+def test_search_skips_rerank_when_request_budget_is_low(monkeypatch):
+    seen = []
+
+    class RecordingIndex:
+        def search(self, query):
+            seen.append(query.enable_rerank)
+            return [], None
+
+    monkeypatch.setattr(app.state, "index", RecordingIndex())
+    body = {"query": "ldap", "tenant_id": "tenant_1", "enable_rerank": True}
+    with TestClient(app) as client:
+        assert client.post("/internal/retrieval/search", json=body).status_code == 200
+        tight = {"X-Request-Deadline": f"{time.time() + 1:.3f}"}
+        assert client.post("/internal/retrieval/search", json=body, headers=tight).status_code == 200
+        expired = {"X-Request-Deadline": f"{time.time() - 1:.3f}"}
+        assert client.post("/internal/retrieval/search", json=body, headers=expired).status_code == 504
+    assert seen == [True, False]
+
+
+class _FakeCollection:
+    def __init__(self, name, metadatas):
+        self.name = name
+        self.metadatas = metadatas
+        self.requested = []
+
+    def query(self, query_embeddings, n_results, where, include):
+        self.requested.append(n_results)
+        metas = self.metadatas[:n_results]
+        return {"ids": [[f"{self.name}:{i}" for i in range(len(metas))]], "metadatas": [metas], "distances": [[0.1] * len(metas)]}
+
+    def get(self, **kwargs):
+        return {"ids": [], "metadatas": []}
+
+
+class _FakeChroma:
+    def __init__(self):
+        meta = {"tenant_id": "t", "doc_id": "doc_1"}
+        self.collections = {
+            "ingestion_docs": _FakeCollection("ingestion_docs", [meta]),
+            "ingestion_sections": _FakeCollection(
+                "ingestion_sections", [{**meta, "section_id": f"sec_{i}", "summary": "s", "chunk_ids": f"c_{i}"} for i in range(6)]
+            ),
+            "ingestion_chunks": _FakeCollection("ingestion_chunks", [{**meta, "chunk_id": "c_0", "text": "x"}]),
+        }
+
+    def get_or_create_collection(self, name):
+        return self.collections[name]
+
+
+class _FakeReranker:
+    settings = Settings(rerank_top_n=5)
+
+    def __init__(self):
+        self.calls = 0
+
+    def available(self):
+        return True
+
+    def rerank(self, query, sections, top_n):
+        self.calls += 1
+        return sections[:top_n]
+
+
+def _degradable_index(policy):
+    chroma, reranker = _FakeChroma(), _FakeReranker()
+    index = ChromaIndex(
+        client=chroma,
+        collection_name="ingestion_chunks",
+        embedding=EmbeddingClient(Settings(mock_mode=True)),
+        max_results=5,
+        reranker=reranker,
+        doc_top_k=4,
+        section_top_k=6,
+        min_docs=1,
+        enable_rerank=True,
+        chunks_enabled=True,
+        load_policy=policy,
+    )
+    return index, chroma, reranker
+
+
+def test_load_policy_degrades_search_stages():
+    index, chroma, reranker = _degradable_index(LoadPolicy(inflight_levels=[100]))
+    hits, steps = index.search(RetrievalQuery(query="q", tenant_id="t"))
+    assert hits and steps.degradation_level == 0 and steps.degraded_stages == []
+    assert reranker.calls == 1
+    assert chroma.collections["ingestion_sections"].requested == [6]
+    assert chroma.collections["ingestion_chunks"].requested
+
+    # один поиск в работе уже достигает всех порогов → уровень 3
+    index, chroma, reranker = _degradable_index(LoadPolicy(inflight_levels=[1, 1, 1]))
+    hits, steps = index.search(RetrievalQuery(query="q", tenant_id="t"))
+    assert hits
+    assert steps.degradation_level == 3
+    assert steps.degraded_stages == ["rerank", "top_k", "chunks"]
+    assert reranker.calls == 0
+    assert chroma.collections["ingestion_docs"].requested == [2]
+    assert chroma.collections["ingestion_sections"].requested == [3]
+    assert chroma.collections["ingestion_chunks"].requested == []
+    assert index.load_policy.inflight == 0
+
+
+def test_load_policy_level_follows_recent_core_latency():
+    policy = LoadPolicy(inflight_levels=[100], latency_target_seconds=1.0, min_samples=5)
+    for _ in range(5):
+        policy.observe_core(0.5)
+    with policy.admit() as level:
+        assert level == 0
+    for _ in range(50):
+        policy.observe_core(1.6)
+    with policy.admit() as level:
+        assert level == 2
+    assert "retrieval_degradation_level 2" in policy.render_prometheus()
+
+
+def test_concurrent_identical_searches_are_coalesced(monkeypatch):
+    calls = []
+
+    class SlowIndex:
+        def search(self, query):
+            calls.append(query.query)
+            time.sleep(0.2)
+            return [], None
+
+    monkeypatch.setattr(app.state, "index", SlowIndex())
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://retrieval") as client:
+            bodies = [
+                {"query": "LDAP  setup", "tenant_id": "tenant_1"},
+                {"query": "ldap setup", "tenant_id": "tenant_1"},
+                {"query": "ldap setup", "tenant_id": "tenant_2"},
+            ]
+            return await asyncio.gather(*(client.post("/internal/retrieval/search", json=body) for body in bodies))
+
+    responses = asyncio.run(scenario())
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert len(calls) == 2  # другой tenant — отдельный поиск
+
+
+def test_single_flight_survives_cancelled_waiter():
+    flights = SingleFlight()
+    runs = []
+
+    async def compute():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def scenario():
+        first = asyncio.ensure_future(flights.do("k", compute))
+        second = asyncio.ensure_future(flights.do("k", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == ("result", True)
+    assert runs == [1]
+
+
+def test_coalesced_search_outlives_leader_deadline(monkeypatch):
+    calls = []
+
+    class SlowIndex:
+        def search(self, query):
+            calls.append(query.query)
+            time.sleep(0.3)
+            return [], None
+
+    monkeypatch.setattr(app.state, "index", SlowIndex())
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://retrieval") as client:
+            body = {"query": "ldap setup", "tenant_id": "tenant_1", "enable_rerank": False}
+            leader = asyncio.ensure_future(
+                client.post("/internal/retrieval/search", json=body, headers={"X-Request-Deadline": f"{time.time() + 0.1:.3f}"})
+            )
+            await asyncio.sleep(0.02)
+            follower = client.post("/internal/retrieval/search", json=body, headers={"X-Request-Deadline": f"{time.time() + 5:.3f}"})
+            return await asyncio.gather(leader, follower)
+
+    leader, follower = asyncio.run(scenario())
+    assert leader.status_code == 504
+    assert follower.status_code == 200
+    assert len(calls) == 1